@@ -7,7 +7,7 @@ AI Analytics Engine:
 import pandas as pd, numpy as np, os, json
 from prophet import Prophet
 from sklearn.cluster import KMeans
-from sentence_transformers import SentenceTransformer, util
+from ai_engines.embedding_service import get_embedding_model, cos_sim_to_centroid
 
 # -------- Forecasting --------
 def forecast_hiring_trends(csv_path, periods=6):
@@ -45,10 +45,9 @@ def summarize_insights(text):
         return resp.choices[0].message.content.strip()
     except Exception:
         # fallback extractive summarizer
-        model = SentenceTransformer("all-MiniLM-L6-v2")
+        model = get_embedding_model()
         sents = [s.strip() for s in text.split(".") if len(s.strip())>10]
-        embs = model.encode(sents, convert_to_tensor=True)
-        centroid = embs.mean(dim=0)
-        cos = util.cos_sim(embs, centroid).cpu().numpy().flatten()
+        embs = model.encode(sents, show_progress_bar=False, convert_to_numpy=True)
+        cos = cos_sim_to_centroid(embs)
         top = cos.argsort()[-3:][::-1]
         return ". ".join([sents[i] for i in top])
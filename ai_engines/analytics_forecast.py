@@ -7,7 +7,7 @@ AI Analytics Engine:
 import pandas as pd, numpy as np, os
 from prophet import Prophet
 from sklearn.cluster import KMeans, DBSCAN
-from sentence_transformers import SentenceTransformer, util
+from ai_engines.embedding_service import get_embedding_model, cos_sim_to_centroid
 
 # ---------- FORECAST ----------
 def forecast_hiring(df: pd.DataFrame, periods: int = 6):
@@ -47,9 +47,8 @@ def summarize_insights(text: str):
     except Exception:
         # fallback extractive summary
         sents = [s.strip() for s in text.split(".") if len(s.strip()) > 10]
-        model = SentenceTransformer("all-MiniLM-L6-v2")
-        embs = model.encode(sents, convert_to_tensor=True)
-        centroid = embs.mean(dim=0)
-        sim = util.cos_sim(embs, centroid).cpu().numpy().flatten()
+        model = get_embedding_model()
+        embs = model.encode(sents, show_progress_bar=False, convert_to_numpy=True)
+        sim = cos_sim_to_centroid(embs)
         top = sim.argsort()[-3:][::-1]
         return ". ".join([sents[i] for i in top])
@@ -0,0 +1,115 @@
+# ai_engines/ats_pipeline.py
+"""
+Set-based writes for ATS applications: applying to a job and stage transitions.
+
+apply_to_job() records an application in one statement: the applicant is
+upserted on its unique email (INSERT ... ON CONFLICT (email), so concurrent
+applies with the same email share one row instead of racing), the
+application is inserted for the returned applicant id, and the job's APPLIED
+funnel counter is incremented.
+
+transition_applications() moves any number of applications to a new status in
+one statement, and so one round trip: a CTE selects and locks the targets
+(explicit ids, or the top N of a stage in pipeline order), UPDATE ... FROM
+moves them and RETURNs each id with its previous status, and an INSERT from
+the same CTE appends one application_transitions row per moved application
+(with the note) instead of rewriting Application.meta, and the per-job funnel
+counters move with them (ai_engines/job_funnel.FUNNEL_DELTA_CTE). Applications
+already in the target status are left alone and are not returned.
+
+Usage:
+    from ai_engines.ats_pipeline import apply_to_job, transition_applications
+    app_id, applicant_id = apply_to_job(7, "Asha", "asha@example.com", resume_score=0.71, final_score=64.0)
+    moved = transition_applications(ApplicationStatus.REJECTED, job_id=7, ids=[...], note="position filled")
+    moved = transition_applications(ApplicationStatus.SCREENING, job_id=7,
+                                    from_statuses=[ApplicationStatus.APPLIED], top_n=20)
+    db.session.commit()      # moved: [(application_id, previous ApplicationStatus), ...]
+"""
+
+import json
+
+from sqlalchemy import text
+
+from ai_engines.job_funnel import FUNNEL_DELTA_CTE, funnel_cte
+from database.db import db
+from models.ats_model import ApplicationStatus
+
+# same order as models.ats_model.PIPELINE_ORDER, so top_n is a range scan of ix_applications_job_pipeline
+_PIPELINE_ORDER_SQL = "status, -coalesce(final_score, -1), id"
+
+
+def transition_applications(to_status, ids=None, job_id=None, from_statuses=None, top_n=None, note=None):
+    """
+    Move applications to `to_status`; returns [(application_id, previous status)].
+    Targets are `ids` (optionally restricted to `job_id` / `from_statuses`), or
+    with `top_n` the best `top_n` applications of `job_id` in `from_statuses`.
+    Runs in the caller's transaction; the caller commits.
+    """
+    to_status = ApplicationStatus(to_status)
+    params = {"to": to_status.name, "note": note or None}
+    where = ["status <> CAST(:to AS applicationstatus)"]
+    if job_id is not None:
+        where.append("job_id = :job_id")
+        params["job_id"] = int(job_id)
+    if from_statuses:
+        where.append("status = ANY(CAST(:from_statuses AS applicationstatus[]))")
+        params["from_statuses"] = [ApplicationStatus(s).name for s in from_statuses]
+    if top_n is not None:
+        if job_id is None:
+            raise ValueError("top_n needs job_id")
+        tail = f"ORDER BY {_PIPELINE_ORDER_SQL} LIMIT :top_n"
+        params["top_n"] = max(0, int(top_n))
+    else:
+        if not ids:
+            return []
+        where.append("id = ANY(CAST(:ids AS integer[]))")
+        params["ids"] = sorted({int(i) for i in ids})
+        tail = "ORDER BY id"   # lock in a stable order so concurrent bulk moves don't deadlock
+    rows = db.session.execute(text(
+        "WITH target AS ("
+        f"  SELECT id, job_id, status FROM applications WHERE {' AND '.join(where)} {tail} FOR UPDATE"
+        "), moved AS ("
+        "  UPDATE applications a SET status = CAST(:to AS applicationstatus) FROM target t WHERE a.id = t.id"
+        "  RETURNING a.id, a.job_id, t.status AS from_status"
+        "), logged AS ("
+        "  INSERT INTO application_transitions (application_id, job_id, from_status, to_status, note, created_at)"
+        "  SELECT id, job_id, from_status, CAST(:to AS applicationstatus), :note, now() AT TIME ZONE 'utc' FROM moved"
+        f"), {FUNNEL_DELTA_CTE} "
+        "SELECT id, from_status FROM moved ORDER BY id"
+    ), params).all()
+    return [(r[0], ApplicationStatus[r[1]]) for r in rows]
+
+
+def apply_to_job(job_id, name, email, phone=None, resume_id=None, resume_score=None, final_score=None, meta=None):
+    """
+    Upsert the applicant by email and insert its APPLIED application to `job_id`;
+    returns (application_id, applicant_id). An existing applicant keeps its name
+    and only gains a phone / resume link it did not have. The caller commits.
+    """
+    row = db.session.execute(text(
+        "WITH applicant AS ("
+        "  INSERT INTO applicants (name, email, phone, resume_id, created_at)"
+        "  VALUES (:name, :email, :phone, :resume_id, now() AT TIME ZONE 'utc')"
+        "  ON CONFLICT (email) DO UPDATE SET"
+        "    phone = coalesce(applicants.phone, EXCLUDED.phone),"
+        "    resume_id = coalesce(applicants.resume_id, EXCLUDED.resume_id)"
+        "  RETURNING id"
+        "), app AS ("
+        "  INSERT INTO applications (job_id, applicant_id, applied_at, status, resume_score, final_score, meta)"
+        "  SELECT :job_id, id, now() AT TIME ZONE 'utc', CAST(:status AS applicationstatus),"
+        "         :resume_score, :final_score, CAST(:meta AS json) FROM applicant"
+        "  RETURNING id, applicant_id, job_id, status"
+        f"), {funnel_cte('(SELECT job_id, status, 1 AS delta FROM app) d')} "
+        "SELECT id, applicant_id FROM app"
+    ), {
+        "job_id": int(job_id),
+        "name": name,
+        "email": email,
+        "phone": phone or None,
+        "resume_id": resume_id,
+        "status": ApplicationStatus.APPLIED.name,
+        "resume_score": resume_score,
+        "final_score": final_score,
+        "meta": json.dumps(meta) if meta is not None else None,
+    }).one()
+    return row[0], row[1]
@@ -7,13 +7,14 @@ ATS predictor:
 - If no model exists, the function `score_application()` will compute a reasonable combined score:
     final_score = weighted combination of resume_score (0..1) & interview_score (0..100) & experience
   and normalize to 0..100.
+- score_applications() scores many applications at once: one model.predict() over
+  all rows (or the vectorized heuristic), from an (n, 3) array or a DataFrame.
 
 Usage:
-    from ai_engines.ats_predictor import score_application, train_model, load_model
+    from ai_engines.ats_predictor import score_application, score_applications, train_model, load_model
+    finals = score_applications(df[FEATURES])   # ndarray of 0..100 scores
 """
 
-import os
-import json
 import numpy as np
 
 # try to import xgboost/lightgbm; fall back to sklearn
@@ -32,29 +33,22 @@ except Exception:
     LIGHTGBM_AVAILABLE = False
 
 from sklearn.ensemble import RandomForestRegressor
-import joblib
 
-# default model object (sklearn regressor) - lazy load
-_model = None
+from ai_engines.model_registry import registry
+from ai_engines.tree_inference import load_compiled
 
-def _ensure_model_dir():
-    os.makedirs(os.path.dirname(MODEL_PATH), exist_ok=True)
+# saved model is versioned and hot-reloaded by the registry (retraining needs no worker restart);
+# forests / XGBoost are compiled for fast single-row predict on load (ai_engines/tree_inference.py)
+registry.register("ats", MODEL_PATH, loader=load_compiled)
+
+# feature columns, in the order the model was trained on
+FEATURES = ["resume_score", "interview_score", "experience_years"]
 
 def load_model():
-    global _model
-    if _model is not None:
-        return _model
-    if os.path.exists(MODEL_PATH):
-        try:
-            _model = joblib.load(MODEL_PATH)
-            return _model
-        except Exception:
-            _model = None
-    return None
+    return registry.get("ats")
 
 def save_model(model):
-    _ensure_model_dir()
-    joblib.dump(model, MODEL_PATH)
+    return registry.save("ats", model)
 
 def train_model(training_csv_path):
     """
@@ -78,17 +72,49 @@ def train_model(training_csv_path):
     save_model(model)
     return model
 
-def predict_with_model(resume_score, interview_score, experience_years):
+def feature_matrix(rows):
+    """(n, 3) float array from a DataFrame with FEATURES columns or an array / list of rows; NaN/None -> 0."""
+    if hasattr(rows, "columns"):
+        rows = rows[FEATURES].to_numpy(dtype=float, na_value=np.nan)
+    X = np.array(rows, dtype=float).reshape(-1, len(FEATURES))
+    return np.nan_to_num(X, nan=0.0)
+
+def predict_batch_with_model(rows):
+    """Model predictions for all rows in one predict() call, or None without a usable model."""
     model = load_model()
     if not model:
         return None
-    X = np.array([[resume_score, interview_score, experience_years]], dtype=float)
+    X = feature_matrix(rows)
+    if not len(X):
+        return np.zeros(0)
     try:
-        pred = model.predict(X)[0]
-        return float(pred)
+        return np.asarray(model.predict(X), dtype=float).reshape(-1)
     except Exception:
         return None
 
+def predict_with_model(resume_score, interview_score, experience_years):
+    preds = predict_batch_with_model([[resume_score, interview_score, experience_years]])
+    return float(preds[0]) if preds is not None else None
+
+def heuristic_scores(rows):
+    """The fallback formula of score_application(), vectorized over rows."""
+    X = feature_matrix(rows)
+    base = X[:, 0] * 50.0
+    interview_comp = (X[:, 1] / 100.0) * 40.0
+    experience_comp = np.minimum(10.0, (X[:, 2] / 5.0) * 10.0)
+    return np.round(np.clip(base + interview_comp + experience_comp, 0.0, 100.0), 2)
+
+def score_applications(rows):
+    """
+    final_score (0..100) for many applications: rows of (resume_score,
+    interview_score, experience_years) as an (n, 3) array, a list of tuples or
+    a DataFrame with FEATURES columns. Model if available, heuristic otherwise.
+    """
+    preds = predict_batch_with_model(rows)
+    if preds is not None:
+        return np.round(np.clip(preds, 0.0, 100.0), 2)
+    return heuristic_scores(rows)
+
 def score_application(resume_score, interview_score, experience_years):
     """
     Fallback scoring if no model:
@@ -102,20 +128,7 @@ def score_application(resume_score, interview_score, experience_years):
        experience_component = min(10, experience_years / 5 * 10) (max 10)
     final = clamp(base + interview_component + experience_component, 0..100)
     """
-
     rs = float(resume_score or 0.0)
     iscore = float(interview_score or 0.0)
     exp = float(experience_years or 0.0)
-
-    # try model first if available
-    model_pred = predict_with_model(rs, iscore, exp)
-    if model_pred is not None:
-        # ensure 0..100
-        return round(max(0.0, min(100.0, float(model_pred))), 2)
-
-    base = rs * 50.0
-    interview_comp = (iscore / 100.0) * 40.0
-    experience_comp = min(10.0, (exp / 5.0) * 10.0)
-    final = base + interview_comp + experience_comp
-    final = max(0.0, min(100.0, final))
-    return round(final, 2)
+    return float(score_applications([[rs, iscore, exp]])[0])
@@ -10,7 +10,7 @@ import os
 import json
 import chromadb
 from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer, util
+from ai_engines.embedding_service import get_embedding_model
 from typing import List, Dict, Any
 from utils.doc_utils import extract_text_from_file
 from pathlib import Path
@@ -20,13 +20,9 @@ import logging
 _CHROMA_DIR = os.getenv("CHROMA_DIR", "chroma_db")
 _client = None
 _collection = None
-_EMBED_MODEL = None
 
 def _get_embedding_model():
-    global _EMBED_MODEL
-    if _EMBED_MODEL is None:
-        _EMBED_MODEL = SentenceTransformer("all-MiniLM-L6-v2")
-    return _EMBED_MODEL
+    return get_embedding_model()
 
 def _get_chroma_client():
     global _client, _collection
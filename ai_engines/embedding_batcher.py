@@ -0,0 +1,162 @@
+# ai_engines/embedding_batcher.py
+"""
+Dynamic micro-batching for single-text encode() calls.
+
+Request threads that each need one embedding (resume score, interview answer,
+chatbot query) put their text on a shared queue and block. A single worker thread
+takes the first waiting text, gathers whatever else arrives within `max_wait_ms`
+(up to `max_batch_size` texts) and runs one batched forward pass for all of them.
+
+Usage:
+    batcher = MicroBatcher(encode_fn=lambda texts: model.encode(texts), max_batch_size=32, max_wait_ms=5)
+    vec = batcher.submit("some text")
+    batcher.stats()   # batch-size and queue-delay metrics
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+import numpy as np
+
+# number of recent batches kept for percentile metrics
+_RECENT_WINDOW = 1024
+
+
+class _Pending:
+    __slots__ = ("text", "enqueued_at", "done", "result", "error")
+
+    def __init__(self, text):
+        self.text = text
+        self.enqueued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    def __init__(self, encode_fn, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        """
+        encode_fn: callable(list[str]) -> 2-D numpy array (one row per text)
+        """
+        self.encode_fn = encode_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._worker = None
+        self._reset_stats()
+
+    # ---------- public API ----------
+    def submit(self, text: str) -> np.ndarray:
+        """Encode one text as part of the next batch. Blocks until its vector is ready."""
+        self._ensure_worker()
+        req = _Pending(text)
+        self._queue.put(req)
+        req.done.wait()
+        if req.error is not None:
+            raise req.error
+        return req.result
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            sizes = list(self._recent_sizes)
+            delays = list(self._recent_delays_ms)
+            out = {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000.0,
+                "batches": self._batches,
+                "items": self._items,
+                "errors": self._errors,
+                "avg_batch_size": round(self._items / self._batches, 3) if self._batches else 0.0,
+                "largest_batch": self._largest_batch,
+                "batch_size_histogram": dict(sorted(self._size_hist.items())),
+                "avg_queue_delay_ms": round(self._delay_total_ms / self._items, 3) if self._items else 0.0,
+                "max_queue_delay_ms": round(self._delay_max_ms, 3),
+            }
+        if delays:
+            out["p50_queue_delay_ms"] = round(float(np.percentile(delays, 50)), 3)
+            out["p95_queue_delay_ms"] = round(float(np.percentile(delays, 95)), 3)
+        if sizes:
+            out["p50_batch_size"] = float(np.percentile(sizes, 50))
+        return out
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._reset_stats()
+
+    # ---------- internals ----------
+    def _reset_stats(self):
+        self._batches = 0
+        self._items = 0
+        self._errors = 0
+        self._largest_batch = 0
+        self._size_hist = {}
+        self._delay_total_ms = 0.0
+        self._delay_max_ms = 0.0
+        self._recent_sizes = deque(maxlen=_RECENT_WINDOW)
+        self._recent_delays_ms = deque(maxlen=_RECENT_WINDOW)
+
+    def _ensure_worker(self):
+        # (re)start the worker lazily; a forked gunicorn worker does not inherit threads
+        pid = os.getpid()
+        if self._pid == pid and self._worker is not None and self._worker.is_alive():
+            return
+        with self._start_lock:
+            if self._pid == pid and self._worker is not None and self._worker.is_alive():
+                return
+            self._queue = queue.Queue()
+            self._worker = threading.Thread(target=self._run, args=(self._queue,),
+                                            name="embedding-microbatcher", daemon=True)
+            self._pid = pid
+            self._worker.start()
+
+    def _collect(self, q):
+        first = q.get()
+        batch = [first]
+        deadline = first.enqueued_at + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    # window closed: still take anything already queued
+                    batch.append(q.get_nowait())
+                else:
+                    batch.append(q.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self, q):
+        while True:
+            batch = self._collect(q)
+            started = time.perf_counter()
+            try:
+                vecs = np.asarray(self.encode_fn([r.text for r in batch]), dtype=np.float32)
+                for r, v in zip(batch, vecs):
+                    r.result = v
+            except Exception as e:  # propagate to every caller of this batch
+                for r in batch:
+                    r.error = e
+            finally:
+                for r in batch:
+                    r.done.set()
+            self._record(batch, started)
+
+    def _record(self, batch, started):
+        delays = [(started - r.enqueued_at) * 1000.0 for r in batch]
+        n = len(batch)
+        with self._stats_lock:
+            self._batches += 1
+            self._items += n
+            if batch[0].error is not None:
+                self._errors += 1
+            self._largest_batch = max(self._largest_batch, n)
+            self._size_hist[n] = self._size_hist.get(n, 0) + 1
+            self._delay_total_ms += sum(delays)
+            self._delay_max_ms = max(self._delay_max_ms, max(delays))
+            self._recent_sizes.append(n)
+            self._recent_delays_ms.extend(delays)
@@ -0,0 +1,232 @@
+# ai_engines/embedding_cache.py
+"""
+Content-addressed embedding cache.
+
+Vectors are keyed by sha256(model name + normalized text), so the same job
+description, reference answer or sentence is only ever encoded once.
+
+Two tiers:
+- memory: an LRU OrderedDict of the most recently used vectors (per process)
+- disk:   a fixed-capacity float32 matrix in `vectors.f32` opened with np.memmap,
+          plus a small sqlite index (key -> row slot, last_used). Shared by all
+          workers on the host and survives restarts. When full, the least recently
+          used rows are evicted and their slots reused. Reads and writes of the
+          matrix happen inside a sqlite write transaction, so a row is never read
+          while another worker reuses its slot.
+
+Usage:
+    cache = EmbeddingCache("embedding_cache", model_name="all-MiniLM-L6-v2")
+    found = cache.get_many(["text a", "text b"])     # [vec or None, ...]
+    cache.put_many(["text b"], [vec_b])
+    cache.stats()
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+import numpy as np
+
+_WS = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFC", text or "")
+    return _WS.sub(" ", text).strip()
+
+
+def cache_key(text: str, model_name: str) -> str:
+    h = hashlib.sha256()
+    h.update(model_name.encode("utf-8"))
+    h.update(b"\x00")
+    h.update(normalize_text(text).encode("utf-8"))
+    return h.hexdigest()
+
+
+class EmbeddingCache:
+    def __init__(self, directory: str, model_name: str, memory_items: int = 20000, disk_items: int = 200000):
+        self.model_name = model_name
+        self.memory_items = max(0, int(memory_items))
+        self.disk_items = max(0, int(disk_items))
+        # one sub-directory per model: vector width differs between models
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.directory = os.path.join(directory, safe_name)
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._db = None
+        self._vectors = None
+        self._dim = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    # ---------- public API ----------
+    def get_many(self, texts):
+        """Return a list aligned with `texts`: a float32 vector on hit, None on miss."""
+        keys = [cache_key(t, self.model_name) for t in texts]
+        out = [None] * len(keys)
+        with self._lock:
+            disk_lookup = {}
+            for i, k in enumerate(keys):
+                vec = self._memory.get(k)
+                if vec is not None:
+                    self._memory.move_to_end(k)
+                    self.memory_hits += 1
+                    out[i] = vec
+                else:
+                    disk_lookup.setdefault(k, []).append(i)
+            if disk_lookup and self._open_disk(create=False):
+                found = self._disk_get(list(disk_lookup))
+                for k, vec in found.items():
+                    for i in disk_lookup[k]:
+                        out[i] = vec
+                    self._remember(k, vec)
+                self.disk_hits += sum(len(disk_lookup[k]) for k in found)
+            self.misses += sum(1 for v in out if v is None)
+        return out
+
+    def put_many(self, texts, vectors):
+        items = {}
+        for t, v in zip(texts, vectors):
+            items[cache_key(t, self.model_name)] = np.asarray(v, dtype=np.float32)
+        if not items:
+            return
+        with self._lock:
+            for k, vec in items.items():
+                self._remember(k, vec)
+            if self.disk_items and self._open_disk(create=True, dim=len(next(iter(items.values())))):
+                self._disk_put(items)
+            self.writes += len(items)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            disk_entries = None
+            if self._db is not None:
+                disk_entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            return {
+                "directory": self.directory,
+                "memory_entries": len(self._memory),
+                "memory_capacity": self.memory_items,
+                "disk_entries": disk_entries,
+                "disk_capacity": self.disk_items,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "writes": self.writes,
+                "evictions": self.evictions,
+            }
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+
+    # ---------- memory tier ----------
+    def _remember(self, key, vec):
+        if not self.memory_items:
+            return
+        self._memory[key] = vec
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    # ---------- disk tier ----------
+    def _open_disk(self, create: bool, dim: int = None) -> bool:
+        if self._vectors is not None:
+            return True
+        if not self.disk_items:
+            return False
+        db_path = os.path.join(self.directory, "index.sqlite3")
+        vec_path = os.path.join(self.directory, "vectors.f32")
+        if not create and not os.path.exists(db_path):
+            return False
+        os.makedirs(self.directory, exist_ok=True)
+        conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        conn.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, slot INTEGER UNIQUE NOT NULL, last_used REAL NOT NULL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_entries_last_used ON entries (last_used)")
+        row = conn.execute("SELECT value FROM meta WHERE name = 'dim'").fetchone()
+        if row is None:
+            if dim is None:
+                conn.close()
+                return False
+            conn.execute("INSERT OR IGNORE INTO meta (name, value) VALUES ('dim', ?)", (str(int(dim)),))
+            row = conn.execute("SELECT value FROM meta WHERE name = 'dim'").fetchone()
+        self._dim = int(row[0])
+        # capacity is fixed by whoever created the file; size it sparsely on first use
+        if not os.path.exists(vec_path):
+            with open(vec_path, "ab") as f:  # "ab": never clobber a file another worker just created
+                if f.tell() == 0:
+                    f.truncate(self.disk_items * self._dim * 4)
+        rows = os.path.getsize(vec_path) // (self._dim * 4)
+        self.disk_items = rows
+        self._vectors = np.memmap(vec_path, dtype=np.float32, mode="r+", shape=(rows, self._dim))
+        self._db = conn
+        return True
+
+    def _disk_get(self, keys):
+        found = {}
+        now = time.time()
+        db = self._db
+        # the write lock keeps another worker's _disk_put from evicting a slot and
+        # rewriting its row between the slot lookup and the row read
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            # sqlite caps bound parameters; look up in slices
+            for i in range(0, len(keys), 500):
+                part = keys[i:i + 500]
+                marks = ",".join("?" * len(part))
+                rows = db.execute(f"SELECT key, slot FROM entries WHERE key IN ({marks})", part).fetchall()
+                for k, slot in rows:
+                    found[k] = np.array(self._vectors[slot], dtype=np.float32)
+                if rows:
+                    db.executemany("UPDATE entries SET last_used = ? WHERE key = ?", [(now, k) for k, _ in rows])
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        return found
+
+    def _disk_put(self, items):
+        now = time.time()
+        db = self._db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            keys = list(items)
+            existing = set()
+            for i in range(0, len(keys), 500):
+                part = keys[i:i + 500]
+                marks = ",".join("?" * len(part))
+                existing.update(r[0] for r in db.execute(f"SELECT key FROM entries WHERE key IN ({marks})", part))
+            new_keys = [k for k in keys if k not in existing and items[k].shape == (self._dim,)]
+            if len(new_keys) > self.disk_items:
+                new_keys = new_keys[-self.disk_items:]
+            if new_keys:
+                max_slot = db.execute("SELECT COALESCE(MAX(slot), -1) FROM entries").fetchone()[0]
+                slots = list(range(max_slot + 1, min(self.disk_items, max_slot + 1 + len(new_keys))))
+                # free slots are never left behind (eviction reuses them), so past the
+                # high-water mark the only source of rows is the LRU tail
+                short = len(new_keys) - len(slots)
+                if short > 0:
+                    victims = db.execute("SELECT key, slot FROM entries ORDER BY last_used LIMIT ?", (short,)).fetchall()
+                    db.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k, _ in victims])
+                    slots.extend(s for _, s in victims)
+                    self.evictions += len(victims)
+                rows = []
+                for k, slot in zip(new_keys, slots):
+                    self._vectors[slot] = items[k]
+                    rows.append((k, slot, now))
+                self._vectors.flush()
+                db.executemany("INSERT INTO entries (key, slot, last_used) VALUES (?, ?, ?)", rows)
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
@@ -0,0 +1,156 @@
+# ai_engines/embedding_service.py
+"""
+Process-wide sentence embedding service.
+
+Every engine (resume parser, interview scoring, summarizer, chatbot retrieval,
+analytics summaries) goes through this module so a worker keeps exactly one
+copy of the encoder in memory.
+
+The encoder backend is chosen by Config.EMBEDDING_BACKEND: "torch" (SentenceTransformer)
+or "onnx" (int8-quantized ONNX Runtime, see onnx_encoder.py).
+
+Vectors are looked up in a content-addressed cache first (embedding_cache.py),
+and single-string encode() calls that miss are routed through a MicroBatcher so
+concurrent request threads share one batched forward pass (embedding_batcher.py).
+
+Usage:
+    from ai_engines.embedding_service import get_embedding_model
+    model = get_embedding_model()
+    vec = model.encode("some text", show_progress_bar=False, convert_to_numpy=True)
+"""
+
+import os
+import threading
+import numpy as np
+from config.config import Config
+from ai_engines.embedding_batcher import MicroBatcher
+from ai_engines.embedding_cache import EmbeddingCache
+
+_SERVICE = None
+_SERVICE_LOCK = threading.Lock()
+
+
+class EmbeddingService:
+    """
+    Thin wrapper around the encoder. The underlying model is loaded lazily on the
+    first encode() and shared by every thread of the process.
+    """
+
+    def __init__(self, model_name: str = None, microbatch: bool = None, cache: bool = None, backend: str = None):
+        self.model_name = model_name or Config.EMBEDDING_MODEL_NAME
+        self.backend = (backend or Config.EMBEDDING_BACKEND).lower()
+        self._model = None
+        self._load_lock = threading.Lock()
+        if cache is None:
+            cache = Config.EMBEDDING_CACHE_ENABLED
+        self._cache = None
+        if cache:
+            # quantized vectors differ slightly from fp32 ones, so each backend gets its own keys
+            cache_model = self.model_name if self.backend == "torch" else f"{self.model_name}@{self.backend}-int8"
+            self._cache = EmbeddingCache(Config.EMBEDDING_CACHE_DIR, cache_model,
+                                         memory_items=Config.EMBEDDING_CACHE_MEMORY_ITEMS,
+                                         disk_items=Config.EMBEDDING_CACHE_DISK_ITEMS)
+        if microbatch is None:
+            microbatch = Config.EMBEDDING_MICROBATCH_ENABLED
+        self._batcher = None
+        if microbatch:
+            self._batcher = MicroBatcher(self._encode_batch,
+                                         max_batch_size=Config.EMBEDDING_MICROBATCH_MAX_SIZE,
+                                         max_wait_ms=Config.EMBEDDING_MICROBATCH_MAX_WAIT_MS)
+
+    def _get_model(self):
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    self._model = self._load_backend()
+        return self._model
+
+    def _load_backend(self):
+        if self.backend == "onnx":
+            from ai_engines.onnx_encoder import OnnxSentenceEncoder, export_quantized_model
+            model_dir = Config.EMBEDDING_ONNX_DIR
+            if not os.path.exists(model_dir):
+                # one-off export (needs torch); normally done ahead of deploy
+                export_quantized_model(self.model_name, model_dir)
+            return OnnxSentenceEncoder(model_dir, num_threads=Config.EMBEDDING_ONNX_THREADS)
+        if self.backend != "torch":
+            raise ValueError(f"Unknown EMBEDDING_BACKEND: {self.backend}")
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(self.model_name)
+
+    def encode(self, sentences, batch_size: int = 32, show_progress_bar: bool = False,
+               convert_to_numpy: bool = True, normalize_embeddings: bool = False):
+        """
+        Same call shape as SentenceTransformer.encode(). Always returns numpy float32:
+        a 1-D vector for a single string, a 2-D matrix for a list of strings.
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        vecs = self._cache.get_many(texts) if self._cache is not None else [None] * len(texts)
+        missing = {}
+        for i, v in enumerate(vecs):
+            if v is None:
+                missing.setdefault(texts[i], []).append(i)
+        if missing:
+            miss_texts = list(missing)
+            if len(miss_texts) == 1 and self._batcher is not None:
+                fresh = [self._batcher.submit(miss_texts[0])]
+            else:
+                fresh = self._encode_batch(miss_texts, batch_size=batch_size)
+            for t, v in zip(miss_texts, fresh):
+                for i in missing[t]:
+                    vecs[i] = v
+            if self._cache is not None:
+                self._cache.put_many(miss_texts, fresh)
+        out = np.vstack(vecs).astype(np.float32, copy=False)
+        if normalize_embeddings:
+            norms = np.linalg.norm(out, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            out = out / norms
+        return out[0] if single else out
+
+    def _encode_batch(self, texts, batch_size: int = 32):
+        model = self._get_model()
+        vecs = model.encode(texts, batch_size=max(batch_size, min(len(texts), 128)),
+                            show_progress_bar=False, convert_to_numpy=True)
+        return np.asarray(vecs, dtype=np.float32)
+
+    def stats(self) -> dict:
+        return {
+            "model": self.model_name,
+            "backend": self.backend,
+            "loaded": self._model is not None,
+            "microbatch": self._batcher.stats() if self._batcher is not None else None,
+            "cache": self._cache.stats() if self._cache is not None else None,
+        }
+
+
+def get_embedding_model() -> EmbeddingService:
+    """Return the process-wide EmbeddingService (created on first use, thread-safe)."""
+    global _SERVICE
+    if _SERVICE is None:
+        with _SERVICE_LOCK:
+            if _SERVICE is None:
+                _SERVICE = EmbeddingService()
+    return _SERVICE
+
+
+def encode(sentences, **kwargs):
+    """Shortcut for get_embedding_model().encode(...)."""
+    return get_embedding_model().encode(sentences, **kwargs)
+
+
+def embedding_stats() -> dict:
+    """Runtime metrics of the shared service (exposed on the admin dashboard API)."""
+    return get_embedding_model().stats()
+
+
+def cos_sim_to_centroid(embeddings) -> np.ndarray:
+    """Cosine similarity of each row of `embeddings` to the mean row."""
+    embs = np.asarray(embeddings, dtype=np.float32)
+    centroid = embs.mean(axis=0)
+    denom = np.linalg.norm(embs, axis=1) * np.linalg.norm(centroid)
+    denom[denom == 0] = 1.0
+    return (embs @ centroid) / denom
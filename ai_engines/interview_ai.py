@@ -1,22 +1,20 @@
 """
 Interview AI helpers:
 - embed_text(text)
-- score_answer(candidate_text, reference_text) -> 0..100
+- embed_reference(reference_text) -> vector stored on Question.reference_embedding
+- score_answer(candidate_text, reference_text, reference_embedding=None) -> 0..100
 - transcribe_audio(filepath) -> text (optional; uses whisper if installed)
 """
 
-from sentence_transformers import SentenceTransformer
+from ai_engines.embedding_service import get_embedding_model
+from ai_engines.whisper_service import get_whisper_service
 import numpy as np
 import math
 import os
 
-# lazy load embedding model
-_EMB_MODEL = None
+# shared, lazily loaded embedding model
 def _get_emb_model():
-    global _EMB_MODEL
-    if _EMB_MODEL is None:
-        _EMB_MODEL = SentenceTransformer("all-MiniLM-L6-v2")
-    return _EMB_MODEL
+    return get_embedding_model()
 
 def embed_text(text):
     model = _get_emb_model()
@@ -31,10 +29,19 @@ def cosine_similarity(a, b):
         return 0.0
     return float(np.dot(a, b) / denom)
 
-def score_answer(candidate_text: str, reference_text: str) -> float:
+def embed_reference(reference_text):
+    """Vector for a question's reference answer (None when there is no reference)."""
+    reference_text = (reference_text or "").strip()
+    if not reference_text:
+        return None
+    return embed_text(reference_text)
+
+def score_answer(candidate_text: str, reference_text: str, reference_embedding=None) -> float:
     """
     Returns score between 0 and 100 computed from cosine similarity and heuristics.
     If reference_text is empty, returns 0.
+    Pass the stored reference_embedding to skip re-encoding the reference text;
+    only the candidate answer is encoded then.
     """
     candidate_text = (candidate_text or "").strip()
     reference_text = (reference_text or "").strip()
@@ -47,7 +54,9 @@ def score_answer(candidate_text: str, reference_text: str) -> float:
     try:
         emb_model = _get_emb_model()
         a = emb_model.encode(candidate_text, show_progress_bar=False, convert_to_numpy=True)
-        b = emb_model.encode(reference_text, show_progress_bar=False, convert_to_numpy=True)
+        b = reference_embedding
+        if b is None or len(b) != len(a):   # missing, or stored by a different model
+            b = emb_model.encode(reference_text, show_progress_bar=False, convert_to_numpy=True)
         sim = cosine_similarity(a, b)  # -1..1 but close to 0..1 for SBERT
         # map sim (0..1) into 0..85 points (core content)
         core = max(0.0, min(1.0, sim)) * 85.0
@@ -66,15 +75,8 @@ def score_answer(candidate_text: str, reference_text: str) -> float:
 def transcribe_audio(filepath: str) -> str:
     """
     Uses openai/whisper (whisper package) if available to transcribe audio file.
+    The model stays loaded in the worker (ai_engines/whisper_service.py, WHISPER_* settings).
     If whisper not installed or fails, raises ImportError or RuntimeError.
     """
-    try:
-        import whisper
-    except Exception as e:
-        raise ImportError("whisper package is not installed. Install 'whisper' to enable audio transcription.") from e
-
-    model = whisper.load_model("small")   # choose "small" or "base" depending on compute
     # whisper expects ffmpeg installed; ensure it's available
-    result = model.transcribe(filepath)
-    text = result.get("text", "").strip()
-    return text
+    return get_whisper_service().transcribe(filepath)
@@ -0,0 +1,128 @@
+# ai_engines/job_funnel.py
+"""
+Per-job funnel counters: job_funnel_counts holds the number of applications of
+each job in each status, so job lists and pipeline tabs read a handful of rows
+per job instead of grouping over applications.
+
+The counters change in the same transaction as the applications they count:
+- ORM writes (apply_job adding an Application, a status set on a loaded
+  Application, a delete) go through the Application mapper events below;
+- set-based writes (ai_engines/ats_pipeline: transition_applications,
+  apply_to_job) update them inside their own statement with funnel_cte().
+Rows written with Core / raw SQL bypass both; `flask ats reconcile-funnel`
+(reconcile_funnel_counts) rebuilds the table from applications.
+
+Usage:
+    from ai_engines.job_funnel import funnel_counts, reconcile_funnel_counts
+    funnel_counts([job.id])[job.id]      # {"applied": 120, "screening": 14, ...}
+    reconcile_funnel_counts()            # after bulk imports; caller commits
+"""
+
+from sqlalchemy import event, text
+from sqlalchemy.orm.attributes import get_history
+
+from database.db import db
+from models.ats_model import Application, ApplicationStatus
+
+# Upsert of (job_id, status, delta) rows; deltas are summed per key first so one
+# INSERT never touches a counter twice, and applied in key order so concurrent
+# writers lock counter rows in the same order.
+_UPSERT = (
+    "INSERT INTO job_funnel_counts (job_id, status, count) "
+    "SELECT job_id, status, sum(delta) FROM {source} GROUP BY job_id, status ORDER BY job_id, status "
+    "ON CONFLICT (job_id, status) DO UPDATE SET count = job_funnel_counts.count + EXCLUDED.count"
+)
+
+
+def funnel_cte(source):
+    """`funnel AS (...)` CTE applying the (job_id, status, delta) rows of `source` (a FROM item)."""
+    return "funnel AS (" + _UPSERT.format(source=source) + ")"
+
+
+# For statements that RETURN moved rows as `moved (job_id, from_status)` and set
+# them all to :to — one -1 for the old status and one +1 for the new.
+FUNNEL_DELTA_CTE = funnel_cte(
+    "(SELECT job_id, from_status AS status, -1 AS delta FROM moved "
+    " UNION ALL SELECT job_id, CAST(:to AS applicationstatus), 1 FROM moved) d"
+)
+
+
+def apply_funnel_deltas(connection, deltas):
+    """Add {(job_id, ApplicationStatus): delta} to the counters on `connection`."""
+    rows = [(j, s, d) for (j, s), d in deltas.items() if d and j is not None and s is not None]
+    if not rows:
+        return
+    connection.execute(text(_UPSERT.format(source=(
+        "unnest(CAST(:job_ids AS integer[]), CAST(:statuses AS applicationstatus[]), "
+        "CAST(:deltas AS integer[])) AS d (job_id, status, delta)"
+    ))), {
+        "job_ids": [r[0] for r in rows],
+        "statuses": [ApplicationStatus(r[1]).name for r in rows],
+        "deltas": [r[2] for r in rows],
+    })
+
+
+def funnel_counts(job_ids):
+    """{job_id: {status value: count}} for the given jobs, every status present (0 when none)."""
+    job_ids = list({int(j) for j in job_ids})
+    out = {j: {s.value: 0 for s in ApplicationStatus} for j in job_ids}
+    if not job_ids:
+        return out
+    rows = db.session.execute(text(
+        "SELECT job_id, status, count FROM job_funnel_counts WHERE job_id = ANY(CAST(:ids AS integer[]))"
+    ), {"ids": job_ids}).all()
+    for job_id, status, count in rows:
+        out[job_id][ApplicationStatus[status].value] = count
+    return out
+
+
+def reconcile_funnel_counts(job_id=None):
+    """
+    Rebuild the counters (one job or all) from applications; returns the number of
+    counter rows that were wrong or missing. Blocks concurrent status changes
+    until the caller commits, so no delta is lost in between.
+    """
+    scope = "WHERE job_id = :job_id" if job_id is not None else ""
+    params = {"job_id": int(job_id)} if job_id is not None else {}
+    counted = "WHERE status IS NOT NULL" + (" AND job_id = :job_id" if job_id is not None else "")
+    db.session.execute(text("LOCK TABLE job_funnel_counts IN EXCLUSIVE MODE"))
+    fixed = db.session.execute(text(
+        "WITH actual AS ("
+        f"  SELECT job_id, status, count(*)::integer AS count FROM applications {counted} GROUP BY job_id, status"
+        "), stored AS ("
+        f"  SELECT job_id, status, count FROM job_funnel_counts {scope}"
+        ") "
+        "SELECT count(*) FROM actual FULL JOIN stored USING (job_id, status) "
+        "WHERE coalesce(actual.count, 0) <> coalesce(stored.count, 0)"
+    ), params).scalar()
+    db.session.execute(text(f"DELETE FROM job_funnel_counts {scope}"), params)
+    db.session.execute(text(
+        "INSERT INTO job_funnel_counts (job_id, status, count) "
+        f"SELECT job_id, status, count(*) FROM applications {counted} GROUP BY job_id, status"
+    ), params)
+    return int(fixed)
+
+
+# ---------- keep the counters in step with ORM writes to Application ----------
+@event.listens_for(Application, "after_insert")
+def _count_new_application(mapper, connection, target):
+    status = target.status or ApplicationStatus.APPLIED
+    apply_funnel_deltas(connection, {(target.job_id, status): 1})
+
+
+@event.listens_for(Application, "after_update")
+def _recount_application(mapper, connection, target):
+    status, job = get_history(target, "status"), get_history(target, "job_id")
+    if not (status.has_changes() or job.has_changes()):
+        return
+    old_status = (status.deleted or status.unchanged or [None])[0]
+    old_job = (job.deleted or job.unchanged or [None])[0]
+    deltas = {}
+    for key, d in (((old_job, old_status), -1), ((target.job_id, target.status), 1)):
+        deltas[key] = deltas.get(key, 0) + d
+    apply_funnel_deltas(connection, deltas)
+
+
+@event.listens_for(Application, "after_delete")
+def _uncount_application(mapper, connection, target):
+    apply_funnel_deltas(connection, {(target.job_id, target.status): -1})
@@ -0,0 +1,134 @@
+# ai_engines/job_matching.py
+"""
+Batch rescoring of every stored resume against one job.
+
+Instead of one encode + cosine per (job, resume) pair, the job description is
+encoded once and scored against the resume embedding matrix with a single
+matrix-vector product per chunk (ATS_RESCORE_CHUNK_ROWS rows). Scores are
+streamed into job_resume_scores with COPY into a temp table followed by one
+INSERT ... ON CONFLICT, so a job's row set is replaced in a few statements.
+
+rescore_applications() does the same for a job's pipeline: every application's
+final_score is recomputed by one batch predict and written back with a single
+UPDATE ... FROM unnest(...).
+
+Usage:
+    from ai_engines.job_matching import rescore_job, rescore_applications
+    n = rescore_job(job)          # number of (job, resume) scores written
+    n = rescore_applications(job.id)
+    db.session.commit()
+"""
+
+import io
+from datetime import datetime
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from config.config import Config
+from database.db import db
+from models.ats_model import JobResumeScore
+from ai_engines.resume_parser import embed_text
+from ai_engines.ats_predictor import score_applications
+from ai_engines.resume_index import iter_resume_matrices, normalize_rows
+
+_STAGE_TABLE = "_job_resume_scores_stage"
+
+
+def score_matrix(job_vec, mat) -> np.ndarray:
+    """Cosine of each (normalized) resume row vs the job vector, clipped to 0..1."""
+    q = normalize_rows(np.asarray(job_vec, dtype=np.float32).reshape(1, -1))[0]
+    return np.clip(mat @ q, 0.0, 1.0)
+
+
+def rescore_job(job) -> int:
+    """
+    Recompute job_resume_scores for `job` against all resumes with an embedding.
+    Runs in the caller's transaction; the caller commits.
+    """
+    if not (job.description or "").strip():
+        clear_job_scores(job.id)
+        return 0
+    job_vec = embed_text(job.description)
+    scored_at = datetime.utcnow()
+    written = 0
+    for ids, mat in iter_resume_matrices(Config.ATS_RESCORE_CHUNK_ROWS):
+        written += _write_scores(job.id, ids, score_matrix(job_vec, mat), scored_at)
+    # resumes that lost their embedding since the last pass
+    db.session.execute(
+        text("DELETE FROM job_resume_scores WHERE job_id = :job_id AND scored_at < :scored_at"),
+        {"job_id": job.id, "scored_at": scored_at},
+    )
+    return written
+
+
+def clear_job_scores(job_id: int):
+    db.session.execute(text("DELETE FROM job_resume_scores WHERE job_id = :job_id"), {"job_id": job_id})
+
+
+def get_resume_score(job_id: int, resume_id: int):
+    """Stored score of resume vs job, or None when the pair has not been scored."""
+    row = db.session.get(JobResumeScore, (job_id, resume_id))
+    return row.score if row is not None else None
+
+
+def rescore_applications(job_id: int) -> int:
+    """
+    Recompute final_score of every application to a job (experience_years comes
+    from Application.meta). Runs in the caller's transaction; the caller commits.
+    """
+    rows = db.session.execute(text(
+        "SELECT id, resume_score, interview_score, CAST(meta->>'experience_years' AS double precision) "
+        "FROM applications WHERE job_id = :job_id"
+    ), {"job_id": job_id}).all()
+    if not rows:
+        return 0
+    ids = [r[0] for r in rows]
+    finals = score_applications(np.array([r[1:] for r in rows], dtype=float))
+    db.session.execute(text(
+        "UPDATE applications a SET final_score = v.final_score "
+        "FROM unnest(CAST(:ids AS integer[]), CAST(:scores AS double precision[])) AS v(id, final_score) "
+        "WHERE a.id = v.id"
+    ), {"ids": ids, "scores": [float(f) for f in finals]})
+    return len(ids)
+
+
+def _write_scores(job_id, ids, scores, scored_at) -> int:
+    if not len(ids):
+        return 0
+    conn = db.session.connection()
+    if conn.dialect.driver == "psycopg2":
+        _copy_scores(conn, job_id, ids, scores, scored_at)
+    else:
+        stmt = pg_insert(JobResumeScore)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[JobResumeScore.job_id, JobResumeScore.resume_id],
+            set_={"score": stmt.excluded.score, "scored_at": stmt.excluded.scored_at},
+        )
+        conn.execute(stmt, [
+            {"job_id": job_id, "resume_id": int(rid), "score": float(s), "scored_at": scored_at}
+            for rid, s in zip(ids, scores)
+        ])
+    return len(ids)
+
+
+def _copy_scores(conn, job_id, ids, scores, scored_at):
+    buf = io.StringIO()
+    buf.writelines(f"{int(rid)}\t{float(s):.6f}\n" for rid, s in zip(ids, scores))
+    buf.seek(0)
+    cursor = conn.connection.driver_connection.cursor()
+    try:
+        cursor.execute(f"CREATE TEMP TABLE IF NOT EXISTS {_STAGE_TABLE} "
+                       "(resume_id integer, score double precision) ON COMMIT DELETE ROWS")
+        cursor.execute(f"TRUNCATE {_STAGE_TABLE}")
+        cursor.copy_expert(f"COPY {_STAGE_TABLE} (resume_id, score) FROM STDIN", buf)
+        cursor.execute(
+            "INSERT INTO job_resume_scores (job_id, resume_id, score, scored_at) "
+            f"SELECT %s, s.resume_id, s.score, %s FROM {_STAGE_TABLE} s "
+            "JOIN resumes r ON r.id = s.resume_id "  # skip rows deleted since the chunk was read
+            "ON CONFLICT (job_id, resume_id) DO UPDATE "
+            "SET score = EXCLUDED.score, scored_at = EXCLUDED.scored_at",
+            (job_id, scored_at),
+        )
+    finally:
+        cursor.close()
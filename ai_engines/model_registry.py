@@ -0,0 +1,205 @@
+# ai_engines/model_registry.py
+"""
+Versioned on-disk model registry with hot reload.
+
+Each registered model has a path (e.g. models_saved/ats_model.json). save()
+writes a new version next to it as <stem>.v<N><ext>, then atomically replaces
+the manifest <path>.manifest.json ({"version", "file", "sha256", "saved_at"})
+and the file at `path` itself, so tools that read the plain path keep working.
+Only the newest MODEL_REGISTRY_KEEP_VERSIONS version files are kept.
+
+get() returns the loaded model. At most every MODEL_REGISTRY_CHECK_SECONDS it
+stats the manifest (or the plain file when there is no manifest yet) and, when
+its mtime/size changed, loads the new version under the entry's lock and swaps
+it in with one assignment; concurrent callers keep using the previous model
+until then and a first load happens once. A version that fails to load is
+reported in status() while the previous one stays active. This is how every
+worker picks up a retrained model without a restart.
+
+Usage:
+    from ai_engines.model_registry import registry
+    registry.register("ats", "models_saved/ats_model.json")
+    model = registry.get("ats")            # None when nothing was saved yet
+    registry.save("ats", trained_model)    # new version; workers reload within seconds
+    registry.status()                      # active version + load time per model
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import joblib
+
+from config.config import Config
+
+
+class _Entry:
+    def __init__(self, name, path, loader, dumper):
+        self.name = name
+        self.path = path
+        self.loader = loader
+        self.dumper = dumper
+        self.lock = threading.Lock()
+        self.active = None        # (model, version, file, loaded_at); replaced as a whole
+        self.signature = None     # (mtime_ns, size) of the file the active model was chosen from
+        self.checked_at = 0.0
+        self.error = None
+
+    @property
+    def manifest_path(self):
+        return f"{self.path}.manifest.json"
+
+
+class ModelRegistry:
+    def __init__(self, check_seconds: float = None, keep_versions: int = None):
+        self.check_seconds = Config.MODEL_REGISTRY_CHECK_SECONDS if check_seconds is None else check_seconds
+        self.keep_versions = keep_versions or Config.MODEL_REGISTRY_KEEP_VERSIONS
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, path: str, loader=joblib.load, dumper=joblib.dump):
+        with self._lock:
+            if name not in self._entries:
+                self._entries[name] = _Entry(name, path, loader, dumper)
+        return self._entries[name]
+
+    # ---------- reading ----------
+    def get(self, name: str):
+        """The active model (reloaded when a newer version is on disk), or None."""
+        entry = self._entries[name]
+        if time.monotonic() - entry.checked_at >= self.check_seconds:
+            self._refresh(entry)
+        active = entry.active
+        return active[0] if active is not None else None
+
+    def reload(self, name: str = None):
+        """Check disk now instead of waiting for the next interval."""
+        for entry in ([self._entries[name]] if name else list(self._entries.values())):
+            self._refresh(entry, force=True)
+        return self.status(name)
+
+    def _refresh(self, entry, force: bool = False):
+        with entry.lock:   # one loader per model; others wait and then see the swapped-in version
+            if not force and time.monotonic() - entry.checked_at < self.check_seconds:
+                return
+            entry.checked_at = time.monotonic()
+            watched = entry.manifest_path if os.path.exists(entry.manifest_path) else entry.path
+            try:
+                st = os.stat(watched)
+            except OSError:
+                return   # nothing saved yet (or removed): keep whatever is active
+            signature = (watched, st.st_mtime_ns, st.st_size)
+            if signature == entry.signature and not force:
+                return
+            try:
+                version, file = self._current_version(entry, st)
+                model = entry.loader(file)
+            except Exception as e:
+                entry.error = f"{type(e).__name__}: {e}"
+                entry.signature = signature   # don't retry a broken version on every call
+                return
+            entry.active = (model, version, file, datetime.utcnow())
+            entry.signature = signature
+            entry.error = None
+
+    def _current_version(self, entry, st):
+        if os.path.exists(entry.manifest_path):
+            with open(entry.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            return manifest["version"], os.path.join(os.path.dirname(entry.path), manifest["file"])
+        # written before the registry existed: identify it by its mtime
+        return f"mtime-{int(st.st_mtime)}", entry.path
+
+    # ---------- writing ----------
+    def save(self, name: str, model) -> int:
+        """Write `model` as the next version and make it current; returns the version number."""
+        entry = self._entries[name]
+        directory = os.path.dirname(entry.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        stem, ext = os.path.splitext(os.path.basename(entry.path))
+        with entry.lock:
+            version = max(self.versions(name) or [0]) + 1
+            file = f"{stem}.v{version}{ext}"
+            target = os.path.join(directory, file)
+            self._atomic_write(directory, target, lambda tmp: entry.dumper(model, tmp))
+            sha = _sha256_file(target)
+            # the plain path is a copy of the current version for readers that predate the registry
+            self._atomic_write(directory, entry.path, lambda tmp: _copy_file(target, tmp))
+            manifest = {"version": version, "file": file, "sha256": sha, "saved_at": datetime.utcnow().isoformat()}
+            self._atomic_write(directory, entry.manifest_path,
+                               lambda tmp: _write_text(tmp, json.dumps(manifest, indent=2)))
+            self._prune(entry, directory, stem, ext)
+        return version
+
+    def versions(self, name: str):
+        entry = self._entries[name]
+        stem, ext = os.path.splitext(os.path.basename(entry.path))
+        pattern = re.compile(rf"^{re.escape(stem)}\.v(\d+){re.escape(ext)}$")
+        directory = os.path.dirname(entry.path) or "."
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return []
+        return sorted(int(m.group(1)) for m in map(pattern.match, names) if m)
+
+    def _prune(self, entry, directory, stem, ext):
+        for version in self.versions(entry.name)[:-self.keep_versions]:
+            try:
+                os.remove(os.path.join(directory, f"{stem}.v{version}{ext}"))
+            except OSError:
+                pass
+
+    @staticmethod
+    def _atomic_write(directory, target, write):
+        fd, tmp = tempfile.mkstemp(prefix=".model-", dir=directory)
+        os.close(fd)
+        try:
+            write(tmp)
+            os.replace(tmp, target)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    # ---------- status ----------
+    def status(self, name: str = None) -> dict:
+        out = {}
+        for entry in ([self._entries[name]] if name else list(self._entries.values())):
+            active = entry.active
+            out[entry.name] = {
+                "path": entry.path,
+                "active_version": active[1] if active else None,
+                "active_file": active[2] if active else None,
+                "loaded_at": active[3].isoformat() if active else None,
+                "versions_on_disk": self.versions(entry.name),
+                "error": entry.error,
+            }
+        return out
+
+
+def _sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _copy_file(src, dst):
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        for chunk in iter(lambda: fin.read(1 << 20), b""):
+            fout.write(chunk)
+
+
+def _write_text(path, content):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+# process-wide registry shared by the predictors
+registry = ModelRegistry()
@@ -0,0 +1,178 @@
+# ai_engines/near_duplicates.py
+"""
+Near-duplicate resume detection with MinHash + LSH.
+
+Each resume's parsed_text is reduced to word shingles (MINHASH_SHINGLE_WORDS
+consecutive words) and summarized by a MinHash signature of MINHASH_NUM_PERM
+uint32 values, stored on Resume.minhash (512 bytes by default). The signature
+is cut into LSH_BANDS bands; every band is hashed into a bucket row of
+resume_lsh_buckets. Two resumes become candidates when they share any bucket,
+so a lookup reads a few index entries instead of comparing against every
+resume; candidates are then filtered by the Jaccard similarity estimated from
+their signatures.
+
+With 128 permutations in 16 bands of 8 rows, pairs above ~0.7 Jaccard are
+very likely to collide; lower thresholds than that will miss pairs.
+
+Signatures and buckets are maintained by the Resume mapper events below;
+`flask resume build-minhash --all` recomputes both after MINHASH_* or
+LSH_BANDS change.
+
+Usage:
+    from ai_engines.near_duplicates import find_near_duplicates
+    find_near_duplicates(resume, threshold=0.8)   # [(resume_id, jaccard), ...]
+"""
+
+import hashlib
+import re
+import zlib
+import numpy as np
+from sqlalchemy import event, text
+from sqlalchemy.orm.attributes import get_history
+
+from config.config import Config
+from database.db import db
+from models.resume_model import Resume
+
+_MERSENNE = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+SIGNATURE_DTYPE = np.dtype("<u4")
+
+_rng = np.random.RandomState(1)   # fixed: stored signatures must stay comparable across processes
+_PERM_A = _rng.randint(1, (1 << 61) - 1, size=Config.MINHASH_NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, (1 << 61) - 1, size=Config.MINHASH_NUM_PERM, dtype=np.uint64)
+
+
+# ---------- signatures ----------
+def shingle_hashes(text: str, words: int = None) -> np.ndarray:
+    """Distinct crc32 hashes of the word n-grams of `text`."""
+    words = words or Config.MINHASH_SHINGLE_WORDS
+    tokens = _TOKEN.findall((text or "").lower())
+    if not tokens:
+        return np.zeros(0, dtype=np.uint64)
+    if len(tokens) < words:
+        shingles = {" ".join(tokens)}
+    else:
+        shingles = {" ".join(tokens[i:i + words]) for i in range(len(tokens) - words + 1)}
+    return np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+
+def minhash_signature(text: str):
+    """MinHash signature (uint32[MINHASH_NUM_PERM]) of a text, or None if it has no words."""
+    hashes = shingle_hashes(text)
+    if not len(hashes):
+        return None
+    with np.errstate(over="ignore"):   # universal hashing mod 2^61-1; uint64 wrap-around is intended
+        phv = ((hashes[:, None] * _PERM_A + _PERM_B) % _MERSENNE) & _MAX_HASH
+    return phv.min(axis=0).astype(SIGNATURE_DTYPE)
+
+
+def encode_signature(sig) -> bytes:
+    return np.asarray(sig, dtype=SIGNATURE_DTYPE).tobytes()
+
+
+def decode_signature(blob):
+    if not blob:
+        return None
+    return np.frombuffer(blob, dtype=SIGNATURE_DTYPE)
+
+
+def estimate_jaccard(sig_a, sig_b) -> float:
+    return float(np.mean(np.asarray(sig_a) == np.asarray(sig_b)))
+
+
+def band_buckets(sig):
+    """[(band, bucket)] LSH keys of a signature; bucket is a signed 64-bit hash of the band."""
+    bands = Config.LSH_BANDS
+    rows = len(sig) // bands
+    out = []
+    for band in range(bands):
+        chunk = np.asarray(sig[band * rows:(band + 1) * rows], dtype=SIGNATURE_DTYPE).tobytes()
+        bucket = int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), "little", signed=True)
+        out.append((band, bucket))
+    return out
+
+
+# ---------- lookup ----------
+def find_similar_signatures(sig, threshold: float = None, exclude_id: int = None, limit: int = 50):
+    """[(resume_id, estimated jaccard)] of stored resumes sharing an LSH bucket with `sig`."""
+    if sig is None:
+        return []
+    threshold = Config.DUPLICATE_JACCARD_THRESHOLD if threshold is None else threshold
+    keys = band_buckets(sig)
+    rows = db.session.execute(text(
+        "SELECT r.id, r.minhash FROM resumes r WHERE r.id IN ("
+        "  SELECT DISTINCT b.resume_id FROM resume_lsh_buckets b"
+        "  JOIN unnest(CAST(:bands AS smallint[]), CAST(:buckets AS bigint[])) AS k(band, bucket)"
+        "    ON b.band = k.band AND b.bucket = k.bucket)"
+    ), {"bands": [b for b, _ in keys], "buckets": [k for _, k in keys]}).all()
+    hits = []
+    for rid, blob in rows:
+        if rid == exclude_id or not blob:
+            continue
+        other = decode_signature(bytes(blob))
+        if len(other) != len(sig):
+            continue
+        j = estimate_jaccard(sig, other)
+        if j >= threshold:
+            hits.append((rid, round(j, 4)))
+    hits.sort(key=lambda h: -h[1])
+    return hits[:limit]
+
+
+def find_near_duplicates(resume, threshold: float = None, limit: int = 50):
+    """Possible duplicates of a stored (or about to be stored) Resume."""
+    sig = decode_signature(resume.minhash) if resume.minhash else minhash_signature(resume.parsed_text)
+    return find_similar_signatures(sig, threshold=threshold, exclude_id=resume.id, limit=limit)
+
+
+def find_text_duplicates(parsed_text: str, threshold: float = None, limit: int = 50):
+    return find_similar_signatures(minhash_signature(parsed_text), threshold=threshold, limit=limit)
+
+
+def rewrite_buckets(resume):
+    """
+    Replace a stored resume's bucket rows from its current signature, e.g. after
+    LSH_BANDS changed (the signature bytes are the same, so no event fires).
+    """
+    _write_buckets(db.session.connection(), resume, replace=True)
+
+
+# ---------- keep signatures and buckets in step with Resume writes ----------
+@event.listens_for(Resume, "before_insert")
+def _sign_new_resume(mapper, connection, target):
+    if target.minhash is None and target.parsed_text:
+        sig = minhash_signature(target.parsed_text)
+        target.minhash = encode_signature(sig) if sig is not None else None
+
+
+@event.listens_for(Resume, "before_update")
+def _resign_resume(mapper, connection, target):
+    if get_history(target, "parsed_text").has_changes():
+        sig = minhash_signature(target.parsed_text)
+        target.minhash = encode_signature(sig) if sig is not None else None
+
+
+@event.listens_for(Resume, "after_insert")
+def _bucket_new_resume(mapper, connection, target):
+    _write_buckets(connection, target, replace=False)
+
+
+@event.listens_for(Resume, "after_update")
+def _rebucket_resume(mapper, connection, target):
+    if get_history(target, "minhash").has_changes():
+        _write_buckets(connection, target, replace=True)
+
+
+def _write_buckets(connection, target, replace: bool):
+    if replace:
+        connection.execute(text("DELETE FROM resume_lsh_buckets WHERE resume_id = :id"), {"id": target.id})
+    sig = decode_signature(target.minhash)
+    if sig is None:
+        return
+    connection.execute(
+        text("INSERT INTO resume_lsh_buckets (band, bucket, resume_id) VALUES (:band, :bucket, :id) "
+             "ON CONFLICT DO NOTHING"),
+        [{"band": band, "bucket": bucket, "id": target.id} for band, bucket in band_buckets(sig)],
+    )
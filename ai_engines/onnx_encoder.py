@@ -0,0 +1,208 @@
+# ai_engines/onnx_encoder.py
+"""
+ONNX Runtime CPU backend for the sentence encoder.
+
+The MiniLM transformer is exported to ONNX once, dynamically quantized to int8
+(weights only, activations stay fp32) and then served by onnxruntime, which needs
+neither torch nor a GPU. Pooling and normalization mirror the
+sentence-transformers pipeline of all-MiniLM-L6-v2 (mean pooling + L2 norm), so
+vectors match the torch path within PARITY_MIN_COSINE.
+
+Select it with EMBEDDING_BACKEND=onnx; EmbeddingService then hands out this
+encoder wherever the SentenceTransformer was used before.
+
+Every export is checked before it is swapped in: PARITY_SENTENCES are encoded
+by the new int8 model and by the torch SentenceTransformer, and an export with
+any cosine below PARITY_MIN_COSINE raises ParityError and leaves the previous
+model in place. `check` re-runs the same assertion on an existing export.
+
+Export once (needs torch + transformers + sentence-transformers, e.g. on a build box):
+    python -m ai_engines.onnx_encoder export --out models_saved/onnx/all-MiniLM-L6-v2-int8
+    python -m ai_engines.onnx_encoder check --dir models_saved/onnx/all-MiniLM-L6-v2-int8
+"""
+
+import inspect
+import os
+import shutil
+import tempfile
+import numpy as np
+
+# minimum per-sentence cosine between int8 ONNX and fp32 torch vectors
+PARITY_MIN_COSINE = 0.99
+
+# fixed parity set: resume lines, interview Q&A, policy text, a long paragraph, a single word
+PARITY_SENTENCES = [
+    "Senior Python developer with 6 years of Django, PostgreSQL and AWS experience.",
+    "Led a team of five engineers building a real-time analytics pipeline on Kafka and Spark.",
+    "Explain the difference between a process and a thread.",
+    "A thread shares memory with other threads of the same process; processes have isolated address spaces.",
+    "Employees may carry over up to ten days of unused annual leave into the next calendar year.",
+    "Strong communicator, mentors juniors, sometimes misses deadlines on cross-team work.",
+    "Machine learning engineer: PyTorch, TensorFlow, NLP, model deployment with Docker and Kubernetes.",
+    "Data analyst skilled in Excel, Tableau, Power BI and SQL reporting for finance stakeholders.",
+    "Responsible for payroll processing, attendance reconciliation and statutory compliance filings.",
+    "What would you do if a production deployment failed at 2am and the on-call engineer was unreachable?",
+    " ".join(["Long resume paragraph covering projects, responsibilities and achievements."] * 40),
+    "Java",
+]
+
+
+class ParityError(ValueError):
+    """An int8 ONNX export whose vectors drift from the torch encoder beyond PARITY_MIN_COSINE."""
+
+_ONNX_FILE = "model.onnx"
+_QUANT_FILE = "model.int8.onnx"
+
+
+def parity_cosines(onnx_model, torch_model, sentences=PARITY_SENTENCES):
+    """Per-sentence cosine between the ONNX and the torch (normalized) vectors of `sentences`."""
+    sentences = list(sentences)
+    ref = np.asarray(torch_model.encode(sentences, convert_to_numpy=True, normalize_embeddings=True), dtype=np.float32)
+    got = np.asarray(onnx_model.encode(sentences), dtype=np.float32)
+    return np.sum(ref * got, axis=1)
+
+
+def verify_parity(model_dir: str, model_name: str, min_cosine: float = PARITY_MIN_COSINE, torch_model=None):
+    """Cosines of PARITY_SENTENCES for the export in `model_dir`; ParityError when any is below `min_cosine`."""
+    if torch_model is None:
+        from sentence_transformers import SentenceTransformer
+        torch_model = SentenceTransformer(model_name, device="cpu")
+    cos = parity_cosines(OnnxSentenceEncoder(model_dir), torch_model)
+    if cos.min() < min_cosine:
+        worst = int(np.argmin(cos))
+        raise ParityError(f"int8 ONNX export of {model_name} drifts from torch: min cosine {cos.min():.5f} "
+                          f"< {min_cosine} (sentence {worst}: {PARITY_SENTENCES[worst][:60]!r})")
+    return cos
+
+
+def export_quantized_model(model_name: str, output_dir: str, opset: int = 14, verify: bool = True) -> str:
+    """
+    Export the HF transformer behind `model_name` to ONNX and int8-quantize it.
+    Writes the quantized model and tokenizer files into `output_dir`; returns its path.
+    With `verify`, an export that fails verify_parity raises ParityError and
+    `output_dir` keeps the previous model.
+    """
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    hf_name = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+    tokenizer = AutoTokenizer.from_pretrained(hf_name)
+    model = AutoModel.from_pretrained(hf_name)
+    model.eval()
+
+    parent = os.path.dirname(os.path.abspath(output_dir))
+    os.makedirs(parent, exist_ok=True)
+    # build in a scratch dir and swap in at the end so concurrent workers never see half a model
+    work_dir = tempfile.mkdtemp(prefix=".onnx-export-", dir=parent)
+    try:
+        dummy = tokenizer(["export sample"], return_tensors="pt")
+        fp32_path = os.path.join(work_dir, _ONNX_FILE)
+        extra = {}
+        if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+            extra["dynamo"] = False  # newer torch defaults to the dynamo exporter (needs onnxscript)
+        torch.onnx.export(
+            model,
+            (dummy["input_ids"], dummy["attention_mask"], dummy["token_type_ids"]),
+            fp32_path,
+            input_names=["input_ids", "attention_mask", "token_type_ids"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "seq"},
+                "attention_mask": {0: "batch", 1: "seq"},
+                "token_type_ids": {0: "batch", 1: "seq"},
+                "last_hidden_state": {0: "batch", 1: "seq"},
+            },
+            opset_version=opset,
+            do_constant_folding=True,
+            **extra,
+        )
+        quantize_dynamic(fp32_path, os.path.join(work_dir, _QUANT_FILE), weight_type=QuantType.QInt8)
+        os.remove(fp32_path)
+        tokenizer.save_pretrained(work_dir)
+        if verify:
+            verify_parity(work_dir, model_name)
+        if os.path.exists(output_dir):
+            shutil.rmtree(output_dir)
+        os.replace(work_dir, output_dir)
+    finally:
+        if os.path.exists(work_dir):
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return output_dir
+
+
+class OnnxSentenceEncoder:
+    """
+    Drop-in for SentenceTransformer.encode() backed by an int8 ONNX model.
+    """
+
+    def __init__(self, model_dir: str, max_seq_length: int = 256, num_threads: int = 0):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.model_dir = model_dir
+        self.max_seq_length = max_seq_length
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            opts.intra_op_num_threads = int(num_threads)
+        self.session = ort.InferenceSession(os.path.join(model_dir, _QUANT_FILE), sess_options=opts,
+                                            providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+    def encode(self, sentences, batch_size: int = 32, show_progress_bar: bool = False,
+               convert_to_numpy: bool = True, normalize_embeddings: bool = False):
+        # vectors are always unit-length, as with the Normalize module of the torch pipeline
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        # like sentence-transformers: sort by length so each batch pads as little as possible
+        order = np.argsort([-len(t) for t in texts], kind="stable")
+        out = [None] * len(texts)
+        for start in range(0, len(texts), batch_size):
+            idx = order[start:start + batch_size]
+            vecs = self._encode_batch([texts[i] for i in idx])
+            for i, v in zip(idx, vecs):
+                out[i] = v
+        result = np.vstack(out)
+        return result[0] if single else result
+
+    def _encode_batch(self, texts):
+        enc = self.tokenizer(texts, padding=True, truncation=True, max_length=self.max_seq_length,
+                             return_tensors="np")
+        feeds = {k: enc[k].astype(np.int64) for k in ("input_ids", "attention_mask", "token_type_ids")
+                 if k in self._input_names and k in enc}
+        if "token_type_ids" in self._input_names and "token_type_ids" not in feeds:
+            feeds["token_type_ids"] = np.zeros_like(feeds["input_ids"])
+        hidden = self.session.run(None, feeds)[0]
+        # mean pooling over real tokens, then L2 normalize (all-MiniLM-L6-v2's Pooling + Normalize)
+        mask = feeds["attention_mask"][..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (pooled / norms).astype(np.float32)
+
+
+if __name__ == "__main__":
+    import argparse
+    from config.config import Config
+
+    parser = argparse.ArgumentParser(description="Export the embedding model to int8 ONNX")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    exp = sub.add_parser("export")
+    exp.add_argument("--model", default=Config.EMBEDDING_MODEL_NAME)
+    exp.add_argument("--out", default=Config.EMBEDDING_ONNX_DIR)
+    chk = sub.add_parser("check", help="assert parity of an existing export with the torch encoder")
+    chk.add_argument("--model", default=Config.EMBEDDING_MODEL_NAME)
+    chk.add_argument("--dir", default=Config.EMBEDDING_ONNX_DIR)
+    args = parser.parse_args()
+    try:
+        if args.cmd == "export":
+            print(export_quantized_model(args.model, args.out))
+        else:
+            cos = verify_parity(args.dir, args.model)
+            print(f"parity ok: min cosine {cos.min():.5f}, mean {cos.mean():.5f} (required >= {PARITY_MIN_COSINE})")
+    except ParityError as e:
+        raise SystemExit(f"FAIL: {e}")
@@ -5,9 +5,13 @@ import numpy as np, pandas as pd
 from sklearn.ensemble import IsolationForest
 from xgboost import XGBRegressor
 import os, joblib, datetime
+from ai_engines.model_registry import registry
+from ai_engines.tree_inference import load_compiled
 
 ANOM_MODEL = "models_saved/attendance_iforest.joblib"
 SAL_MODEL = "models_saved/salary_predictor.joblib"
+# loaded once per version (not per call) and evaluated with inplace_predict
+registry.register("salary", SAL_MODEL, loader=load_compiled)
 
 # ---- Anomaly detection ----
 def train_anomaly_model(df: pd.DataFrame):
@@ -44,16 +48,15 @@ def train_salary_predictor(csv_path):
     y = df["final_salary"]
     model = XGBRegressor(n_estimators=150, max_depth=5, learning_rate=0.1)
     model.fit(X, y)
-    os.makedirs(os.path.dirname(SAL_MODEL), exist_ok=True)
-    joblib.dump(model, SAL_MODEL)
+    registry.save("salary", model)
     return model
 
 def predict_salary(features: dict):
-    if not os.path.exists(SAL_MODEL):
+    model = registry.get("salary")
+    if model is None:
         return calculate_payroll(features.get("base_salary",0),
                                  features.get("total_hours",0),
                                  leaves=features.get("leaves",0))
-    model = joblib.load(SAL_MODEL)
     X = np.array([[features.get("total_hours",0),
                    features.get("leaves",0),
                    features.get("overtime_hours",0)]])
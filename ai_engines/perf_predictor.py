@@ -6,26 +6,21 @@ Predictors for burnout / attrition risk.
 - A fallback heuristic is provided if no model exists.
 """
 
-import os, joblib, numpy as np
+import numpy as np
+
+from ai_engines.model_registry import registry
+from ai_engines.tree_inference import load_compiled
 
 MODEL_PATH = "models_saved/perf_predictor.joblib"
-_model = None
+# versioned + hot-reloaded: a retrained model reaches every worker without a restart;
+# the classifiers are compiled to flat arrays on load (ai_engines/tree_inference.py)
+registry.register("perf", MODEL_PATH, loader=load_compiled)
 
 def load_model():
-    global _model
-    if _model:
-        return _model
-    if os.path.exists(MODEL_PATH):
-        try:
-            _model = joblib.load(MODEL_PATH)
-            return _model
-        except Exception:
-            _model = None
-    return None
+    return registry.get("perf")
 
 def save_model(model):
-    os.makedirs(os.path.dirname(MODEL_PATH), exist_ok=True)
-    joblib.dump(model, MODEL_PATH)
+    return registry.save("perf", model)
 
 def train_attrition_model(csv_path):
     """
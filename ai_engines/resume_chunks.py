@@ -0,0 +1,196 @@
+# ai_engines/resume_chunks.py
+"""
+Section-aware chunk embeddings for resumes.
+
+MiniLM reads at most 256 word pieces, so one vector per resume only covers its
+first page or so. Here a resume is split at its section headings (experience,
+education, skills, ...) and each section into chunks of RESUME_CHUNK_WORDS
+words. The chunks of one resume - or of a whole batch of resumes - go through
+the encoder in a single encode() call.
+
+Chunk vectors are stored L2-normalized as a float16 matrix on
+Resume.chunk_embeddings (with the section of each row in chunk_sections), and
+Resume.embedding becomes their normalized mean, so the ANN index and the batch
+rescoring pass also see the whole document.
+
+At match time the per-chunk cosines are pooled:
+    max       best single chunk
+    mean      average over chunks
+    weighted  best chunk per section, averaged with RESUME_SECTION_WEIGHTS
+
+Usage:
+    from ai_engines.resume_chunks import embed_resumes, resume_job_score
+    for resume, emb in zip(resumes, embed_resumes([r.parsed_text for r in resumes])):
+        apply_embedding(resume, emb)
+    score = resume_job_score(resume, job_vec, pooling="max")
+"""
+
+import re
+from typing import List, Tuple
+import numpy as np
+
+from config.config import Config
+from ai_engines.embedding_service import get_embedding_model
+
+POOLINGS = ("max", "mean", "weighted")
+
+_SECTION_ALIASES = {
+    "summary": ["professional summary", "summary", "profile", "objective", "about me"],
+    "experience": ["professional experience", "work experience", "employment history", "work history", "experience",
+                   "employment"],
+    "education": ["education", "academic background", "qualifications"],
+    "skills": ["technical skills", "core competencies", "key skills", "skills", "technologies"],
+    "projects": ["projects", "personal projects", "key projects"],
+    "certifications": ["certifications", "certificates", "licenses", "awards", "achievements"],
+}
+_ALIAS_TO_SECTION = {a: s for s, aliases in _SECTION_ALIASES.items() for a in aliases}
+_ALIASES = "|".join(re.escape(a) for a in sorted(_ALIAS_TO_SECTION, key=len, reverse=True))
+# parsed_text has its whitespace collapsed, so a heading is recognised when it is written in capitals,
+# followed by a colon, or (in raw text) alone on its line
+_HEADING_PATTERNS = [
+    re.compile(rf"(?<![A-Za-z])({_ALIASES.upper()})(?![A-Za-z])"),
+    re.compile(rf"(?i)\b({_ALIASES})\s*:"),
+    re.compile(rf"(?im)^[ \t]*({_ALIASES})[ \t]*$"),
+]
+
+
+# ---------- splitting ----------
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """[(section, text)] in document order; text before the first heading counts as "summary"."""
+    text = text or ""
+    marks = []
+    for pattern in _HEADING_PATTERNS:
+        for m in pattern.finditer(text):
+            marks.append((m.start(), m.end(), _ALIAS_TO_SECTION[m.group(1).lower()]))
+    marks.sort()
+    sections, pos, current = [], 0, "summary"
+    for start, end, name in marks:
+        if start < pos:
+            continue   # overlapping match of another pattern
+        sections.append((current, text[pos:start]))
+        pos, current = end, name
+    sections.append((current, text[pos:]))
+    return [(name, body.strip(" :\n\t")) for name, body in sections if body.strip(" :\n\t")]
+
+
+def chunk_resume(text: str) -> Tuple[List[str], List[str]]:
+    """(section labels, chunk texts): each section cut into RESUME_CHUNK_WORDS-word chunks."""
+    size = Config.RESUME_CHUNK_WORDS
+    labels, chunks = [], []
+    for name, body in split_sections(text):
+        words = body.split()
+        for i in range(0, len(words), size):
+            labels.append(name)
+            chunks.append(" ".join(words[i:i + size]))
+    limit = Config.RESUME_MAX_CHUNKS
+    return labels[:limit], chunks[:limit]
+
+
+# ---------- encoding ----------
+class ChunkEmbedding:
+    """Chunk vectors of one resume: float16 `matrix` rows, their `sections`, and the pooled `embedding`."""
+
+    __slots__ = ("matrix", "sections", "embedding")
+
+    def __init__(self, matrix, sections, embedding):
+        self.matrix = matrix
+        self.sections = sections
+        self.embedding = embedding
+
+
+def _normalize(mat):
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return mat / norms
+
+
+def embed_resumes(texts: List[str], extra: List[str] = None, batch_size: int = 64):
+    """
+    ChunkEmbedding (or None for an empty text) per resume text. All chunks of
+    all texts - plus the `extra` strings, e.g. a job description - are encoded
+    in one batched call; with `extra` returns (embeddings, extra vectors).
+    """
+    extra = list(extra or [])
+    per_text = [chunk_resume(t) for t in texts]
+    flat = extra + [c for _, chunks in per_text for c in chunks]
+    vecs = get_embedding_model().encode(flat, batch_size=batch_size) if flat else np.zeros((0, 0), np.float32)
+    out, row = [], len(extra)
+    for labels, chunks in per_text:
+        if not chunks:
+            out.append(None)
+            continue
+        mat = _normalize(np.asarray(vecs[row:row + len(chunks)], dtype=np.float32))
+        row += len(chunks)
+        pooled = _normalize(mat.mean(axis=0, keepdims=True))[0]
+        out.append(ChunkEmbedding(mat.astype(np.float16), labels, pooled.astype(np.float32)))
+    return (out, vecs[:len(extra)]) if extra else out
+
+
+def apply_embedding(resume, emb):
+    """
+    Store a ChunkEmbedding on a Resume (pooled vector in .embedding, rows in .chunk_embeddings);
+    None (no text / no chunks) clears both, so a stale vector stops ranking the resume.
+    """
+    if emb is None:
+        resume.embedding = None
+        resume.set_chunk_embeddings([], [])
+        return
+    resume.set_embedding(emb.embedding)
+    resume.set_chunk_embeddings(emb.matrix, emb.sections)
+
+
+# ---------- pooling ----------
+def section_weights() -> dict:
+    weights = {}
+    for part in Config.RESUME_SECTION_WEIGHTS.split(","):
+        name, _, value = part.partition(":")
+        if name.strip() and value.strip():
+            weights[name.strip()] = float(value)
+    return weights
+
+
+def pool_similarities(sims, sections, pooling: str = None) -> float:
+    """Combine per-chunk cosines into one score (0..1)."""
+    sims = np.clip(np.asarray(sims, dtype=np.float32), 0.0, 1.0)
+    if not len(sims):
+        return 0.0
+    pooling = pooling or Config.RESUME_CHUNK_POOLING
+    if pooling == "max":
+        return float(sims.max())
+    if pooling == "mean":
+        return float(sims.mean())
+    if pooling != "weighted":
+        raise ValueError(f"Unknown pooling: {pooling} (expected one of {', '.join(POOLINGS)})")
+    weights = section_weights()
+    best = {}
+    for name, s in zip(sections, sims):
+        best[name] = max(best.get(name, 0.0), float(s))
+    total = sum(weights.get(name, 0.5) for name in best)
+    return sum(weights.get(name, 0.5) * s for name, s in best.items()) / total if total else 0.0
+
+
+def score_chunks(query_vec, matrix, sections, pooling: str = None) -> float:
+    q = np.asarray(query_vec, dtype=np.float32)
+    norm = np.linalg.norm(q)
+    if not norm:
+        return 0.0
+    return pool_similarities(np.asarray(matrix, dtype=np.float32) @ (q / norm), sections, pooling)
+
+
+def resume_job_score(resume, job_vec, pooling: str = None):
+    """Pooled chunk score of a stored Resume vs a job vector; the single embedding when it has no chunks."""
+    matrix, sections = resume.get_chunk_embeddings()
+    if matrix is not None:
+        return score_chunks(job_vec, matrix, sections, pooling)
+    vec = resume.get_embedding()
+    if vec is None:
+        return None
+    return score_chunks(job_vec, vec.reshape(1, -1), ["summary"], "max")
+
+
+def score_text_vs_job(resume_text: str, job_description: str, pooling: str = None):
+    """(score 0..1, pooled resume vector) with the job and every resume chunk encoded in one call."""
+    (emb,), (job_vec,) = embed_resumes([resume_text], extra=[job_description])
+    if emb is None:
+        return 0.0, None
+    return score_chunks(job_vec, emb.matrix, emb.sections, pooling), emb.embedding
@@ -0,0 +1,393 @@
+# ai_engines/resume_index.py
+"""
+Nearest-neighbour index over stored resume embeddings ("top-K resumes for this job").
+
+Two backends:
+- pgvector: when the `vector` extension is installed, migrations add
+  resumes.embedding_vec (vector(384)) with an HNSW cosine index; queries are a
+  single ORDER BY embedding_vec <=> :q LIMIT k. The column is kept in sync by the
+  Resume mapper events below (it is not mapped on the model).
+- numpy: an in-process index built from Resume.embedding. Exact (flat) search
+  below RESUME_INDEX_FLAT_THRESHOLD vectors, IVF (k-means coarse quantizer,
+  nprobe lists scanned) above it. Rows written by this worker are applied when
+  their transaction commits (and dropped on rollback); rows inserted by other
+  workers are picked up by reading ids above the highest one already indexed,
+  at most every RESUME_INDEX_POLL_SECONDS. The periodic full rebuild runs on
+  one background thread and is swapped in when done, so searches keep using
+  the current index meanwhile.
+
+Usage:
+    from ai_engines.resume_index import top_k_resumes
+    hits = top_k_resumes(job_vec, k=20)   # [(resume_id, cosine), ...]
+"""
+
+import threading
+import time
+import numpy as np
+from flask import current_app
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.attributes import get_history
+
+from config.config import Config
+from database.db import db
+from models.resume_model import Resume, EMBEDDING_DTYPE
+
+_INDEX = None
+_INDEX_LOCK = threading.Lock()
+_REFRESH_LOCK = threading.Lock()   # held while a background rebuild runs
+_LAST_POLL = 0.0
+_PGVECTOR = None
+
+
+# ---------- loading ----------
+def load_resume_matrix(min_id: int = 0):
+    """
+    Load (ids, matrix) for every resume with an embedding and id > min_id.
+    Rows are L2-normalized float32, so a dot product is the cosine similarity.
+    """
+    rows = db.session.execute(
+        db.select(Resume.id, Resume.embedding)
+        .where(Resume.embedding.isnot(None), Resume.id > min_id)
+        .order_by(Resume.id)
+    ).all()
+    return _rows_to_matrix(rows)
+
+
+def iter_resume_matrices(batch_rows: int = 50000):
+    """
+    Yield (ids, matrix) chunks of at most `batch_rows` resumes in id order, so a
+    full pass over the table never holds more than one chunk of vectors in memory.
+    """
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            db.select(Resume.id, Resume.embedding)
+            .where(Resume.embedding.isnot(None), Resume.id > last_id)
+            .order_by(Resume.id)
+            .limit(batch_rows)
+        ).all()
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        ids, mat = _rows_to_matrix(rows)
+        if mat is not None and len(ids):
+            yield ids, mat
+
+
+def _rows_to_matrix(rows):
+    if not rows:
+        return np.zeros(0, dtype=np.int64), None
+    dim = len(rows[-1][1]) // EMBEDDING_DTYPE.itemsize
+    keep = [(rid, blob) for rid, blob in rows if blob and len(blob) == dim * EMBEDDING_DTYPE.itemsize]
+    ids = np.fromiter((rid for rid, _ in keep), dtype=np.int64, count=len(keep))
+    mat = np.frombuffer(b"".join(blob for _, blob in keep), dtype=EMBEDDING_DTYPE).reshape(len(keep), dim)
+    return ids, normalize_rows(mat)
+
+
+def normalize_rows(mat):
+    mat = np.asarray(mat, dtype=np.float32)
+    norms = np.linalg.norm(mat, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return mat / norms
+
+
+# ---------- in-process index ----------
+class NumpyResumeIndex:
+    def __init__(self, flat_threshold: int = 20000, nlist: int = 0, nprobe: int = 8):
+        self.flat_threshold = flat_threshold
+        self.nlist_setting = nlist
+        self.nprobe = nprobe
+        self._lock = threading.RLock()
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._vecs = None
+        self._size = 0
+        self._pos = {}                 # resume_id -> row
+        self._centroids = None         # (nlist, dim) when IVF is trained
+        self._assign = np.zeros(0, dtype=np.int32)
+        self._lists = None             # cached {list_no: row indices}
+        self.max_id = 0
+        self.built_at = None
+
+    @property
+    def kind(self):
+        return "ivf" if self._centroids is not None else "flat"
+
+    def __len__(self):
+        return len(self._pos)
+
+    def build(self, ids, mat):
+        with self._lock:
+            self._ids = np.zeros(0, dtype=np.int64)
+            self._vecs = None
+            self._size = 0
+            self._pos = {}
+            self._centroids = None
+            self._assign = np.zeros(0, dtype=np.int32)
+            self._lists = None
+            self.max_id = 0
+            if mat is not None and len(ids):
+                if len(ids) >= self.flat_threshold:
+                    self._train(mat)
+                self._append(ids, mat)
+            self.built_at = time.time()
+
+    def add(self, ids, mat):
+        """Insert or replace vectors (already normalized)."""
+        if mat is None or not len(ids):
+            return
+        with self._lock:
+            fresh = [i for i, rid in enumerate(ids) if int(rid) not in self._pos]
+            for i, rid in enumerate(ids):
+                row = self._pos.get(int(rid))
+                if row is not None:
+                    self._vecs[row] = mat[i]
+                    if self._centroids is not None:
+                        self._assign[row] = int(np.argmax(self._centroids @ mat[i]))
+                        self._lists = None
+            if fresh:
+                self._append(np.asarray(ids)[fresh], mat[fresh])
+            if self._centroids is None and len(self._pos) >= self.flat_threshold:
+                # crossed the threshold: switch to IVF
+                self._train(self._vecs[:self._size])
+                self._assign[:self._size] = self._nearest_centroid(self._vecs[:self._size])
+                self._lists = None
+
+    def remove(self, resume_id):
+        with self._lock:
+            row = self._pos.pop(int(resume_id), None)
+            if row is not None:
+                self._ids[row] = -1
+                self._lists = None
+
+    def search(self, query, k: int = 20):
+        q = normalize_rows(np.asarray(query, dtype=np.float32).reshape(1, -1))[0]
+        with self._lock:
+            if not self._pos:
+                return []
+            if self._centroids is None:
+                rows = np.arange(self._size)
+            else:
+                probes = np.argsort(-(self._centroids @ q))[:self.nprobe]
+                lists = self._inverted_lists()
+                rows = np.concatenate([lists.get(int(c), np.zeros(0, dtype=np.int64)) for c in probes])
+            rows = rows[self._ids[rows] >= 0]
+            if not len(rows):
+                return []
+            sims = self._vecs[rows] @ q
+            top = np.argpartition(-sims, min(k, len(sims)) - 1)[:k]
+            top = top[np.argsort(-sims[top])]
+            return [(int(self._ids[rows[i]]), float(sims[i])) for i in top]
+
+    # ---- internals ----
+    def _append(self, ids, mat):
+        n = len(ids)
+        need = self._size + n
+        if self._vecs is None or need > len(self._vecs):
+            cap = max(need, 2 * (len(self._vecs) if self._vecs is not None else 0), 1024)
+            vecs = np.zeros((cap, mat.shape[1]), dtype=np.float32)
+            id_buf = np.full(cap, -1, dtype=np.int64)
+            assign = np.zeros(cap, dtype=np.int32)
+            if self._vecs is not None:
+                vecs[:self._size] = self._vecs[:self._size]
+                id_buf[:self._size] = self._ids[:self._size]
+                assign[:self._size] = self._assign[:self._size]
+            self._vecs, self._ids, self._assign = vecs, id_buf, assign
+        self._vecs[self._size:need] = mat
+        self._ids[self._size:need] = ids
+        if self._centroids is not None:
+            self._assign[self._size:need] = self._nearest_centroid(mat)
+        for i, rid in enumerate(ids):
+            self._pos[int(rid)] = self._size + i
+        self._size = need
+        self.max_id = max(self.max_id, int(np.max(ids)))
+        self._lists = None
+
+    def _train(self, mat, iters: int = 10, seed: int = 42):
+        nlist = self.nlist_setting or int(np.sqrt(len(mat)))
+        nlist = max(1, min(nlist, len(mat)))
+        rng = np.random.default_rng(seed)
+        sample = mat[rng.choice(len(mat), size=min(len(mat), nlist * 64), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(iters):  # spherical k-means: normalized cluster sums
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            empty = ~np.any(sums, axis=1)
+            sums[empty] = centroids[empty]
+            centroids = normalize_rows(sums)
+        self._centroids = centroids
+
+    def _nearest_centroid(self, mat, chunk: int = 65536):
+        out = np.empty(len(mat), dtype=np.int32)
+        for s in range(0, len(mat), chunk):
+            out[s:s + chunk] = np.argmax(mat[s:s + chunk] @ self._centroids.T, axis=1)
+        return out
+
+    def _inverted_lists(self):
+        if self._lists is None:
+            assign = self._assign[:self._size]
+            order = np.argsort(assign, kind="stable")
+            bounds = np.searchsorted(assign[order], np.arange(len(self._centroids) + 1))
+            self._lists = {c: order[bounds[c]:bounds[c + 1]] for c in range(len(self._centroids))
+                           if bounds[c + 1] > bounds[c]}
+        return self._lists
+
+
+def _new_numpy_index() -> NumpyResumeIndex:
+    idx = NumpyResumeIndex(flat_threshold=Config.RESUME_INDEX_FLAT_THRESHOLD,
+                           nlist=Config.RESUME_INDEX_NLIST, nprobe=Config.RESUME_INDEX_NPROBE)
+    idx.build(*load_resume_matrix())
+    return idx
+
+
+def _refresh_in_background(app):
+    """Rebuild the index on one daemon thread and swap it in; searches keep using the old one meanwhile."""
+    def run():
+        global _INDEX
+        try:
+            with app.app_context():
+                fresh = _new_numpy_index()
+                db.session.remove()
+            old = _INDEX
+            with old._lock:
+                # rows committed by this worker while the rebuild was loading
+                rows = np.flatnonzero(old._ids[:old._size] > fresh.max_id)
+                if len(rows):
+                    fresh.add(old._ids[rows], old._vecs[rows])
+                _INDEX = fresh
+        except Exception:
+            app.logger.exception("Resume index rebuild failed")
+            if _INDEX is not None:
+                _INDEX.built_at = time.time()   # retry after another RESUME_INDEX_REBUILD_SECONDS
+        finally:
+            _REFRESH_LOCK.release()
+    threading.Thread(target=run, name="resume-index-rebuild", daemon=True).start()
+
+
+def get_numpy_index() -> NumpyResumeIndex:
+    """Process-wide in-process index; built from the database on first use."""
+    global _INDEX, _LAST_POLL
+    if _INDEX is None:
+        with _INDEX_LOCK:
+            if _INDEX is None:
+                _INDEX = _new_numpy_index()
+                _LAST_POLL = time.time()
+    idx = _INDEX
+    now = time.time()
+    if idx.built_at and now - idx.built_at > Config.RESUME_INDEX_REBUILD_SECONDS:
+        # periodic full rebuild picks up edits/deletes made by other workers; one at a time, off the request
+        if _REFRESH_LOCK.acquire(blocking=False):
+            _refresh_in_background(current_app._get_current_object())
+    elif now - _LAST_POLL >= Config.RESUME_INDEX_POLL_SECONDS:
+        # rows inserted by other workers; this worker's own writes are added by the mapper events
+        _LAST_POLL = now
+        idx.add(*load_resume_matrix(min_id=idx.max_id))
+    return idx
+
+
+# ---------- pgvector ----------
+def pgvector_enabled(connection=None) -> bool:
+    """True when migrations created resumes.embedding_vec (pgvector installed)."""
+    global _PGVECTOR
+    if Config.RESUME_INDEX_BACKEND == "numpy":
+        return False
+    if _PGVECTOR is None:
+        executor = connection if connection is not None else db.session
+        _PGVECTOR = executor.execute(text(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_name = 'resumes' AND column_name = 'embedding_vec'"
+        )).first() is not None
+    return _PGVECTOR
+
+
+def to_pgvector_literal(vec) -> str:
+    return "[" + ",".join(f"{float(x):.7g}" for x in np.asarray(vec, dtype=np.float32).ravel()) + "]"
+
+
+_MAX_EF_SEARCH = 1000   # pgvector rejects larger hnsw.ef_search values
+
+
+def _pgvector_search(query, k):
+    ef = min(max(k, Config.RESUME_INDEX_EF_SEARCH), _MAX_EF_SEARCH)
+    db.session.execute(text("SET LOCAL hnsw.ef_search = :ef"), {"ef": ef})
+    rows = db.session.execute(text(
+        "SELECT id, 1 - (embedding_vec <=> CAST(:q AS vector)) AS score "
+        "FROM resumes WHERE embedding_vec IS NOT NULL "
+        "ORDER BY embedding_vec <=> CAST(:q AS vector) LIMIT :k"
+    ), {"q": to_pgvector_literal(query), "k": int(k)}).all()
+    return [(int(r[0]), float(r[1])) for r in rows]
+
+
+# ---------- public API ----------
+def index_backend() -> str:
+    return "pgvector" if pgvector_enabled() else "numpy"
+
+
+def top_k_resumes(query_vec, k: int = 20):
+    """Return [(resume_id, cosine similarity)] of the k nearest stored resumes."""
+    if pgvector_enabled():
+        return _pgvector_search(query_vec, k)
+    return get_numpy_index().search(query_vec, k)
+
+
+# ---------- keep the index in step with Resume writes ----------
+@event.listens_for(Resume, "after_insert")
+def _index_new_resume(mapper, connection, target):
+    _sync_resume_vector(connection, target)
+
+
+@event.listens_for(Resume, "after_update")
+def _reindex_resume(mapper, connection, target):
+    if get_history(target, "embedding").has_changes():
+        _sync_resume_vector(connection, target)
+
+
+def _sync_resume_vector(connection, target):
+    if pgvector_enabled(connection):
+        vec = target.get_embedding()
+        connection.execute(
+            text("UPDATE resumes SET embedding_vec = CAST(:v AS vector) WHERE id = :id"),
+            {"v": to_pgvector_literal(vec) if vec is not None else None, "id": target.id},
+        )
+        return
+    if _INDEX is None:
+        return  # built lazily from the table on first query
+    vec = target.get_embedding()
+    _queue_index_change(target, normalize_rows(vec.reshape(1, -1)) if vec is not None else None)
+
+
+@event.listens_for(Resume, "after_delete")
+def _drop_resume_vector(mapper, connection, target):
+    if _INDEX is not None:
+        _queue_index_change(target, None)
+
+
+# In-process index changes wait for the commit: a rolled-back insert must not leave
+# a phantom id behind, nor a rolled-back delete remove a vector that still exists.
+_PENDING_KEY = "resume_index_pending"
+
+
+def _queue_index_change(target, vec):
+    session = object_session(target)
+    if session is None:
+        return
+    session.info.setdefault(_PENDING_KEY, []).append((target.id, vec))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_index_changes(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    idx = _INDEX
+    if not pending or idx is None:
+        return
+    for resume_id, vec in pending:
+        if vec is None:
+            idx.remove(resume_id)
+        else:
+            idx.add(np.array([resume_id]), vec)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_index_changes(session):
+    session.info.pop(_PENDING_KEY, None)
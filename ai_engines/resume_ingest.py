@@ -0,0 +1,373 @@
+# ai_engines/resume_ingest.py
+"""
+Resume ingestion: single uploads and bulk imports (job-fair dumps of thousands
+of PDF/DOCX files).
+
+Files are stored content-addressed (utils/file_utils.store_stream), so each
+Resume records the sha256 of its bytes. A single upload whose bytes were seen
+before reuses the stored parsed_text, skills and embedding instead of parsing
+and encoding again; dedupe_stats() reports how much work that saved. Every
+Resume also gets a MinHash signature of its text (ai_engines/near_duplicates)
+so uploads that differ only slightly can be flagged as possible duplicates.
+
+A directory or .zip is streamed through a process pool. Every file is hashed
+first; files whose bytes are already stored as a Resume, or repeat an earlier
+file of the same source, are counted as duplicates and never parsed or
+embedded. Each parse task then copies a small group of files into the uploads
+folder, runs extract_text_from_file on each and extract_skills_batch over the
+group (CPU-bound pdfminer/spaCy work).
+The parent collects results, embeds their section chunks in large batches with
+the shared encoder (ai_engines/resume_chunks) and inserts Resume rows one batch
+per transaction.
+
+Progress is written to <RESUME_INGEST_DIR>/<run_id>.json after every batch.
+The run id is derived from the source path (zips uploaded over HTTP are saved
+under their content hash, so it identifies the archive's bytes), and every
+inserted row records meta.ingest_run / meta.ingest_key, so re-running an
+interrupted import of the same source skips the files that were already
+committed. Parser processes are started with forkserver (spawn where that is
+unavailable) rather than forked from a threaded web worker.
+
+Usage:
+    from ai_engines.resume_ingest import ingest_resumes
+    state = ingest_resumes("/data/jobfair_2026.zip", workers=8)
+    # or: flask resume ingest /data/jobfair_2026.zip
+
+    resume, reused = ingest_upload(request.files["resume"])
+    db.session.commit()
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from sqlalchemy import func, text
+
+from ai_engines.near_duplicates import encode_signature, minhash_signature
+from ai_engines.resume_chunks import apply_embedding, embed_resumes
+from config.config import Config
+from database.db import db
+from models.resume_model import Resume
+from werkzeug.utils import secure_filename
+from utils.file_utils import UPLOAD_DIR, StoredUpload, allowed_file, spool_upload, store_stream
+
+_MAX_ERRORS_KEPT = 50
+_FILES_PER_TASK = 16   # files parsed per worker task; their NER runs as one nlp.pipe batch
+_HASHES_PER_TASK = 64   # files hashed per worker task
+_ZIPS = {}   # per worker process: path -> open ZipFile
+
+_DEDUPE = {"uploads": 0, "parses_avoided": 0, "encodes_avoided": 0, "files_already_stored": 0}
+_DEDUPE_LOCK = threading.Lock()
+
+
+# ---------- single uploads ----------
+def find_parsed_duplicate(sha256: str):
+    """Earliest resume with the same bytes that was already parsed (prefer one with an embedding)."""
+    return Resume.query.filter(Resume.content_sha256 == sha256, Resume.parsed_text.isnot(None)) \
+        .order_by(Resume.embedding.is_(None), Resume.id).first()
+
+
+def parse_upload(file_storage, embed: bool = True, store: bool = True) -> dict:
+    """
+    Get an upload's text, skills and (with embed) embedding bytes, reusing those
+    of an earlier upload with identical bytes when there is one. The upload is
+    read once into memory (spooled to a temp file when large) and parsed from
+    there; with store it is also saved content-addressed under uploads/.
+    """
+    from ai_engines.resume_parser import extract_text_from_file, extract_skills
+    from models.resume_model import encode_chunk_matrix, encode_embedding
+
+    filename = secure_filename(file_storage.filename or "")
+    spooled, digest = spool_upload(file_storage.stream)
+    with spooled:
+        stored = None
+        if store:
+            path, _, existed = store_stream(spooled, filename)
+            stored = StoredUpload(path, filename, digest, existed)
+            spooled.seek(0)
+        dup = find_parsed_duplicate(digest)
+        result = {"stored": stored, "sha256": digest, "reused_from": dup.id if dup is not None else None}
+        if dup is not None:
+            result.update(text=dup.parsed_text, skills=list(dup.skills or []), embedding=dup.embedding,
+                          chunk_embeddings=dup.chunk_embeddings, chunk_sections=dup.chunk_sections,
+                          minhash=dup.minhash)
+        else:
+            parsed = extract_text_from_file(spooled, filename=filename)
+            result.update(text=parsed, skills=extract_skills(parsed), embedding=None,
+                          chunk_embeddings=None, chunk_sections=None, minhash=None)
+    encoded = False
+    if embed and result["chunk_embeddings"] is None and result["text"]:
+        # every section chunk in one encode call; the pooled vector becomes the resume embedding
+        emb = embed_resumes([result["text"]])[0]
+        if emb is not None:
+            result.update(embedding=encode_embedding(emb.embedding), chunk_embeddings=encode_chunk_matrix(emb.matrix),
+                          chunk_sections=list(emb.sections))
+            encoded = True
+    with _DEDUPE_LOCK:
+        _DEDUPE["uploads"] += 1
+        _DEDUPE["files_already_stored"] += int(stored is not None and stored.existed)
+        _DEDUPE["parses_avoided"] += int(dup is not None)
+        _DEDUPE["encodes_avoided"] += int(embed and dup is not None and not encoded)
+    return result
+
+
+def ingest_upload(file_storage, uploaded_by: int = None, meta: dict = None):
+    """Create a Resume from one upload (caller commits). Returns (resume, reused_existing_parse)."""
+    parsed = parse_upload(file_storage)
+    stored = parsed["stored"]
+    resume = Resume(filename=os.path.basename(stored.path), original_filename=stored.filename,
+                    content_sha256=stored.sha256, uploaded_by=uploaded_by, parsed_text=parsed["text"],
+                    skills=parsed["skills"], embedding=parsed["embedding"], chunk_embeddings=parsed["chunk_embeddings"],
+                    chunk_sections=parsed["chunk_sections"], minhash=parsed["minhash"], meta=meta)
+    db.session.add(resume)
+    return resume, parsed["reused_from"] is not None
+
+
+def dedupe_stats() -> dict:
+    """Upload dedupe counters: this process since start, and totals derived from the table."""
+    total, distinct = db.session.query(func.count(Resume.content_sha256),
+                                       func.count(func.distinct(Resume.content_sha256))).one()
+    with _DEDUPE_LOCK:
+        process = dict(_DEDUPE)
+    return {
+        "process": process,
+        "resumes_with_hash": total,
+        "distinct_contents": distinct,
+        "duplicate_uploads": total - distinct,   # each one a parse (and encode) not needed
+        "duplicate_rate": round((total - distinct) / total, 4) if total else 0.0,
+    }
+
+
+# ---------- sources ----------
+def run_id_for(source: str) -> str:
+    return hashlib.sha1(os.path.abspath(source).encode("utf-8")).hexdigest()[:12]
+
+
+def list_source_files(source: str):
+    """Sorted keys of ingestible files: paths relative to a directory, or zip member names."""
+    if os.path.isdir(source):
+        keys = []
+        for root, _, files in os.walk(source):
+            for name in files:
+                if allowed_file(name):
+                    keys.append(os.path.relpath(os.path.join(root, name), source))
+        return sorted(keys)
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as zf:
+            return sorted(i.filename for i in zf.infolist()
+                          if not i.is_dir() and allowed_file(i.filename) and "__MACOSX" not in i.filename)
+    raise ValueError(f"Not a directory or zip archive: {source}")
+
+
+# ---------- workers (run in child processes) ----------
+def _open_source_file(source: str, key: str):
+    if os.path.isdir(source):
+        return open(os.path.join(source, key), "rb")
+    zf = _ZIPS.get(source)
+    if zf is None:
+        zf = _ZIPS[source] = zipfile.ZipFile(source)
+    return zf.open(key)
+
+
+def _hash_files(source: str, keys) -> dict:
+    """{key: sha256 of its bytes}; unreadable files are left out (the parse task reports them)."""
+    digests = {}
+    for key in keys:
+        try:
+            with _open_source_file(source, key) as src:
+                h = hashlib.sha256()
+                for chunk in iter(lambda: src.read(1 << 20), b""):
+                    h.update(chunk)
+            digests[key] = h.hexdigest()
+        except Exception:
+            continue
+    return digests
+
+
+def _parse_files(source: str, keys) -> list:
+    """Store and extract text for each key, then run skill extraction over the group in one NER batch."""
+    from ai_engines.resume_parser import extract_text_from_file, extract_skills_batch
+    results = []
+    for key in keys:
+        path, existed = None, True
+        try:
+            src = _open_source_file(source, key)
+            with src:
+                spooled, digest = spool_upload(src)
+            with spooled:   # stored once, then parsed from memory rather than re-read from disk
+                path, _, existed = store_stream(spooled, key)
+                spooled.seek(0)
+                parsed = extract_text_from_file(spooled, filename=key)
+            if not parsed:
+                raise ValueError("no text extracted")
+            sig = minhash_signature(parsed)
+            results.append({"key": key, "dest": path, "sha256": digest, "text": parsed,
+                            "minhash": encode_signature(sig) if sig is not None else None})
+        except Exception as e:
+            if path and not existed and os.path.exists(path):
+                os.remove(path)
+            err = str(e) if isinstance(e, ValueError) else f"{type(e).__name__}: {e}"
+            results.append({"key": key, "error": err})
+    parsed = [r for r in results if "error" not in r]
+    if parsed:
+        # already one process per core: keep spaCy in-process
+        for r, skills in zip(parsed, extract_skills_batch([r["text"] for r in parsed], n_process=1)):
+            r["skills"] = skills
+    return results
+
+
+# ---------- progress ----------
+def state_path(run_id: str) -> str:
+    return os.path.join(Config.RESUME_INGEST_DIR, f"{run_id}.json")
+
+
+def read_state(run_id: str):
+    try:
+        with open(state_path(run_id), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_state(state: dict):
+    state["updated_at"] = time.time()
+    os.makedirs(Config.RESUME_INGEST_DIR, exist_ok=True)
+    path = state_path(state["run_id"])
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def _stored_hashes(digests) -> set:
+    """The given sha256 values that some Resume already has."""
+    digests, found = list(digests), set()
+    for i in range(0, len(digests), 1000):
+        part = digests[i:i + 1000]
+        found.update(r[0] for r in db.session.query(Resume.content_sha256)
+                     .filter(Resume.content_sha256.in_(part)).distinct())
+    return found
+
+
+def _unique_keys(pool, source: str, keys, state: dict) -> list:
+    """
+    Keys whose bytes are neither stored already nor those of an earlier key of this
+    source (hashed in the pool); the others are counted in state["duplicates"].
+    """
+    digests = {}
+    groups = [keys[i:i + _HASHES_PER_TASK] for i in range(0, len(keys), _HASHES_PER_TASK)]
+    for part in pool.map(_hash_files, [source] * len(groups), groups):
+        digests.update(part)
+    seen = _stored_hashes(set(digests.values()))
+    unique = []
+    for key in keys:
+        digest = digests.get(key)
+        if digest is not None:
+            if digest in seen:
+                state["duplicates"] += 1
+                continue
+            seen.add(digest)
+        unique.append(key)
+    return unique
+
+
+def _done_keys(run_id: str) -> set:
+    rows = db.session.execute(
+        text("SELECT meta->>'ingest_key' FROM resumes WHERE meta->>'ingest_run' = :run"), {"run": run_id}
+    ).all()
+    return {r[0] for r in rows}
+
+
+# ---------- driver ----------
+def _pool_context():
+    # forking a process that runs torch / encoder threads can deadlock the children
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    ctx = multiprocessing.get_context("forkserver")
+    # the server imports this module (models, config) once; each child forks from it already loaded
+    ctx.set_forkserver_preload([__name__])
+    return ctx
+
+
+def ingest_resumes(source: str, workers: int = None, batch_size: int = None, uploaded_by: int = None,
+                   progress=None) -> dict:
+    """
+    Import every resume file in `source` (directory or .zip). Must run inside an
+    app context. Returns the final progress state; `progress(state)` is called
+    after each committed batch.
+    """
+    source = os.path.abspath(source)
+    workers = workers or Config.RESUME_INGEST_WORKERS or os.cpu_count() or 1
+    batch_size = batch_size or Config.RESUME_INGEST_BATCH_SIZE
+    run_id = run_id_for(source)
+    keys = list_source_files(source)
+    done = _done_keys(run_id)
+    state = {
+        "run_id": run_id, "source": source, "status": "running", "total": len(keys),
+        "skipped": sum(1 for k in keys if k in done), "duplicates": 0, "inserted": 0, "failed": 0,
+        "errors": [], "started_at": time.time(),
+    }
+    _write_state(state)
+    todo = [k for k in keys if k not in done]
+    pending_rows = []
+
+    def flush():
+        if not pending_rows:
+            return
+        # the section chunks of the whole batch go through the encoder in one call
+        embs = embed_resumes([r["text"] for r in pending_rows])
+        resumes = []
+        for r, emb in zip(pending_rows, embs):
+            resume = Resume(filename=os.path.basename(r["dest"]), original_filename=os.path.basename(r["key"]),
+                            content_sha256=r["sha256"], uploaded_by=uploaded_by, parsed_text=r["text"], skills=r["skills"],
+                            minhash=r["minhash"], meta={"ingest_run": run_id, "ingest_key": r["key"]})
+            apply_embedding(resume, emb)
+            resumes.append(resume)
+        db.session.add_all(resumes)
+        db.session.commit()
+        state["inserted"] += len(resumes)
+        pending_rows.clear()
+        _write_state(state)
+        if progress:
+            progress(state)
+
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+            todo = _unique_keys(pool, source, todo, state)
+            _write_state(state)
+            tasks = iter([todo[i:i + _FILES_PER_TASK] for i in range(0, len(todo), _FILES_PER_TASK)])
+            in_flight = set()
+            window = workers * 2   # bounded: never materialize 10k futures / results at once
+            while True:
+                for group in tasks:
+                    in_flight.add(pool.submit(_parse_files, source, group))
+                    if len(in_flight) >= window:
+                        break
+                if not in_flight:
+                    break
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    for result in fut.result():
+                        if "error" in result:
+                            state["failed"] += 1
+                            state["errors"] = (state["errors"] + [{"key": result["key"], "error": result["error"]}])[-_MAX_ERRORS_KEPT:]
+                        else:
+                            pending_rows.append(result)
+                if len(pending_rows) >= batch_size:
+                    flush()
+            flush()
+    except BaseException as e:
+        db.session.rollback()
+        state["status"] = "interrupted" if isinstance(e, KeyboardInterrupt) else "failed"
+        state["error"] = f"{type(e).__name__}: {e}"
+        _write_state(state)
+        raise
+    state["status"] = "finished"
+    state["finished_at"] = time.time()
+    _write_state(state)
+    return state
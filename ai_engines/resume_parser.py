@@ -1,21 +1,20 @@
-import io
-import json
 import re
 from typing import Tuple, List
 import numpy as np
 
-# Text extraction libs
-from pdfminer.high_level import extract_text as extract_text_pdf
-import docx2txt
+# Text extraction (backend registry: PyMuPDF / pdfminer / docx2txt)
+from utils.doc_utils import extract_text
 
-# SentenceTransformers
-from sentence_transformers import SentenceTransformer, util
+from config.config import Config
+
+# Shared embedding service (one encoder per process)
+from ai_engines.embedding_service import get_embedding_model
+from ai_engines.skill_matcher import get_skill_matcher
 
 # Optional spaCy (for NER)
 import spacy
 
 # load models lazily (costly)
-_MODEL = None
 _NLP = None
 
 # small skills list - extend this for your domain
@@ -26,80 +25,94 @@ COMMON_SKILLS = [
 ]
 
 def _get_model():
-    global _MODEL
-    if _MODEL is None:
-        _MODEL = SentenceTransformer("all-MiniLM-L6-v2")
-    return _MODEL
+    return get_embedding_model()
 
 def _get_nlp():
+    """spaCy pipeline with only NER (plus any tok2vec it listens to) enabled."""
     global _NLP
     if _NLP is None:
         try:
-            _NLP = spacy.load("en_core_web_sm")
+            nlp = spacy.load(Config.SPACY_MODEL)
+            keep = {"ner"}
+            for name, proc in nlp.pipeline:
+                if "ner" in getattr(proc, "listening_components", ()):
+                    keep.add(name)
+            nlp.select_pipes(enable=[name for name in nlp.pipe_names if name in keep])
+            _NLP = nlp
         except Exception:
             _NLP = None
     return _NLP
 
 # ---------- Extraction ----------
-def extract_text_from_file(filepath: str) -> str:
+def extract_text_from_file(source, filename: str = None) -> str:
     """
-    Accepts path to .pdf or .docx (or .txt). Returns plain text.
+    Accepts path to .pdf or .docx (or .txt), or the file's bytes / a binary
+    file object plus its `filename` (for the extension). Returns plain text.
+    Backends (PyMuPDF, then pdfminer for PDFs), timeouts and the page cap come
+    from the registry in utils/doc_utils.py.
     """
-    lower = filepath.lower()
-    if lower.endswith(".pdf"):
-        try:
-            text = extract_text_pdf(filepath) or ""
-        except Exception:
-            text = _fallback_pdf_text(filepath)
-    elif lower.endswith(".docx") or lower.endswith(".doc"):
-        try:
-            text = docx2txt.process(filepath) or ""
-        except Exception:
-            text = ""
-    elif lower.endswith(".txt"):
-        with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-            text = f.read()
-    else:
-        text = ""
+    text = extract_text(source, filename=filename)
     # Basic cleaning
     text = re.sub(r'\s+', ' ', text).strip()
     return text
 
-def _fallback_pdf_text(filepath):
-    # minimal fallback (very small)
-    try:
-        with open(filepath, "rb") as f:
-            b = f.read()
-            # crude fallback - decode ignoring errors
-            return b.decode('utf-8', errors='ignore')
-    except Exception:
-        return ""
-
 # ---------- Skill extraction ----------
-def extract_skills(text: str, custom_skill_list: List[str] = None) -> List[str]:
-    text_lower = text.lower()
-    skills = set()
-    full_list = COMMON_SKILLS.copy()
-    if custom_skill_list:
-        full_list = list(set(full_list + custom_skill_list))
-    # simple keyword matching (word boundaries)
-    for skill in full_list:
-        pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-        if re.search(pattern, text_lower):
-            skills.add(skill)
-    # try some NER-based detection for ORG/TECH entities if spacy available
+_NER_LABELS = ("ORG", "PRODUCT", "WORK_OF_ART", "TECH")
+
+def extract_skills(text: str, custom_skill_list: List[str] = None,
+                   taxonomy_version: str = None) -> List[str]:
+    return extract_skills_batch([text], custom_skill_list, taxonomy_version)[0]
+
+def extract_skills_batch(texts: List[str], custom_skill_list: List[str] = None,
+                         taxonomy_version: str = None, batch_size: int = None,
+                         n_process: int = None) -> List[List[str]]:
+    """
+    Skills for many texts at once. Keyword matching runs per text; NER runs all
+    texts through one nlp.pipe() call (batch_size / n_process default to
+    Config.SPACY_NER_BATCH_SIZE / SPACY_NER_N_PROCESS). Long texts are split into
+    chunks of SPACY_NER_CHUNK_CHARS instead of being truncated.
+    """
+    # keyword matching (word boundaries): one Aho-Corasick pass, automaton cached per taxonomy
+    common = get_skill_matcher(COMMON_SKILLS)
+    custom = get_skill_matcher(custom_skill_list, version=taxonomy_version) if custom_skill_list else None
+    results = []
+    for text in texts:
+        skills = common.find(text)
+        if custom is not None:
+            skills |= custom.find(text)
+        results.append(skills)
+    # NER-based detection for ORG/TECH entities if spacy available
     nlp = _get_nlp()
     if nlp:
-        doc = nlp(text[:10000])  # limit to first chunk for speed
-        for ent in doc.ents:
-            if ent.label_ in ("ORG","PRODUCT","WORK_OF_ART","TECH") :
-                # generic check
-                s = ent.text.strip().lower()
-                if len(s) > 1 and s not in skills:
+        owners, chunks = [], []
+        for i, text in enumerate(texts):
+            for chunk in _chunk_text(text or "", Config.SPACY_NER_CHUNK_CHARS):
+                owners.append(i)
+                chunks.append(chunk)
+        docs = nlp.pipe(chunks, batch_size=batch_size or Config.SPACY_NER_BATCH_SIZE,
+                        n_process=n_process or Config.SPACY_NER_N_PROCESS)
+        for i, doc in zip(owners, docs):
+            skills = results[i]
+            for ent in doc.ents:
+                if ent.label_ in _NER_LABELS:
+                    s = ent.text.strip().lower()
                     # only add short tokens
-                    if len(s.split()) <= 3:
+                    if len(s) > 1 and s not in skills and len(s.split()) <= 3:
                         skills.add(s)
-    return sorted(list(skills))
+    return [sorted(skills) for skills in results]
+
+def _chunk_text(text: str, size: int) -> List[str]:
+    """Split at whitespace into pieces of at most `size` chars (words longer than that are cut)."""
+    chunks = []
+    while len(text) > size:
+        cut = text.rfind(" ", 0, size + 1)
+        if cut <= 0:
+            cut = size
+        chunks.append(text[:cut])
+        text = text[cut:].lstrip()
+    if text.strip():
+        chunks.append(text)
+    return chunks
 
 
 # ---------- Embeddings & similarity ----------
@@ -115,15 +128,13 @@ def cosine_similarity(vec_a, vec_b):
         return 0.0
     return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
 
-def score_resume_vs_job(resume_text: str, job_description: str) -> Tuple[float, List[float]]:
+def score_resume_vs_job(resume_text: str, job_description: str, pooling: str = None) -> Tuple[float, List[float]]:
     """
-    Returns (score 0..1, [resume_embedding])
+    Returns (score 0..1, [resume_embedding]). The whole resume is scored: it is
+    split into section chunks that are encoded with the job description in one
+    batch, and the chunk cosines are pooled (max / mean / weighted, default
+    Config.RESUME_CHUNK_POOLING). The embedding is the mean of the chunk vectors.
     """
-    model = _get_model()
-    # Option A: compute embeddings and cosine similarity
-    emb_resume = model.encode(resume_text, show_progress_bar=False, convert_to_numpy=True)
-    emb_job = model.encode(job_description, show_progress_bar=False, convert_to_numpy=True)
-    sim = cosine_similarity(emb_resume, emb_job)
-    # clamp to 0..1
-    sim = max(0.0, min(1.0, sim))
-    return sim, emb_resume.tolist()
+    from ai_engines.resume_chunks import score_text_vs_job
+    sim, emb_resume = score_text_vs_job(resume_text, job_description, pooling)
+    return sim, emb_resume.tolist() if emb_resume is not None else []
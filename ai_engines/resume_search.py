@@ -0,0 +1,140 @@
+# ai_engines/resume_search.py
+"""
+Recruiter search over stored resumes: Postgres full-text keyword ranking,
+embedding similarity, or both fused with reciprocal rank fusion.
+
+- keyword: resumes.search_tsv is a generated tsvector of parsed_text with a
+  GIN index, so `search_tsv @@ websearch_to_tsquery(...)` reads the posting
+  lists of the query terms instead of scanning parsed_text with ILIKE. Every
+  match is ranked by ts_rank_cd (a top-N sort that has to read each match's
+  tsvector), so a term found in most resumes ("python") costs more than a
+  rare one. RESUME_SEARCH_MAX_MATCHES > 0 bounds that cost by ranking only
+  that many matches, taken in index order rather than by relevance: results
+  are then approximate and the best hits of a common term can be missed.
+  The query accepts web-search syntax:
+  `python django`, `"data engineer"`, `java or kotlin`, `python -php`.
+- semantic: the query is embedded and looked up in the resume ANN index
+  (ai_engines/resume_index.top_k_resumes).
+- hybrid: the best RESUME_SEARCH_CANDIDATES of each ranking are fused with
+  RRF, score = sum over rankings of 1 / (RESUME_SEARCH_RRF_K + rank), which
+  needs no calibration between ts_rank and cosine values.
+
+Every mode ranks at most RESUME_SEARCH_CANDIDATES resumes, so paging stops
+there (has_more is false on the last page and later pages are rejected) and a
+large ?page= cannot force an arbitrarily deep index lookup. Only the requested
+page is loaded from resumes (with a ts_headline snippet).
+
+Usage:
+    from ai_engines.resume_search import search_resumes
+    page = search_resumes("python -php", mode="hybrid", page=1, per_page=20)
+    page["results"]   # [{"resume_id", "score", "keyword_rank", "semantic_rank", "headline", ...}, ...]
+"""
+
+from sqlalchemy import text
+
+from ai_engines.resume_index import top_k_resumes
+from ai_engines.resume_parser import embed_text
+from config.config import Config
+from database.db import db
+from models.resume_model import SEARCH_TS_CONFIG
+
+MODES = ("hybrid", "keyword", "semantic")
+
+_TSQUERY = f"websearch_to_tsquery('{SEARCH_TS_CONFIG}', :q)"
+
+
+def keyword_search(query: str, limit: int, max_matches: int = None):
+    """
+    [(resume_id, ts_rank_cd in 0..1)] best first; GIN index lookup on resumes.search_tsv.
+    With `max_matches` (RESUME_SEARCH_MAX_MATCHES) > 0 only that many matching rows,
+    in no particular order, are ranked: cheaper for common terms but approximate.
+    """
+    max_matches = Config.RESUME_SEARCH_MAX_MATCHES if max_matches is None else max_matches
+    cap = "LIMIT :max_matches" if max_matches > 0 else ""
+    rows = db.session.execute(text(
+        f"SELECT id, ts_rank_cd(search_tsv, {_TSQUERY}, 32) AS rank "
+        f"FROM (SELECT id, search_tsv FROM resumes WHERE search_tsv @@ {_TSQUERY} {cap}) m "
+        "ORDER BY rank DESC, id LIMIT :limit"
+    ), {"q": query, "limit": int(limit), "max_matches": int(max_matches)}).all()
+    return [(int(r[0]), float(r[1])) for r in rows]
+
+
+def semantic_search(query: str, limit: int):
+    """[(resume_id, cosine)] best first from the resume embedding index."""
+    return top_k_resumes(embed_text(query), k=int(limit))
+
+
+def rrf_fuse(rankings, k: int = None):
+    """
+    Reciprocal rank fusion of best-first [(id, score)] lists; returns
+    [(id, fused score, [rank in each list or None])] best first.
+    """
+    k = Config.RESUME_SEARCH_RRF_K if k is None else k
+    fused, ranks = {}, {}
+    for n, ranking in enumerate(rankings):
+        for rank, (rid, _) in enumerate(ranking, start=1):
+            fused[rid] = fused.get(rid, 0.0) + 1.0 / (k + rank)
+            ranks.setdefault(rid, [None] * len(rankings))[n] = rank
+    order = sorted(fused, key=lambda rid: (-fused[rid], rid))
+    return [(rid, fused[rid], ranks[rid]) for rid in order]
+
+
+def _page_rows(ids, query, with_headline):
+    headline = (f"ts_headline('{SEARCH_TS_CONFIG}', coalesce(parsed_text, ''), {_TSQUERY}, "
+                "'MaxFragments=2, MaxWords=18, MinWords=6')") if with_headline else "NULL"
+    rows = db.session.execute(text(
+        f"SELECT id, original_filename, uploaded_at, skills, {headline} FROM resumes WHERE id = ANY(:ids)"
+    ), {"ids": list(ids), "q": query}).all()
+    return {r[0]: r for r in rows}
+
+
+def search_resumes(query: str, mode: str = "hybrid", page: int = 1, per_page: int = 20):
+    """One page of search results; ValueError for an empty query or unknown mode."""
+    query = (query or "").strip()
+    if not query:
+        raise ValueError("empty query")
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {', '.join(MODES)}")
+    page, per_page = max(1, int(page)), max(1, int(per_page))
+    start = (page - 1) * per_page
+    depth = Config.RESUME_SEARCH_CANDIDATES
+    if start >= depth:
+        raise ValueError(f"page must be at most {-(-depth // per_page)} with per_page={per_page}")
+
+    keyword = keyword_search(query, depth) if mode in ("hybrid", "keyword") else []
+    semantic = semantic_search(query, depth) if mode in ("hybrid", "semantic") else []
+    if mode == "keyword":
+        ranked = [(rid, score, [rank, None]) for rank, (rid, score) in enumerate(keyword, start=1)]
+    elif mode == "semantic":
+        ranked = [(rid, score, [None, rank]) for rank, (rid, score) in enumerate(semantic, start=1)]
+    else:
+        ranked = rrf_fuse([keyword, semantic])[:depth]
+
+    window = ranked[start:start + per_page]
+    rows = _page_rows([rid for rid, _, _ in window], query, with_headline=mode != "semantic") if window else {}
+    kw_scores, sem_scores = dict(keyword), dict(semantic)
+    results = []
+    for rid, score, (kw_rank, sem_rank) in window:
+        row = rows.get(rid)
+        if row is None:   # deleted since it was indexed
+            continue
+        results.append({
+            "resume_id": rid,
+            "score": round(float(score), 6),
+            "keyword_rank": kw_rank,
+            "keyword_score": kw_scores.get(rid),
+            "semantic_rank": sem_rank,
+            "semantic_score": sem_scores.get(rid),
+            "original_filename": row[1],
+            "uploaded_at": row[2].isoformat() if row[2] else None,
+            "skills": row[3] or [],
+            "headline": row[4],
+        })
+    return {
+        "query": query,
+        "mode": mode,
+        "page": page,
+        "per_page": per_page,
+        "results": results,
+        "has_more": len(ranked) > start + per_page,
+    }
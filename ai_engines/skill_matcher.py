@@ -0,0 +1,143 @@
+# ai_engines/skill_matcher.py
+"""
+Multi-pattern skill matcher (Aho–Corasick automaton).
+
+One pass over the resume text finds every skill of the taxonomy, so matching
+cost grows with the text length, not with the number of skills. Semantics
+follow the old per-skill `\\b<skill>\\b` regex loop:
+- case-insensitive, runs of whitespace compare equal ("machine  learning")
+- a match may not start or end inside a word: the character before a skill
+  starting with a word character, and the one after a skill ending with one,
+  must not be a word character. Edges made of symbols need no boundary, so
+  "c++" and "c#" now match in "c++ developer" (the regex \\b after "+" did not).
+- overlapping skills are all reported ("machine learning" and "learning")
+
+Automatons are cached per taxonomy, so a 40k-entry list is compiled once.
+
+Usage:
+    from ai_engines.skill_matcher import get_skill_matcher
+    matcher = get_skill_matcher(skills)           # cached per taxonomy
+    matcher.find("Senior Python / Machine Learning engineer")   # -> {"python", "machine learning"}
+"""
+
+import re
+import threading
+from collections import OrderedDict, deque
+
+_WS = re.compile(r"\s+")
+_SHIFT = 21            # ord() of any unicode char fits in 21 bits
+_CACHE_SIZE = 8
+
+_CACHE = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def _norm(text: str) -> str:
+    return _WS.sub(" ", text.lower())
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class SkillMatcher:
+    def __init__(self, skills):
+        self.skills = tuple(skills)
+        # normalized pattern -> names as given (a taxonomy may list "SQL" and "sql")
+        names = {}
+        for s in self.skills:
+            p = _norm(s).strip()
+            if p:
+                names.setdefault(p, []).append(s)
+        self._patterns = list(names)
+        self._names = [names[p] for p in self._patterns]
+        self._lengths = [len(p) for p in self._patterns]
+        self._left_bound = [_is_word(p[0]) for p in self._patterns]
+        self._right_bound = [_is_word(p[-1]) for p in self._patterns]
+        self._build()
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def _build(self):
+        # flat transition table {state << 21 | ord(ch): next_state}: far smaller than a dict per node
+        goto = {}
+        children = [[]]
+        out = [-1]
+        for pid, pattern in enumerate(self._patterns):
+            state = 0
+            for ch in pattern:
+                key = (state << _SHIFT) | ord(ch)
+                nxt = goto.get(key)
+                if nxt is None:
+                    nxt = len(out)
+                    goto[key] = nxt
+                    children[state].append((ord(ch), nxt))
+                    children.append([])
+                    out.append(-1)
+                state = nxt
+            out[state] = pid
+        fail = [0] * len(out)
+        report = [0] * len(out)   # nearest state (self or via fail links) that ends a pattern
+        queue = deque()
+        for _, nxt in children[0]:
+            queue.append(nxt)
+            report[nxt] = nxt if out[nxt] >= 0 else 0
+        while queue:
+            state = queue.popleft()
+            for code, nxt in children[state]:
+                f = fail[state]
+                while f and ((f << _SHIFT) | code) not in goto:
+                    f = fail[f]
+                f = goto.get((f << _SHIFT) | code, 0)
+                fail[nxt] = f
+                report[nxt] = nxt if out[nxt] >= 0 else report[f]
+                queue.append(nxt)
+        self._goto, self._fail, self._out, self._report = goto, fail, out, report
+
+    def find(self, text: str) -> set:
+        """Set of skill names (as given to the constructor) occurring in `text`."""
+        text = _norm(text or "")
+        goto, fail, out, report = self._goto, self._fail, self._out, self._report
+        lengths, left, right = self._lengths, self._left_bound, self._right_bound
+        found = set()
+        n = len(text)
+        state = 0
+        for i, ch in enumerate(text):
+            code = ord(ch)
+            nxt = goto.get((state << _SHIFT) | code)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto.get((state << _SHIFT) | code)
+            state = nxt or 0
+            hit = report[state]
+            while hit:
+                pid = out[hit]
+                if pid not in found:
+                    start = i - lengths[pid] + 1
+                    if (not left[pid] or start == 0 or not _is_word(text[start - 1])) and \
+                            (not right[pid] or i + 1 == n or not _is_word(text[i + 1])):
+                        found.add(pid)
+                hit = report[fail[hit]]
+        return {name for pid in found for name in self._names[pid]}
+
+
+def get_skill_matcher(skills, version=None) -> SkillMatcher:
+    """
+    Cached matcher for a skill list. Pass `version` (e.g. the taxonomy's revision)
+    to skip the content comparison; otherwise the list content is the cache key.
+    """
+    skills = tuple(skills)
+    key = ("v", version) if version is not None else ("h", len(skills), hash(skills))
+    with _CACHE_LOCK:
+        matcher = _CACHE.get(key)
+        if matcher is not None and (version is not None or matcher.skills == skills):
+            _CACHE.move_to_end(key)
+            return matcher
+    matcher = SkillMatcher(skills)   # built outside the lock: large taxonomies take a while
+    with _CACHE_LOCK:
+        _CACHE[key] = matcher
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > _CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    return matcher
@@ -1,20 +1,16 @@
 """
 Two summarization modes:
 - LLM summarizer (if OPENAI_API_KEY or other LLM configured).
-- Extractive summarizer: split feedback into sentences, embed sentences with SentenceTransformer,
-  compute centroid, pick top-k sentences closest to centroid as summary.
+- Extractive summarizer: split feedback into sentences, embed sentences with the shared embedding
+  service, compute centroid, pick top-k sentences closest to centroid as summary.
 """
 
-from sentence_transformers import SentenceTransformer, util
+from ai_engines.embedding_service import get_embedding_model, cos_sim_to_centroid
 import os
 import math
 
-_MODEL = None
 def _get_model():
-    global _MODEL
-    if _MODEL is None:
-        _MODEL = SentenceTransformer("all-MiniLM-L6-v2")
-    return _MODEL
+    return get_embedding_model()
 
 def extractive_summary(text, max_sentences=3):
     if not text:
@@ -25,9 +21,8 @@ def extractive_summary(text, max_sentences=3):
     if not sents:
         return ""
     model = _get_model()
-    embeddings = model.encode(sents, convert_to_tensor=True)
-    centroid = embeddings.mean(dim=0)
-    cos = util.cos_sim(embeddings, centroid).cpu().numpy().flatten()
+    embeddings = model.encode(sents, show_progress_bar=False, convert_to_numpy=True)
+    cos = cos_sim_to_centroid(embeddings)
     # rank sentences by similarity
     idxs = cos.argsort()[::-1][:max_sentences]
     summary = " ".join([sents[i] for i in sorted(idxs)])
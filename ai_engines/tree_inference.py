@@ -0,0 +1,206 @@
+# ai_engines/tree_inference.py
+"""
+Low-latency inference for the tree-ensemble predictors (ATS score, attrition /
+burnout risk, salary).
+
+sklearn's forest predict() pays milliseconds per call in input validation and
+joblib dispatch, even for one row, and XGBoost's predict() builds a DMatrix.
+compile_model() turns a trained model into an object with the same
+predict / predict_proba interface:
+
+- sklearn DecisionTree*/RandomForest*/ExtraTrees* (regressor or classifier):
+  every tree's nodes are concatenated into flat NumPy arrays (feature,
+  threshold, left, right, leaf value) and all rows walk all trees at once, one
+  vectorized step per tree level. Inputs are compared as float32 like sklearn
+  does and trees are accumulated in sklearn's order, so outputs are identical.
+- XGBoost sklearn wrappers: Booster.inplace_predict() on the raw array (no DMatrix).
+- a dict of models (perf_predictor stores {"attrition": ..., "burnout": ...})
+  is compiled value by value; anything else is returned unchanged.
+
+Single rows may be passed as a 1-D array. Batches of more than
+NATIVE_BATCH_ROWS rows go to the original model, whose compiled tree walk is
+faster there (the results are the same). The registry loaders compile each
+model version once when it is loaded.
+
+Usage:
+    from ai_engines.tree_inference import compile_model
+    fast = compile_model(joblib.load(path))
+    fast.predict([[0.7, 80, 4]])
+    # latency and equality vs the original: python -m benchmarks.tree_inference
+"""
+
+import numpy as np
+
+_TREE_LEAF = -1
+NATIVE_BATCH_ROWS = 256   # measured crossover vs sklearn for 100-tree forests: python -m benchmarks.tree_inference
+
+
+def _as_2d(X):
+    X = np.asarray(X, dtype=np.float64)
+    return X.reshape(1, -1) if X.ndim == 1 else X
+
+
+class _FlatForest:
+    """All trees of an ensemble in flat arrays; leaves point to themselves."""
+
+    def __init__(self, estimators, n_features):
+        self.n_features = n_features
+        self.n_trees = len(estimators)
+        features, thresholds, lefts, rights, missing_left, values, roots = [], [], [], [], [], [], []
+        offset = depth = 0
+        for est in estimators:
+            t = est.tree_
+            n = t.node_count
+            leaf = t.children_left == _TREE_LEAF
+            idx = np.arange(n)
+            lefts.append(np.where(leaf, idx, t.children_left) + offset)
+            rights.append(np.where(leaf, idx, t.children_right) + offset)
+            features.append(np.where(leaf, 0, t.feature))
+            thresholds.append(np.where(leaf, 0.0, t.threshold))
+            mgl = getattr(t, "missing_go_to_left", None)
+            missing_left.append(np.asarray(mgl, dtype=bool) if mgl is not None else np.zeros(n, dtype=bool))
+            values.append(self._leaf_values(t.value))
+            roots.append(offset)
+            offset += n
+            depth = max(depth, t.max_depth)
+        self.feature = np.concatenate(features).astype(np.intp)
+        self.threshold = np.concatenate(thresholds).astype(np.float64)
+        self.left = np.concatenate(lefts).astype(np.intp)
+        self.right = np.concatenate(rights).astype(np.intp)
+        self.missing_left = np.concatenate(missing_left)
+        self.value = np.concatenate(values)
+        self.children = np.column_stack([self.right, self.left]).ravel()
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.depth = depth
+
+    def _leaf_values(self, value):
+        return value[:, 0, 0].astype(np.float64)
+
+    def leaves(self, X):
+        """(n_rows, n_trees) leaf node index reached by each row in each tree."""
+        X = _as_2d(X)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"X has {X.shape[1]} features, model expects {self.n_features}")
+        # sklearn casts inputs to float32 before comparing them with the (float64) thresholds
+        X = X.astype(np.float32).astype(np.float64)
+        flat = X.ravel()
+        row_base = (np.arange(len(X)) * X.shape[1])[:, None]
+        node = np.broadcast_to(self.roots, (len(X), self.n_trees)).copy()
+        nan = np.isnan(X).any()
+        for _ in range(self.depth):
+            x = flat[row_base + self.feature[node]]
+            go_left = x <= self.threshold[node]
+            if nan:
+                go_left = np.where(np.isnan(x), self.missing_left[node], go_left)
+            node = self.children[2 * node + go_left]   # [right, left] pairs
+        return node
+
+    def accumulate(self, X):
+        """Sum of the trees' leaf values, added tree by tree (sklearn's summation order)."""
+        vals = self.value[self.leaves(X)]
+        out = np.zeros(vals.shape[:1] + vals.shape[2:], dtype=np.float64)
+        for t in range(self.n_trees):
+            out += vals[:, t]
+        return out
+
+
+class _FlatClassForest(_FlatForest):
+    def _leaf_values(self, value):
+        proba = value[:, 0, :].astype(np.float64)
+        normalizer = proba.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0.0] = 1.0
+        return proba / normalizer
+
+
+class CompiledForestRegressor:
+    def __init__(self, model):
+        estimators = getattr(model, "estimators_", None) or [model]
+        self.original = model
+        self._forest = _FlatForest(estimators, model.n_features_in_)
+
+    def predict(self, X):
+        X = _as_2d(X)
+        if len(X) > NATIVE_BATCH_ROWS:
+            return self.original.predict(X)
+        return self._forest.accumulate(X) / self._forest.n_trees
+
+
+class CompiledForestClassifier:
+    def __init__(self, model):
+        estimators = getattr(model, "estimators_", None) or [model]
+        self.original = model
+        self.classes_ = model.classes_
+        self._forest = _FlatClassForest(estimators, model.n_features_in_)
+
+    def predict_proba(self, X):
+        X = _as_2d(X)
+        if len(X) > NATIVE_BATCH_ROWS:
+            return self.original.predict_proba(X)
+        return self._forest.accumulate(X) / self._forest.n_trees
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+
+class InplaceXGBModel:
+    """XGBoost sklearn model evaluated with Booster.inplace_predict (no DMatrix per call)."""
+
+    def __init__(self, model):
+        self.original = model
+        self._booster = model.get_booster()
+        best = getattr(model, "best_iteration", None)   # early stopping: predict() stops there too
+        self._iteration_range = (0, best + 1) if best is not None else (0, 0)
+        self._classifier = hasattr(model, "classes_") and hasattr(model, "predict_proba")
+        if self._classifier:
+            self.classes_ = model.classes_
+            self.predict_proba = self._predict_proba
+
+    def _raw(self, X):
+        return np.asarray(self._booster.inplace_predict(_as_2d(X), iteration_range=self._iteration_range,
+                                                        validate_features=False))
+
+    def _predict_proba(self, X):
+        p = self._raw(X)
+        return np.column_stack([1.0 - p, p]) if p.ndim == 1 else p
+
+    def predict(self, X):
+        if self._classifier:
+            return self.classes_.take(np.argmax(self._predict_proba(X), axis=1), axis=0)
+        return self._raw(X)
+
+
+def _is_sklearn_tree_model(model):
+    estimators = getattr(model, "estimators_", None)
+    if estimators is not None:
+        return isinstance(estimators, list) and all(hasattr(e, "tree_") for e in estimators) \
+            and getattr(model, "n_outputs_", 1) == 1
+    return hasattr(model, "tree_") and getattr(model, "n_outputs_", 1) == 1
+
+
+def compile_model(model):
+    """Fast equivalent of a trained model (see module doc); unsupported models come back unchanged."""
+    if isinstance(model, dict):
+        return {k: compile_model(v) for k, v in model.items()}
+    try:
+        if hasattr(model, "get_booster"):
+            return InplaceXGBModel(model)
+        if _is_sklearn_tree_model(model):
+            if hasattr(model, "classes_"):
+                return CompiledForestClassifier(model)
+            return CompiledForestRegressor(model)
+    except Exception:
+        pass   # e.g. an unfitted model: keep the original behaviour
+    return model
+
+
+def load_compiled(path):
+    """joblib.load + compile_model: loader for the model registry."""
+    import joblib
+    return compile_model(joblib.load(path))
+
+
+def original_model(model):
+    """The trained model behind a compiled one (e.g. for retraining or export)."""
+    if isinstance(model, dict):
+        return {k: original_model(v) for k, v in model.items()}
+    return getattr(model, "original", model)
@@ -0,0 +1,177 @@
+# ai_engines/whisper_service.py
+"""
+Process-wide Whisper speech-to-text model for interview audio answers.
+
+Loading a Whisper checkpoint reads hundreds of MB of weights, which used to
+happen on every transcription. WhisperService loads the model once per
+worker (lazily, or at start-up with WHISPER_PRELOAD=1) and keeps it:
+
+- WHISPER_MODEL_SIZE / WHISPER_DEVICE pick the checkpoint and device ("" lets
+  whisper choose: cuda when available, else cpu);
+- WHISPER_COMPUTE is "fp32", "fp16" (cuda only) or "int8": the Linear layers
+  are dynamically quantized to int8 on CPU, roughly halving memory and
+  speeding up decoding at a small accuracy cost;
+- WHISPER_THREADS sets torch's intra-op thread count (process-wide);
+- WHISPER_IDLE_UNLOAD_SECONDS > 0 frees the model after that much idle time,
+  for memory-constrained workers; the next transcription loads it again.
+
+Transcriptions are serialized per worker: whisper's decoder installs kv-cache
+hooks on the shared model for the length of a call, so two calls on one
+model instance must not overlap.
+
+Usage:
+    from ai_engines.whisper_service import get_whisper_service
+    text = get_whisper_service().transcribe("uploads/answer.m4a")
+    get_whisper_service().warmup()     # load + one silent pass, e.g. at worker start
+    get_whisper_service().stats()      # {"model": "small", "loaded": True, ...}
+"""
+
+import gc
+import threading
+import time
+
+from config.config import Config
+
+_SERVICE = None
+_SERVICE_LOCK = threading.Lock()
+
+COMPUTE_MODES = ("fp32", "fp16", "int8")
+SAMPLE_RATE = 16000
+
+
+class WhisperService:
+    def __init__(self, model_size: str = None, device: str = None, compute: str = None, threads: int = None,
+                 idle_unload_seconds: float = None):
+        self.model_size = model_size or Config.WHISPER_MODEL_SIZE
+        self.device = (Config.WHISPER_DEVICE if device is None else device) or None
+        self.compute = (compute or Config.WHISPER_COMPUTE).lower()
+        if self.compute not in COMPUTE_MODES:
+            raise ValueError(f"Unknown WHISPER_COMPUTE: {self.compute}")
+        self.threads = Config.WHISPER_THREADS if threads is None else threads
+        self.idle_unload_seconds = Config.WHISPER_IDLE_UNLOAD_SECONDS if idle_unload_seconds is None \
+            else idle_unload_seconds
+        self._model = None
+        self._lock = threading.RLock()      # load / transcribe / unload
+        self._last_used = 0.0
+        self._reaper = None
+        self.loads = 0
+        self.load_seconds = None
+        self.transcriptions = 0
+
+    # ---- model lifecycle ----
+    def _get_model(self):
+        with self._lock:
+            if self._model is None:
+                t0 = time.perf_counter()
+                self._model = self._load()
+                self.load_seconds = round(time.perf_counter() - t0, 3)
+                self.loads += 1
+                self._start_reaper()
+            self._last_used = time.monotonic()
+            return self._model
+
+    def _load(self):
+        try:
+            import whisper
+        except Exception as e:
+            raise ImportError("whisper package is not installed. Install 'whisper' to enable audio transcription.") from e
+        import torch
+        if self.threads:
+            torch.set_num_threads(self.threads)
+        device = self.device
+        if self.compute == "int8":
+            device = "cpu"   # dynamic int8 kernels are CPU-only
+        model = whisper.load_model(self.model_size, device=device)
+        if self.compute == "int8":
+            model = _quantize_int8(model)
+        return model
+
+    def unload(self) -> bool:
+        """Drop the model (waits for a running transcription); True when one was loaded."""
+        with self._lock:
+            if self._model is None:
+                return False
+            cuda = str(getattr(self._model, "device", "cpu")).startswith("cuda")
+            self._model = None
+        gc.collect()
+        if cuda:
+            import torch
+            torch.cuda.empty_cache()
+        return True
+
+    def _start_reaper(self):
+        # called with the lock held; one reaper per loaded model
+        if self.idle_unload_seconds > 0 and self._reaper is None:
+            self._reaper = threading.Thread(target=self._reap_idle, name="whisper-idle-unload", daemon=True)
+            self._reaper.start()
+
+    def _reap_idle(self):
+        while True:
+            time.sleep(max(1.0, min(self.idle_unload_seconds / 4.0, 60.0)))
+            with self._lock:
+                if self._model is not None and time.monotonic() - self._last_used < self.idle_unload_seconds:
+                    continue
+                self.unload()
+                self._reaper = None
+                return
+
+    # ---- inference ----
+    def transcribe(self, audio, **options) -> str:
+        """Text of an audio file path (decoded with ffmpeg) or a 16 kHz float32 array."""
+        with self._lock:
+            model = self._get_model()
+            options.setdefault("fp16", self.compute == "fp16" and str(model.device).startswith("cuda"))
+            result = model.transcribe(audio, **options)
+            self.transcriptions += 1
+            self._last_used = time.monotonic()
+        return (result.get("text") or "").strip()
+
+    def warmup(self):
+        """Load the model and run one pass over a second of silence (first-call kernel / mel setup)."""
+        import numpy as np
+        self.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32), language="en", temperature=0.0)
+        return self.stats()
+
+    def stats(self) -> dict:
+        return {
+            "model": self.model_size,
+            "device": str(self._model.device) if self._model is not None else self.device,
+            "compute": self.compute,
+            "threads": self.threads or None,
+            "loaded": self._model is not None,
+            "loads": self.loads,
+            "load_seconds": self.load_seconds,
+            "transcriptions": self.transcriptions,
+            "idle_seconds": round(time.monotonic() - self._last_used, 1) if self._last_used else None,
+            "idle_unload_seconds": self.idle_unload_seconds or None,
+        }
+
+
+def _quantize_int8(model):
+    """Dynamic int8 quantization of every Linear layer (weights int8, activations quantized per call)."""
+    import torch
+    # whisper's Linear subclass only adds a dtype cast for fp16; quantize_dynamic wants plain nn.Linear
+    for module in model.modules():
+        if isinstance(module, torch.nn.Linear) and type(module) is not torch.nn.Linear:
+            module.__class__ = torch.nn.Linear
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def get_whisper_service() -> WhisperService:
+    """Return the process-wide WhisperService (created on first use, thread-safe)."""
+    global _SERVICE
+    if _SERVICE is None:
+        with _SERVICE_LOCK:
+            if _SERVICE is None:
+                _SERVICE = WhisperService()
+    return _SERVICE
+
+
+def warmup_in_background():
+    """Start the model load + warm-up pass on a daemon thread (app start-up with WHISPER_PRELOAD)."""
+    def run():
+        try:
+            get_whisper_service().warmup()
+        except Exception:
+            pass   # transcription stays lazy; the first request reports the error
+    threading.Thread(target=run, name="whisper-warmup", daemon=True).start()
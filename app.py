@@ -36,6 +36,11 @@ def create_app():
     app.register_blueprint(chatbot_bp, url_prefix="/chatbot")
     app.register_blueprint(admin_bp, url_prefix="/admin")
 
+    # Load the Whisper model off the request path (WHISPER_PRELOAD=1)
+    if app.config.get("WHISPER_PRELOAD"):
+        from ai_engines.whisper_service import warmup_in_background
+        warmup_in_background()
+
     # ✅ Root Landing Page (UI)
     @app.route("/")
     def index():
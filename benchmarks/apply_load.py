@@ -0,0 +1,127 @@
+"""
+Apply-path load test: applies/second of the previous apply sequence vs apply_to_job.
+
+Both modes do the database work of POST /ats/jobs/<id>/apply for a burst of
+applications (scores are fixed, so resume scoring is left out) from --threads
+concurrent workers, with emails drawn from a pool of --applicants addresses so
+that repeat applicants race each other like in a campus drive:
+
+- legacy: SELECT the applicant by email, INSERT + commit it when missing, then
+  INSERT the application + commit (what apply_job did before the upsert);
+  with the unique index on applicants.email a lost race is an IntegrityError;
+- upsert: ai_engines.ats_pipeline.apply_to_job + one commit.
+
+Writes to the configured DATABASE_URL (use a local / throwaway Postgres at the
+latest migration); the benchmark job, its applications and the generated
+applicants are deleted afterwards.
+
+Usage (from the repo root):
+    python -m benchmarks.apply_load
+    python -m benchmarks.apply_load --applies 5000 --threads 16 --applicants 1500 --mode upsert
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from app import create_app
+from database.db import db
+from models.ats_model import Applicant, Application, Job
+from ai_engines.ats_pipeline import apply_to_job
+
+EMAIL_DOMAIN = "apply-load.invalid"
+
+
+def _legacy_apply(job_id, name, email):
+    applicant = Applicant.query.filter_by(email=email).first()
+    if not applicant:
+        applicant = Applicant(name=name, email=email)
+        db.session.add(applicant)
+        db.session.commit()
+    db.session.add(Application(job_id=job_id, applicant_id=applicant.id, resume_score=0.5, final_score=50.0,
+                               meta={"experience_years": 2.0}))
+    db.session.commit()
+
+
+def _upsert_apply(job_id, name, email):
+    apply_to_job(job_id, name, email, resume_score=0.5, final_score=50.0, meta={"experience_years": 2.0})
+    db.session.commit()
+
+
+MODES = {"legacy": _legacy_apply, "upsert": _upsert_apply}
+
+
+def _run(app, fn, job_id, emails, threads):
+    errors = []
+
+    def worker(chunk):
+        with app.app_context():
+            for email in chunk:
+                try:
+                    fn(job_id, email.split("@")[0], email)
+                except IntegrityError:
+                    db.session.rollback()
+                    errors.append(email)
+
+    chunks = [emails[i::threads] for i in range(threads)]
+    workers = [threading.Thread(target=worker, args=(c,)) for c in chunks]
+    t0 = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return time.perf_counter() - t0, len(errors)
+
+
+def _cleanup(job_id, tag):
+    db.session.execute(text("DELETE FROM applications WHERE job_id = :job_id"), {"job_id": job_id})
+    db.session.execute(text("DELETE FROM jobs WHERE id = :job_id"), {"job_id": job_id})
+    db.session.execute(text("DELETE FROM applicants WHERE email LIKE :pattern"), {"pattern": f"%.{tag}@{EMAIL_DOMAIN}"})
+    db.session.commit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--applies", type=int, default=2000, help="applications per mode")
+    parser.add_argument("--threads", type=int, default=8, help="concurrent workers (keep <= the pool size)")
+    parser.add_argument("--applicants", type=int, default=None,
+                        help="distinct emails (default: half of --applies, so repeats race)")
+    parser.add_argument("--mode", choices=["both"] + sorted(MODES), default="both")
+    args = parser.parse_args(argv)
+
+    app = create_app()
+    modes = sorted(MODES) if args.mode == "both" else [args.mode]
+    n_emails = args.applicants or max(1, args.applies // 2)
+    rng = random.Random(0)
+    print(f"{'mode':<8} {'applies':>8} {'seconds':>8} {'applies/s':>10} {'errors':>7} {'applicants':>11}")
+    for mode in modes:
+        tag = uuid.uuid4().hex[:8]
+        pool = [f"candidate{i}.{tag}@{EMAIL_DOMAIN}" for i in range(n_emails)]
+        emails = [rng.choice(pool) for _ in range(args.applies)]
+        with app.app_context():
+            job = Job(title=f"apply-load benchmark {tag}")
+            db.session.add(job)
+            db.session.commit()
+            job_id = job.id
+        try:
+            seconds, errors = _run(app, MODES[mode], job_id, emails, args.threads)
+            with app.app_context():
+                applicants = db.session.execute(text(
+                    "SELECT count(*) FROM applicants WHERE email LIKE :pattern"
+                ), {"pattern": f"%.{tag}@{EMAIL_DOMAIN}"}).scalar()
+            print(f"{mode:<8} {args.applies:>8} {seconds:>8.2f} {(args.applies - errors) / seconds:>10.1f} "
+                  f"{errors:>7} {applicants:>11}")
+        finally:
+            with app.app_context():
+                _cleanup(job_id, tag)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Parity check + latency benchmark: torch SentenceTransformer vs int8 ONNX Runtime encoder.
+
+Exits non-zero if any sentence's ONNX vector has cosine < PARITY_MIN_COSINE with the
+torch vector (the same assertion export_quantized_model makes before swapping in
+a new export; `python -m ai_engines.onnx_encoder check` runs it alone).
+
+Usage (from the repo root):
+    python -m benchmarks.embedding_backends
+    python -m benchmarks.embedding_backends --export --runs 50
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import numpy as np
+
+from config.config import Config
+from ai_engines.onnx_encoder import (OnnxSentenceEncoder, export_quantized_model, parity_cosines,
+                                     PARITY_MIN_COSINE, PARITY_SENTENCES)
+
+SAMPLES = PARITY_SENTENCES
+
+
+def _time(fn, runs):
+    fn()  # warm-up
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(samples), float(np.percentile(samples, 95))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=Config.EMBEDDING_MODEL_NAME)
+    parser.add_argument("--onnx-dir", default=Config.EMBEDDING_ONNX_DIR)
+    parser.add_argument("--export", action="store_true", help="(re)export the int8 ONNX model first")
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--threads", type=int, default=Config.EMBEDDING_ONNX_THREADS)
+    args = parser.parse_args(argv)
+
+    if args.export or not os.path.exists(args.onnx_dir):
+        export_quantized_model(args.model, args.onnx_dir)
+
+    from sentence_transformers import SentenceTransformer
+    torch_model = SentenceTransformer(args.model)
+    onnx_model = OnnxSentenceEncoder(args.onnx_dir, num_threads=args.threads)
+
+    # ---- parity ----
+    cos = parity_cosines(onnx_model, torch_model, SAMPLES)
+    print(f"parity: min cosine {cos.min():.5f}, mean {cos.mean():.5f} (required >= {PARITY_MIN_COSINE})")
+    ok = bool(cos.min() >= PARITY_MIN_COSINE)
+
+    # ---- latency ----
+    single = SAMPLES[0]
+    batch = SAMPLES * 3
+    print(f"{'backend':<8} {'1 text p50/p95 ms':>20} {f'{len(batch)} texts p50/p95 ms':>22}")
+    for name, model in (("torch", torch_model), ("onnx", onnx_model)):
+        s50, s95 = _time(lambda: model.encode(single, convert_to_numpy=True), args.runs)
+        b50, b95 = _time(lambda: model.encode(batch, convert_to_numpy=True), max(3, args.runs // 5))
+        print(f"{name:<8} {s50:>10.2f}/{s95:<9.2f} {b50:>11.2f}/{b95:<10.2f}")
+
+    if not ok:
+        print("FAIL: ONNX vectors outside tolerance", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
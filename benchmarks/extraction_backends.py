@@ -0,0 +1,104 @@
+"""
+Text-extraction benchmark: pages/second per backend of the utils/doc_utils registry.
+
+Runs every PDF backend (or the ones given) over a corpus directory and prints
+pages, seconds, pages/s, failures and average characters per page, so the
+EXTRACTION_BACKEND_ORDER can be chosen on measured speed. Without a corpus, a
+synthetic one of multi-page resumes is generated with PyMuPDF.
+
+Usage (from the repo root):
+    python -m benchmarks.extraction_backends uploads/
+    python -m benchmarks.extraction_backends corpus/ --backends pymupdf pdfminer --max-pages 10
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from utils.doc_utils import backend_chain, run_backend, _BACKENDS
+
+LINES = [
+    "Senior Software Engineer - Python, Django, PostgreSQL, AWS",
+    "Led migration of a monolith to services; cut p95 latency by 40%.",
+    "Mentored four engineers; ran weekly design reviews.",
+    "Education: B.Tech Computer Science, 2016",
+    "Skills: Docker, Kubernetes, Terraform, React, SQL, Linux",
+]
+
+
+def make_corpus(directory, files=40, pages=3):
+    import fitz  # pymupdf
+    for n in range(files):
+        doc = fitz.open()
+        for p in range(pages):
+            page = doc.new_page()
+            y = 72
+            for i in range(40):
+                page.insert_text((72, y), f"{LINES[(n + p + i) % len(LINES)]} [{n}.{p}.{i}]", fontsize=9)
+                y += 17
+        doc.save(os.path.join(directory, f"resume_{n:03d}.pdf"))
+        doc.close()
+    return directory
+
+
+def page_count(path):
+    try:
+        import fitz  # pymupdf
+        with fitz.open(path) as doc:
+            return doc.page_count
+    except Exception:
+        return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", nargs="?", help="directory of .pdf files (default: generate one)")
+    parser.add_argument("--backends", nargs="+", default=None, help="default: all registered PDF backends")
+    parser.add_argument("--max-pages", type=int, default=0, help="page cap per file (0 = all)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per file and backend, seconds")
+    parser.add_argument("--limit", type=int, default=200, help="at most this many files")
+    args = parser.parse_args(argv)
+
+    tmp = None
+    corpus = args.corpus
+    if not corpus:
+        tmp = tempfile.TemporaryDirectory(prefix="extract-bench-")
+        corpus = make_corpus(tmp.name)
+    files = sorted(os.path.join(root, f) for root, _, names in os.walk(corpus)
+                   for f in names if f.lower().endswith(".pdf"))[:args.limit]
+    if not files:
+        print(f"no .pdf files under {corpus}", file=sys.stderr)
+        return 1
+    pages = {f: page_count(f) for f in files}
+    if args.max_pages:
+        pages = {f: min(n, args.max_pages) for f, n in pages.items()}
+    backends = args.backends or [n for n, (exts, _) in _BACKENDS.items() if "pdf" in exts and n != "raw_decode"]
+
+    print(f"{len(files)} files, {sum(pages.values())} pages; configured chain: {' -> '.join(backend_chain('pdf'))}")
+    print(f"{'backend':<10} {'pages':>6} {'seconds':>8} {'pages/s':>8} {'failed':>7} {'chars/page':>11}")
+    for name in backends:
+        done_pages = failed = chars = 0
+        t0 = time.perf_counter()
+        for f in files:
+            try:
+                text = run_backend(name, f, timeout=args.timeout, max_pages=args.max_pages)
+            except Exception:
+                text = ""
+            if text.strip():
+                done_pages += pages[f]
+                chars += len(text)
+            else:
+                failed += 1
+        elapsed = time.perf_counter() - t0
+        rate = done_pages / elapsed if elapsed else 0.0
+        print(f"{name:<10} {done_pages:>6} {elapsed:>8.2f} {rate:>8.1f} {failed:>7} {chars / max(done_pages, 1):>11.0f}")
+
+    if tmp is not None:
+        tmp.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
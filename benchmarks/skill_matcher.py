@@ -0,0 +1,110 @@
+"""
+Skill extraction benchmark: per-skill regex loop vs the cached Aho–Corasick matcher.
+
+Builds synthetic taxonomies (default 100 .. 40k entries, always including
+COMMON_SKILLS) and resume texts of growing length, checks that both methods
+find the same skills, and prints ms per call. The matcher's time should grow
+with the text length only; the regex loop grows with taxonomy x text.
+
+Usage (from the repo root):
+    python -m benchmarks.skill_matcher
+    python -m benchmarks.skill_matcher --sizes 1000 40000 --lengths 2000 32000 --runs 5
+"""
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+
+from ai_engines.skill_matcher import SkillMatcher, get_skill_matcher
+
+# COMMON_SKILLS minus "c++"/"c#", where the matcher intentionally differs from \b regexes
+COMMON_SKILLS = [
+    "python", "java", "javascript", "react", "node", "sql", "postgresql", "docker",
+    "aws", "azure", "git", "html", "css", "tensorflow", "pytorch", "nlp",
+    "machine learning", "data analysis", "excel", "tableau", "power bi", "linux",
+]
+FILLER = ("led delivery of a customer facing platform, worked with product and design, "
+          "improved reliability and reduced costs, mentored new joiners, wrote documentation").split()
+
+
+def make_taxonomy(size, rng):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    skills = set(COMMON_SKILLS)
+    while len(skills) < size:
+        words = ["".join(rng.choice(letters) for _ in range(rng.randint(3, 9)))
+                 for _ in range(rng.choice((1, 1, 1, 2, 3)))]
+        skills.add(" ".join(words))
+    return sorted(skills)
+
+
+def make_text(length, taxonomy, rng):
+    words = []
+    total = 0
+    while total < length:
+        w = rng.choice(taxonomy) if rng.random() < 0.05 else rng.choice(FILLER)
+        words.append(w.capitalize() if rng.random() < 0.1 else w)
+        total += len(w) + 1
+    return " ".join(words)[:length]
+
+
+def regex_loop(text, skills):
+    """The pre-matcher implementation of extract_skills' keyword step."""
+    text_lower = text.lower()
+    found = set()
+    for skill in skills:
+        if re.search(r"\b" + re.escape(skill.lower()) + r"\b", text_lower):
+            found.add(skill)
+    return found
+
+
+def _ms(fn, runs):
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 40000])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[2000, 8000, 32000])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--skip-regex-above", type=int, default=10000,
+                        help="don't time the regex loop for larger taxonomies (too slow)")
+    args = parser.parse_args(argv)
+    rng = random.Random(7)
+
+    ok = True
+    print(f"{'skills':>7} {'build s':>8} {'chars':>7} {'regex ms':>10} {'matcher ms':>11} {'us/char':>8}")
+    for size in args.sizes:
+        taxonomy = make_taxonomy(size, rng)
+        t0 = time.perf_counter()
+        SkillMatcher(taxonomy)
+        build = time.perf_counter() - t0
+        matcher = get_skill_matcher(taxonomy)
+        for length in args.lengths:
+            text = make_text(length, taxonomy, rng)
+            got = matcher.find(text)
+            m_ms = _ms(lambda: matcher.find(text), args.runs)
+            r_ms = float("nan")
+            if size <= args.skip_regex_above:
+                expected = regex_loop(text, taxonomy)
+                if got != expected:
+                    ok = False
+                    print(f"  MISMATCH: only regex {sorted(expected - got)[:5]}, only matcher {sorted(got - expected)[:5]}")
+                r_ms = _ms(lambda: regex_loop(text, taxonomy), max(1, args.runs // 3))
+            print(f"{size:>7} {build:>8.2f} {length:>7} {r_ms:>10.1f} {m_ms:>11.2f} {1000.0 * m_ms / length:>8.2f}")
+
+    if not ok:
+        print("FAIL: matcher and regex loop disagree", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Tree-ensemble inference benchmark: native predict vs ai_engines/tree_inference.
+
+Trains the predictors' model types on synthetic data of their feature shape
+(ATS RandomForestRegressor on 3 features, attrition RandomForestClassifier on
+4, and XGBRegressor / salary when xgboost is installed), checks that the
+compiled model returns exactly the same outputs, and prints the latency of
+single-row calls and of one batched call (batches above
+tree_inference.NATIVE_BATCH_ROWS are handed back to the native model).
+
+Usage (from the repo root):
+    python -m benchmarks.tree_inference
+    python -m benchmarks.tree_inference --trees 200 --batch 5000 --repeat 300
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from ai_engines.tree_inference import compile_model
+
+
+def _models(trees, rng):
+    from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+    X3 = np.c_[rng.random(2000), rng.random(2000) * 100, rng.random(2000) * 15]
+    y3 = X3[:, 0] * 50 + X3[:, 1] * 0.4 + np.minimum(10, X3[:, 2] * 2) + rng.normal(0, 3, 2000)
+    X4 = np.c_[rng.uniform(-1, 1, 2000), rng.uniform(30, 70, 2000), rng.uniform(0, 5, 2000), rng.uniform(0, 12, 2000)]
+    y4 = ((X4[:, 1] > 50) & (X4[:, 0] < 0) | (rng.random(2000) < 0.1)).astype(int)
+    out = [
+        ("ats RandomForestRegressor", RandomForestRegressor(n_estimators=trees, random_state=42).fit(X3, y3), X3, "predict"),
+        ("risk RandomForestClassifier", RandomForestClassifier(n_estimators=trees, random_state=42).fit(X4, y4), X4,
+         "predict_proba"),
+    ]
+    try:
+        from xgboost import XGBRegressor
+        Xs = np.c_[rng.uniform(120, 220, 2000), rng.integers(0, 5, 2000), rng.uniform(0, 40, 2000)]
+        ys = 3000 + Xs[:, 0] * 10 - Xs[:, 1] * 80 + Xs[:, 2] * 25
+        out.append(("salary XGBRegressor", XGBRegressor(n_estimators=150, max_depth=5, learning_rate=0.1).fit(Xs, ys),
+                    Xs, "predict"))
+    except ImportError:
+        print("xgboost not installed: skipping the inplace_predict case")
+    return out
+
+
+def _per_call_ms(fn, repeat):
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) * 1000.0 / repeat
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument("--batch", type=int, default=200, help="rows in the batched call")
+    parser.add_argument("--repeat", type=int, default=200, help="single-row calls timed per model")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    ok = True
+    print(f"{'model':<30} {'identical':>9} {'1-row native':>13} {'1-row fast':>11} "
+          f"{f'{args.batch}-row native':>16} {f'{args.batch}-row fast':>14}")
+    for name, model, X, method in _models(args.trees, rng):
+        fast = compile_model(model)
+        batch = X[rng.integers(0, len(X), args.batch)]
+        native_fn, fast_fn = getattr(model, method), getattr(fast, method)
+        same = np.array_equal(native_fn(batch), fast_fn(batch)) and \
+            all(np.array_equal(native_fn(batch[i:i + 1]), fast_fn(batch[i])) for i in range(50))
+        ok &= same
+        row = batch[:1]
+        print(f"{name:<30} {str(same):>9} "
+              f"{_per_call_ms(lambda: native_fn(row), args.repeat):>10.3f} ms "
+              f"{_per_call_ms(lambda: fast_fn(row), args.repeat):>8.3f} ms "
+              f"{_per_call_ms(lambda: native_fn(batch), 10):>13.2f} ms "
+              f"{_per_call_ms(lambda: fast_fn(batch), 10):>11.2f} ms")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
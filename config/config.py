@@ -15,3 +15,70 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "another-secret")
     JWT_EXP_DELTA_SECONDS = int(os.environ.get("JWT_EXP_DELTA_SECONDS", 7200))  # 2 hours
+
+    # Shared sentence-embedding encoder (see ai_engines/embedding_service.py)
+    EMBEDDING_MODEL_NAME = os.environ.get("EMBEDDING_MODEL_NAME", "all-MiniLM-L6-v2")
+    # Gather concurrent single-text encode() calls into one batched forward pass
+    EMBEDDING_MICROBATCH_ENABLED = os.environ.get("EMBEDDING_MICROBATCH_ENABLED", "1") == "1"
+    EMBEDDING_MICROBATCH_MAX_SIZE = int(os.environ.get("EMBEDDING_MICROBATCH_MAX_SIZE", 32))
+    EMBEDDING_MICROBATCH_MAX_WAIT_MS = float(os.environ.get("EMBEDDING_MICROBATCH_MAX_WAIT_MS", 5))
+    # Content-addressed embedding cache: in-memory LRU in front of an mmap'd on-disk store
+    EMBEDDING_CACHE_ENABLED = os.environ.get("EMBEDDING_CACHE_ENABLED", "1") == "1"
+    EMBEDDING_CACHE_DIR = os.environ.get("EMBEDDING_CACHE_DIR", os.path.join(basedir, "..", "embedding_cache"))
+    EMBEDDING_CACHE_MEMORY_ITEMS = int(os.environ.get("EMBEDDING_CACHE_MEMORY_ITEMS", 20000))
+    EMBEDDING_CACHE_DISK_ITEMS = int(os.environ.get("EMBEDDING_CACHE_DISK_ITEMS", 200000))
+    # Encoder backend: "torch" (SentenceTransformer) or "onnx" (int8 ONNX Runtime on CPU)
+    EMBEDDING_BACKEND = os.environ.get("EMBEDDING_BACKEND", "torch")
+    EMBEDDING_ONNX_DIR = os.environ.get("EMBEDDING_ONNX_DIR", "models_saved/onnx/all-MiniLM-L6-v2-int8")
+    EMBEDDING_ONNX_THREADS = int(os.environ.get("EMBEDDING_ONNX_THREADS", 0))  # 0 = onnxruntime default
+    # Interview audio transcription (ai_engines/whisper_service.py): one resident openai-whisper model per worker
+    WHISPER_MODEL_SIZE = os.environ.get("WHISPER_MODEL_SIZE", "small")       # tiny | base | small | medium | large
+    WHISPER_DEVICE = os.environ.get("WHISPER_DEVICE", "")                    # "" = cuda if available, else cpu
+    WHISPER_COMPUTE = os.environ.get("WHISPER_COMPUTE", "fp32")              # fp32 | fp16 (cuda) | int8 (cpu)
+    WHISPER_THREADS = int(os.environ.get("WHISPER_THREADS", 0))               # torch intra-op threads, 0 = default
+    WHISPER_PRELOAD = os.environ.get("WHISPER_PRELOAD", "0") == "1"          # load + warm up at app start
+    WHISPER_IDLE_UNLOAD_SECONDS = float(os.environ.get("WHISPER_IDLE_UNLOAD_SECONDS", 0))  # free when idle, 0 = never
+    # Resume nearest-neighbour index: "auto" (pgvector if installed, else numpy), "pgvector" or "numpy"
+    RESUME_INDEX_BACKEND = os.environ.get("RESUME_INDEX_BACKEND", "auto")
+    RESUME_INDEX_FLAT_THRESHOLD = int(os.environ.get("RESUME_INDEX_FLAT_THRESHOLD", 20000))  # exact search below this
+    RESUME_INDEX_NLIST = int(os.environ.get("RESUME_INDEX_NLIST", 0))        # IVF lists, 0 = sqrt(n)
+    RESUME_INDEX_NPROBE = int(os.environ.get("RESUME_INDEX_NPROBE", 8))      # IVF lists scanned per query
+    RESUME_INDEX_EF_SEARCH = int(os.environ.get("RESUME_INDEX_EF_SEARCH", 64))  # pgvector hnsw.ef_search
+    RESUME_INDEX_REBUILD_SECONDS = int(os.environ.get("RESUME_INDEX_REBUILD_SECONDS", 3600))
+    RESUME_INDEX_POLL_SECONDS = float(os.environ.get("RESUME_INDEX_POLL_SECONDS", 5))  # new rows from other workers
+    # Job -> all-resumes rescoring (ai_engines/job_matching.py): resume vectors scored per chunk
+    ATS_RESCORE_CHUNK_ROWS = int(os.environ.get("ATS_RESCORE_CHUNK_ROWS", 50000))
+    # Bulk resume ingestion (ai_engines/resume_ingest.py)
+    RESUME_INGEST_WORKERS = int(os.environ.get("RESUME_INGEST_WORKERS", 0))        # 0 = CPU count
+    RESUME_INGEST_BATCH_SIZE = int(os.environ.get("RESUME_INGEST_BATCH_SIZE", 256))  # embedded + committed together
+    RESUME_INGEST_DIR = os.environ.get("RESUME_INGEST_DIR", "uploads/ingest")          # progress files, uploaded zips
+    RESUME_INGEST_ROOT = os.environ.get("RESUME_INGEST_ROOT", "uploads/incoming")      # server paths the endpoint may read
+    # spaCy NER stage of skill extraction (ai_engines/resume_parser.extract_skills_batch)
+    SPACY_MODEL = os.environ.get("SPACY_MODEL", "en_core_web_sm")
+    SPACY_NER_BATCH_SIZE = int(os.environ.get("SPACY_NER_BATCH_SIZE", 64))
+    SPACY_NER_N_PROCESS = int(os.environ.get("SPACY_NER_N_PROCESS", 1))
+    SPACY_NER_CHUNK_CHARS = int(os.environ.get("SPACY_NER_CHUNK_CHARS", 10000))  # long resumes are split, not cut
+    # Uploads up to this size are hashed and parsed in memory; larger ones spool to a temp file
+    UPLOAD_SPOOL_MAX_MEMORY = int(os.environ.get("UPLOAD_SPOOL_MAX_MEMORY", 16 * 1024 * 1024))
+    # Text extraction registry (utils/doc_utils.py): backends tried in this order per file type
+    EXTRACTION_BACKEND_ORDER = os.environ.get("EXTRACTION_BACKEND_ORDER", "pymupdf,pdfminer,docx2txt,text")
+    EXTRACTION_TIMEOUT_SECONDS = float(os.environ.get("EXTRACTION_TIMEOUT_SECONDS", 30))  # per backend, 0 = none
+    EXTRACTION_MAX_PAGES = int(os.environ.get("EXTRACTION_MAX_PAGES", 50))                 # 0 = all pages
+    # Near-duplicate resumes (ai_engines/near_duplicates.py); changing the first three needs `flask resume build-minhash --all`
+    MINHASH_NUM_PERM = int(os.environ.get("MINHASH_NUM_PERM", 128))        # signature length (uint32 values)
+    MINHASH_SHINGLE_WORDS = int(os.environ.get("MINHASH_SHINGLE_WORDS", 5))
+    LSH_BANDS = int(os.environ.get("LSH_BANDS", 16))                      # bands of NUM_PERM / BANDS rows
+    DUPLICATE_JACCARD_THRESHOLD = float(os.environ.get("DUPLICATE_JACCARD_THRESHOLD", 0.8))
+    # Section-aware chunk embeddings (ai_engines/resume_chunks.py); MiniLM reads at most 256 word pieces a chunk
+    RESUME_CHUNK_WORDS = int(os.environ.get("RESUME_CHUNK_WORDS", 160))
+    RESUME_MAX_CHUNKS = int(os.environ.get("RESUME_MAX_CHUNKS", 24))               # per resume; the rest is dropped
+    RESUME_CHUNK_POOLING = os.environ.get("RESUME_CHUNK_POOLING", "weighted")      # max | mean | weighted
+    RESUME_SECTION_WEIGHTS = os.environ.get(
+        "RESUME_SECTION_WEIGHTS", "experience:1.0,skills:1.0,projects:0.8,summary:0.6,certifications:0.5,education:0.4")
+    # Resume search (ai_engines/resume_search.py): hits taken from each ranking before fusion, RRF constant
+    RESUME_SEARCH_CANDIDATES = int(os.environ.get("RESUME_SEARCH_CANDIDATES", 200))
+    RESUME_SEARCH_RRF_K = int(os.environ.get("RESUME_SEARCH_RRF_K", 60))
+    RESUME_SEARCH_MAX_MATCHES = int(os.environ.get("RESUME_SEARCH_MAX_MATCHES", 0))  # >0: rank only that many keyword matches (approximate)
+    # Saved predictor models (ai_engines/model_registry.py): how often workers look for a new version on disk
+    MODEL_REGISTRY_CHECK_SECONDS = float(os.environ.get("MODEL_REGISTRY_CHECK_SECONDS", 5))
+    MODEL_REGISTRY_KEEP_VERSIONS = int(os.environ.get("MODEL_REGISTRY_KEEP_VERSIONS", 5))
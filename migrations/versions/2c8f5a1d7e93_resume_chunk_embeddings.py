@@ -0,0 +1,31 @@
+"""resumes.chunk_embeddings / chunk_sections: section chunk vectors (float16)
+
+Revision ID: 2c8f5a1d7e93
+Revises: 9d3b6e8f2a17
+Create Date: 2026-10-17 18:12:09.554102
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '2c8f5a1d7e93'
+down_revision = '9d3b6e8f2a17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    cols = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("resumes")}
+    if "chunk_embeddings" not in cols:
+        op.add_column("resumes", sa.Column("chunk_embeddings", sa.LargeBinary(), nullable=True))
+    if "chunk_sections" not in cols:
+        op.add_column("resumes", sa.Column("chunk_sections", postgresql.JSON(astext_type=sa.Text()), nullable=True))
+    # vectors of existing resumes: `flask resume embed-chunks`
+
+
+def downgrade():
+    op.execute("ALTER TABLE resumes DROP COLUMN IF EXISTS chunk_sections")
+    op.execute("ALTER TABLE resumes DROP COLUMN IF EXISTS chunk_embeddings")
@@ -0,0 +1,97 @@
+"""store resume embeddings as float32 bytes instead of JSON text
+
+Revision ID: 3f1c0a9e7b21
+Revises:
+Create Date: 2026-10-17 09:12:44.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import json
+import numpy as np
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c0a9e7b21'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def _columns(table):
+    return {c["name"]: c["type"] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _convert_in_batches(select_sql, update_sql, convert):
+    """
+    Keyset-walk the rows returned by `select_sql` (id, value) and write convert(value)
+    back with one executemany per batch. Each batch commits on its own, so an
+    interrupted run simply continues where it stopped when re-run.
+    """
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        last_id = 0
+        while True:
+            rows = bind.execute(sa.text(select_sql), {"last_id": last_id, "n": BATCH_SIZE}).fetchall()
+            if not rows:
+                break
+            params = []
+            for rid, value in rows:
+                new_value = convert(value)
+                if new_value is not None:
+                    params.append({"id": rid, "value": new_value})
+            if params:
+                bind.execute(sa.text(update_sql), params)
+            last_id = rows[-1][0]
+
+
+def _json_to_blob(raw):
+    try:
+        vec = np.asarray(json.loads(raw), dtype="<f4")
+    except (TypeError, ValueError):
+        return None
+    return vec.tobytes() if vec.ndim == 1 and vec.size else None
+
+
+def _blob_to_json(blob):
+    return json.dumps(np.frombuffer(bytes(blob), dtype="<f4").tolist())
+
+
+def upgrade():
+    cols = _columns("resumes")
+    if "embedding_json" not in cols:
+        if isinstance(cols.get("embedding"), sa.LargeBinary):
+            return  # already binary (schema created from the current models)
+        op.alter_column("resumes", "embedding", new_column_name="embedding_json")
+        op.add_column("resumes", sa.Column("embedding", sa.LargeBinary(), nullable=True))
+    elif "embedding" not in cols:
+        op.add_column("resumes", sa.Column("embedding", sa.LargeBinary(), nullable=True))
+
+    _convert_in_batches(
+        "SELECT id, embedding_json FROM resumes "
+        "WHERE id > :last_id AND embedding IS NULL AND embedding_json IS NOT NULL "
+        "ORDER BY id LIMIT :n",
+        "UPDATE resumes SET embedding = :value WHERE id = :id",
+        _json_to_blob,
+    )
+    op.drop_column("resumes", "embedding_json")
+
+
+def downgrade():
+    cols = _columns("resumes")
+    if "embedding_bin" not in cols:
+        if not isinstance(cols.get("embedding"), sa.LargeBinary):
+            return
+        op.alter_column("resumes", "embedding", new_column_name="embedding_bin")
+        op.add_column("resumes", sa.Column("embedding", sa.Text(), nullable=True))
+
+    _convert_in_batches(
+        "SELECT id, embedding_bin FROM resumes "
+        "WHERE id > :last_id AND embedding IS NULL AND embedding_bin IS NOT NULL "
+        "ORDER BY id LIMIT :n",
+        "UPDATE resumes SET embedding = :value WHERE id = :id",
+        _blob_to_json,
+    )
+    op.drop_column("resumes", "embedding_bin")
@@ -0,0 +1,28 @@
+"""questions.reference_embedding: precomputed reference-answer vector
+
+Revision ID: 5b9e2f7c1a68
+Revises: c71e5b3a9d40
+Create Date: 2026-10-17 14:21:50.883146
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b9e2f7c1a68'
+down_revision = 'c71e5b3a9d40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    cols = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("questions")}
+    if "reference_embedding" not in cols:
+        op.add_column("questions", sa.Column("reference_embedding", sa.LargeBinary(), nullable=True))
+    # vectors need the encoder: run `flask interview embed-references` after upgrading
+    # (questions left empty are embedded on their first answer)
+
+
+def downgrade():
+    op.execute("ALTER TABLE questions DROP COLUMN IF EXISTS reference_embedding")
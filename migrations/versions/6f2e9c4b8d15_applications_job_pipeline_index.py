@@ -0,0 +1,30 @@
+"""applications (job_id, status, score key, id) index for keyset pipeline pages
+
+Revision ID: 6f2e9c4b8d15
+Revises: 2c8f5a1d7e93
+Create Date: 2026-10-17 19:26:37.102845
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f2e9c4b8d15'
+down_revision = '2c8f5a1d7e93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # must match models.ats_model.PIPELINE_ORDER for the planner to use it
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_applications_job_pipeline "
+            "ON applications (job_id, status, (-coalesce(final_score, -1)), id)"
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_applications_job_pipeline")
@@ -0,0 +1,71 @@
+"""pgvector column + HNSW index for resume nearest-neighbour search
+
+Revision ID: 8a4d2c61e0f3
+Revises: 3f1c0a9e7b21
+Create Date: 2026-10-17 11:40:02.117634
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import numpy as np
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4d2c61e0f3'
+down_revision = '3f1c0a9e7b21'
+branch_labels = None
+depends_on = None
+
+EMBEDDING_DIM = 384  # all-MiniLM-L6-v2
+BATCH_SIZE = 1000
+
+
+def _pgvector_available(bind):
+    if bind.dialect.name != "postgresql":
+        return False
+    if bind.execute(sa.text("SELECT 1 FROM pg_extension WHERE extname = 'vector'")).first():
+        return True
+    if not bind.execute(sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'vector'")).first():
+        return False
+    try:
+        with bind.begin_nested():
+            bind.execute(sa.text("CREATE EXTENSION IF NOT EXISTS vector"))
+        return True
+    except sa.exc.DBAPIError:
+        # extension present on the server but we lack the privilege to create it
+        return False
+
+
+def upgrade():
+    bind = op.get_bind()
+    if not _pgvector_available(bind):
+        return  # the in-process numpy index is used instead
+    cols = {c["name"] for c in sa.inspect(bind).get_columns("resumes")}
+    if "embedding_vec" not in cols:
+        op.execute(f"ALTER TABLE resumes ADD COLUMN embedding_vec vector({EMBEDDING_DIM})")
+
+    with op.get_context().autocommit_block():
+        last_id = 0
+        while True:
+            rows = bind.execute(sa.text(
+                "SELECT id, embedding FROM resumes "
+                "WHERE id > :last_id AND embedding IS NOT NULL AND embedding_vec IS NULL "
+                "ORDER BY id LIMIT :n"), {"last_id": last_id, "n": BATCH_SIZE}).fetchall()
+            if not rows:
+                break
+            params = []
+            for rid, blob in rows:
+                vec = np.frombuffer(bytes(blob), dtype="<f4")
+                if vec.size == EMBEDDING_DIM:
+                    params.append({"id": rid, "v": "[" + ",".join(f"{x:.7g}" for x in vec) + "]"})
+            if params:
+                bind.execute(sa.text("UPDATE resumes SET embedding_vec = CAST(:v AS vector) WHERE id = :id"), params)
+            last_id = rows[-1][0]
+        # build after the backfill: one bulk HNSW build is much cheaper than row-by-row inserts
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_resumes_embedding_vec_hnsw "
+                   "ON resumes USING hnsw (embedding_vec vector_cosine_ops)")
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_resumes_embedding_vec_hnsw")
+    op.execute("ALTER TABLE resumes DROP COLUMN IF EXISTS embedding_vec")
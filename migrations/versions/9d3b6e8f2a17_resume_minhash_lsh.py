@@ -0,0 +1,39 @@
+"""resumes.minhash + resume_lsh_buckets: near-duplicate detection
+
+Revision ID: 9d3b6e8f2a17
+Revises: e4a7d19b2c05
+Create Date: 2026-10-17 17:05:41.218334
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d3b6e8f2a17'
+down_revision = 'e4a7d19b2c05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    cols = {c["name"] for c in inspector.get_columns("resumes")}
+    if "minhash" not in cols:
+        op.add_column("resumes", sa.Column("minhash", sa.LargeBinary(), nullable=True))
+    if not inspector.has_table("resume_lsh_buckets"):
+        op.create_table(
+            "resume_lsh_buckets",
+            sa.Column("band", sa.SmallInteger(), nullable=False),
+            sa.Column("bucket", sa.BigInteger(), nullable=False),
+            sa.Column("resume_id", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["resume_id"], ["resumes.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("band", "bucket", "resume_id"),
+        )
+        op.create_index("ix_resume_lsh_buckets_resume_id", "resume_lsh_buckets", ["resume_id"])
+    # signatures of existing resumes: `flask resume build-minhash`
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS resume_lsh_buckets")
+    op.execute("ALTER TABLE resumes DROP COLUMN IF EXISTS minhash")
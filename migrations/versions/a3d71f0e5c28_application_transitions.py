@@ -0,0 +1,42 @@
+"""application_transitions: append-only log of application status changes
+
+Revision ID: a3d71f0e5c28
+Revises: 6f2e9c4b8d15
+Create Date: 2026-10-17 20:03:51.447120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3d71f0e5c28'
+down_revision = '6f2e9c4b8d15'
+branch_labels = None
+depends_on = None
+
+_STATUS = postgresql.ENUM(name="applicationstatus", create_type=False)
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table("application_transitions"):
+        return
+    op.create_table(
+        "application_transitions",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("application_id", sa.Integer(), nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("from_status", _STATUS, nullable=True),
+        sa.Column("to_status", _STATUS, nullable=False),
+        sa.Column("note", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["application_id"], ["applications.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_application_transitions_application", "application_transitions",
+                    ["application_id", "created_at"])
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS application_transitions")
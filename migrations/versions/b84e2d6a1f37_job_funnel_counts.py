@@ -0,0 +1,39 @@
+"""job_funnel_counts: per-job application counts by status, backfilled from applications
+
+Revision ID: b84e2d6a1f37
+Revises: a3d71f0e5c28
+Create Date: 2026-10-17 20:41:12.583904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b84e2d6a1f37'
+down_revision = 'a3d71f0e5c28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not sa.inspect(op.get_bind()).has_table("job_funnel_counts"):
+        op.create_table(
+            "job_funnel_counts",
+            sa.Column("job_id", sa.Integer(), nullable=False),
+            sa.Column("status", postgresql.ENUM(name="applicationstatus", create_type=False), nullable=False),
+            sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+            sa.ForeignKeyConstraint(["job_id"], ["jobs.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("job_id", "status"),
+        )
+    # same rebuild as `flask ats reconcile-funnel`
+    op.execute("DELETE FROM job_funnel_counts")
+    op.execute(
+        "INSERT INTO job_funnel_counts (job_id, status, count) "
+        "SELECT job_id, status, count(*) FROM applications WHERE status IS NOT NULL GROUP BY job_id, status"
+    )
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS job_funnel_counts")
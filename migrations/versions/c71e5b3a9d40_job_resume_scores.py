@@ -0,0 +1,34 @@
+"""job_resume_scores: per-(job, resume) semantic match scores
+
+Revision ID: c71e5b3a9d40
+Revises: 8a4d2c61e0f3
+Create Date: 2026-10-17 13:05:27.402915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c71e5b3a9d40'
+down_revision = '8a4d2c61e0f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table("job_resume_scores"):
+        return  # created by db.create_all()
+    op.create_table(
+        "job_resume_scores",
+        sa.Column("job_id", sa.Integer(), sa.ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("resume_id", sa.Integer(), sa.ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("scored_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_job_resume_scores_job_score", "job_resume_scores", ["job_id", "score"])
+    # scores for existing jobs: `flask ats rescore-jobs`
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS job_resume_scores")
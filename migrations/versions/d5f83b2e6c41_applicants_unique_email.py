@@ -0,0 +1,45 @@
+"""applicants.email unique (merge duplicate applicants first) for the apply upsert
+
+Revision ID: d5f83b2e6c41
+Revises: b84e2d6a1f37
+Create Date: 2026-10-17 21:14:05.920318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5f83b2e6c41'
+down_revision = 'b84e2d6a1f37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # writes to applicants wait until the unique index exists, so no duplicate slips in after the merge
+    op.execute("LOCK TABLE applicants IN SHARE ROW EXCLUSIVE MODE")
+    # the oldest applicant per email survives; it takes over the others' applications
+    # and any phone / resume link it lacks
+    op.execute(
+        "CREATE TEMP TABLE applicant_merge ON COMMIT DROP AS "
+        "SELECT id AS dup_id, min(id) OVER (PARTITION BY email) AS keep_id FROM applicants"
+    )
+    op.execute("DELETE FROM applicant_merge WHERE dup_id = keep_id")
+    op.execute(
+        "UPDATE applicants a SET phone = coalesce(a.phone, d.phone), resume_id = coalesce(a.resume_id, d.resume_id) "
+        "FROM (SELECT m.keep_id, max(x.phone) AS phone, max(x.resume_id) AS resume_id "
+        "      FROM applicant_merge m JOIN applicants x ON x.id = m.dup_id GROUP BY m.keep_id) d "
+        "WHERE a.id = d.keep_id"
+    )
+    op.execute(
+        "UPDATE applications p SET applicant_id = m.keep_id FROM applicant_merge m WHERE p.applicant_id = m.dup_id"
+    )
+    op.execute("DELETE FROM applicants USING applicant_merge m WHERE applicants.id = m.dup_id")
+    op.execute("DROP INDEX IF EXISTS ix_applicants_email")
+    op.execute("CREATE UNIQUE INDEX ix_applicants_email ON applicants (email)")
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_applicants_email")
+    op.execute("CREATE INDEX ix_applicants_email ON applicants (email)")
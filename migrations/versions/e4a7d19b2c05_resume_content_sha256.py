@@ -0,0 +1,30 @@
+"""resumes.content_sha256: content hash of the uploaded file for dedupe
+
+Revision ID: e4a7d19b2c05
+Revises: 5b9e2f7c1a68
+Create Date: 2026-10-17 15:48:12.640371
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a7d19b2c05'
+down_revision = '5b9e2f7c1a68'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    cols = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("resumes")}
+    if "content_sha256" not in cols:
+        op.add_column("resumes", sa.Column("content_sha256", sa.String(length=64), nullable=True))
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_resumes_content_sha256 ON resumes (content_sha256)")
+    # hashes of files uploaded before this revision: `flask resume backfill-hashes`
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_resumes_content_sha256")
+    op.execute("ALTER TABLE resumes DROP COLUMN IF EXISTS content_sha256")
@@ -0,0 +1,34 @@
+"""resumes.search_tsv: generated tsvector of parsed_text with a GIN index (keyword search)
+
+Revision ID: f19c4e7a2d53
+Revises: d5f83b2e6c41
+Create Date: 2026-10-17 21:52:40.116527
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f19c4e7a2d53'
+down_revision = 'd5f83b2e6c41'
+branch_labels = None
+depends_on = None
+
+# must match models.resume_model.SEARCH_TSV_SQL
+TSV_SQL = "to_tsvector('english', coalesce(parsed_text, ''))"
+
+
+def upgrade():
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("resumes")}
+    if "search_tsv" not in columns:
+        # a stored generated column rewrites the table once, filling every existing row
+        op.execute(f"ALTER TABLE resumes ADD COLUMN search_tsv tsvector GENERATED ALWAYS AS ({TSV_SQL}) STORED")
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_resumes_search_tsv ON resumes USING gin (search_tsv)")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_resumes_search_tsv")
+    op.execute("ALTER TABLE resumes DROP COLUMN IF EXISTS search_tsv")
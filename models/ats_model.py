@@ -2,6 +2,7 @@
 from database.db import db
 from datetime import datetime
 import enum
+from sqlalchemy import func, literal_column
 from sqlalchemy.dialects.postgresql import JSON
 
 class ApplicationStatus(enum.Enum):
@@ -27,7 +28,7 @@ class Applicant(db.Model):
     __tablename__ = "applicants"
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False)
-    email = db.Column(db.String(255), nullable=False, index=True)
+    email = db.Column(db.String(255), nullable=False, unique=True, index=True)   # apply upserts on it
     phone = db.Column(db.String(50), nullable=True)
     resume_id = db.Column(db.Integer, nullable=True)   # optional link to Resume.id
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -60,3 +61,56 @@ class Application(db.Model):
             "final_score": self.final_score,
             "meta": self.meta
         }
+
+class ApplicationTransition(db.Model):
+    """Append-only log of status changes (one row per application moved, with the recruiter's note;
+    from_status == to_status for a note added without a move)."""
+    __tablename__ = "application_transitions"
+    id = db.Column(db.BigInteger, primary_key=True)
+    application_id = db.Column(db.Integer, db.ForeignKey("applications.id", ondelete="CASCADE"), nullable=False)
+    job_id = db.Column(db.Integer, nullable=False)
+    from_status = db.Column(db.Enum(ApplicationStatus), nullable=True)
+    to_status = db.Column(db.Enum(ApplicationStatus), nullable=False)
+    note = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index("ix_application_transitions_application", "application_id", "created_at"),
+    )
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "application_id": self.application_id,
+            "from_status": self.from_status.value if self.from_status else None,
+            "to_status": self.to_status.value,
+            "note": self.note,
+            "created_at": self.created_at.isoformat(),
+        }
+
+class JobFunnelCount(db.Model):
+    """Applications per (job, status), kept in step with every status change (ai_engines/job_funnel.py)."""
+    __tablename__ = "job_funnel_counts"
+    job_id = db.Column(db.Integer, db.ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    status = db.Column(db.Enum(ApplicationStatus), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+# Pipeline order of a job's applications: status (enum declaration order), best final_score
+# first with unscored last, then id. The expression makes it one ascending key, so keyset
+# pages and auto-promote are range scans of ix_applications_job_pipeline.
+PIPELINE_SCORE_KEY = -func.coalesce(Application.final_score, literal_column("-1"))
+PIPELINE_ORDER = (Application.status, PIPELINE_SCORE_KEY, Application.id)
+
+db.Index("ix_applications_job_pipeline", Application.job_id, *PIPELINE_ORDER)
+
+class JobResumeScore(db.Model):
+    """Semantic match of every stored resume against a job (filled by ai_engines/job_matching.py)."""
+    __tablename__ = "job_resume_scores"
+    job_id = db.Column(db.Integer, db.ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    resume_id = db.Column(db.Integer, db.ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True)
+    score = db.Column(db.Float, nullable=False)         # cosine resume vs job (0..1)
+    scored_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index("ix_job_resume_scores_job_score", "job_id", "score"),
+    )
@@ -2,6 +2,7 @@ from database.db import db
 from datetime import datetime
 import json
 from sqlalchemy.dialects.postgresql import JSON
+from models.resume_model import encode_embedding, decode_embedding
 
 class Question(db.Model):
     __tablename__ = "questions"
@@ -9,8 +10,15 @@ class Question(db.Model):
     title = db.Column(db.String(255), nullable=False)         # e.g., "Python OOP"
     prompt = db.Column(db.Text, nullable=False)               # the question text
     reference_answer = db.Column(db.Text, nullable=True)      # model/reference ideal answer
+    reference_embedding = db.Column(db.LargeBinary, nullable=True)  # float32 bytes of reference_answer
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    def set_reference_embedding(self, arr):
+        self.reference_embedding = encode_embedding(arr) if arr is not None else None
+
+    def get_reference_embedding(self):
+        return decode_embedding(self.reference_embedding)
+
 class Interview(db.Model):
     __tablename__ = "interviews"
     id = db.Column(db.Integer, primary_key=True)
@@ -1,25 +1,78 @@
 from database.db import db
 from datetime import datetime
-import json
-from sqlalchemy.dialects.postgresql import JSON
+import numpy as np
+from sqlalchemy.dialects.postgresql import JSON, TSVECTOR
+from sqlalchemy.orm import deferred
+
+# embeddings are stored as raw little-endian float32 bytes (384 dims -> 1536 bytes)
+EMBEDDING_DTYPE = np.dtype("<f4")
+
+def encode_embedding(arr) -> bytes:
+    return np.asarray(arr, dtype=EMBEDDING_DTYPE).tobytes()
+
+def decode_embedding(blob):
+    """Zero-copy, read-only float32 view over a stored embedding blob."""
+    if not blob:
+        return None
+    return np.frombuffer(blob, dtype=EMBEDDING_DTYPE)
+
+# full-text document of parsed_text (Resume.search_tsv); the migration creates the column from the same expression
+SEARCH_TS_CONFIG = "english"
+SEARCH_TSV_SQL = f"to_tsvector('{SEARCH_TS_CONFIG}', coalesce(parsed_text, ''))"
+
+# per-chunk vectors are L2-normalized float16 rows (n_chunks x 384 -> 768 bytes a chunk)
+CHUNK_DTYPE = np.dtype("<f2")
+
+def encode_chunk_matrix(matrix) -> bytes:
+    return np.asarray(matrix, dtype=CHUNK_DTYPE).tobytes()
+
+def decode_chunk_matrix(blob, n_rows: int):
+    """Read-only float16 (n_rows, dim) view over a stored chunk matrix."""
+    if not blob or not n_rows:
+        return None
+    return np.frombuffer(blob, dtype=CHUNK_DTYPE).reshape(n_rows, -1)
 
 class Resume(db.Model):
     __tablename__ = "resumes"
     id = db.Column(db.Integer, primary_key=True)
     filename = db.Column(db.String(255), nullable=False)
     original_filename = db.Column(db.String(255), nullable=False)
+    content_sha256 = db.Column(db.String(64), nullable=True, index=True)  # sha256 of the uploaded bytes
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
     uploaded_by = db.Column(db.Integer, nullable=True)  # FK to users.id - add constraint as needed
     parsed_text = db.Column(db.Text, nullable=True)
     skills = db.Column(JSON, nullable=True)             # JSON list of detected skills
-    embedding = db.Column(db.Text, nullable=True)       # JSON string of embedding vector
+    embedding = db.Column(db.LargeBinary, nullable=True)  # float32 bytes, see encode_embedding()
     match_score = db.Column(db.Float, nullable=True)    # score vs last matched job
     meta = db.Column(JSON, nullable=True)               # other parsed metadata (education, experience)
+    minhash = db.Column(db.LargeBinary, nullable=True)  # uint32 MinHash signature of parsed_text (near-duplicates)
+    chunk_embeddings = db.Column(db.LargeBinary, nullable=True)  # float16 matrix, one row per text chunk
+    chunk_sections = db.Column(JSON, nullable=True)              # section label of each chunk row
+    # generated by Postgres from parsed_text, GIN-indexed for keyword search; never loaded with the row
+    search_tsv = deferred(db.Column(TSVECTOR, db.Computed(SEARCH_TSV_SQL, persisted=True)))
+
+    __mapper_args__ = {"eager_defaults": False}   # don't RETURNING the generated tsvector on every insert
 
     def set_embedding(self, arr):
-        self.embedding = json.dumps([float(x) for x in arr])
+        self.embedding = encode_embedding(arr)
 
     def get_embedding(self):
-        if not self.embedding:
-            return None
-        return json.loads(self.embedding)
+        return decode_embedding(self.embedding)
+
+    def set_chunk_embeddings(self, matrix, sections):
+        self.chunk_embeddings = encode_chunk_matrix(matrix) if len(sections) else None
+        self.chunk_sections = list(sections) if len(sections) else None
+
+    def get_chunk_embeddings(self):
+        """(float16 matrix, section labels) or (None, None) when the resume has no chunk vectors."""
+        matrix = decode_chunk_matrix(self.chunk_embeddings, len(self.chunk_sections or []))
+        return (matrix, self.chunk_sections) if matrix is not None else (None, None)
+
+db.Index("ix_resumes_search_tsv", Resume.search_tsv, postgresql_using="gin")
+
+class ResumeLSHBucket(db.Model):
+    """One LSH band of a resume's MinHash signature; resumes sharing a row are duplicate candidates."""
+    __tablename__ = "resume_lsh_buckets"
+    band = db.Column(db.SmallInteger, primary_key=True)
+    bucket = db.Column(db.BigInteger, primary_key=True)
+    resume_id = db.Column(db.Integer, db.ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True, index=True)
@@ -99,3 +99,52 @@ def permission_delete(pid):
     db.session.delete(p); db.session.commit()
     log_audit(action=AuditAction.PERMISSION_CHANGE, resource_type="RolePermission", details={"deleted_id": pid})
     return ("", 204)
+
+# Embedding service runtime metrics (micro-batch sizes, queue delay)
+@admin_bp.route("/admin/embeddings/stats")
+def embedding_service_stats():
+    from ai_engines.embedding_service import embedding_stats
+    return jsonify(embedding_stats())
+
+# Resident Whisper model: state, warm-up and unload of this worker's copy
+@admin_bp.route("/admin/whisper")
+def whisper_status():
+    from ai_engines.whisper_service import get_whisper_service
+    return jsonify(get_whisper_service().stats())
+
+@admin_bp.route("/admin/whisper/<action>", methods=["POST"])
+def whisper_action(action):
+    from ai_engines.whisper_service import get_whisper_service
+    service = get_whisper_service()
+    if action == "warmup":
+        try:
+            return jsonify({"ok": True, "status": service.warmup()})
+        except Exception as e:
+            return jsonify({"ok": False, "error": str(e)}), 500
+    if action == "unload":
+        return jsonify({"ok": True, "unloaded": service.unload(), "status": service.stats()})
+    return jsonify({"ok": False, "error": "action must be warmup or unload"}), 404
+
+# Resume upload dedupe: parses / encodes skipped thanks to content hashing
+@admin_bp.route("/admin/resumes/dedupe_stats")
+def resume_dedupe_stats():
+    from ai_engines.resume_ingest import dedupe_stats
+    return jsonify(dedupe_stats())
+
+# Saved predictor models: active version and load time in this worker
+@admin_bp.route("/admin/models")
+def model_registry_status():
+    from ai_engines import ats_predictor, payroll_ai, perf_predictor  # noqa: F401 - registers their models
+    from ai_engines.model_registry import registry
+    return jsonify(registry.status())
+
+# Look for new model versions now instead of at the next check interval
+@admin_bp.route("/admin/models/reload", methods=["POST"])
+def model_registry_reload():
+    from ai_engines import ats_predictor, payroll_ai, perf_predictor  # noqa: F401
+    from ai_engines.model_registry import registry
+    name = request.args.get("name") or None
+    try:
+        return jsonify(registry.reload(name))
+    except KeyError:
+        return jsonify({"error": f"unknown model: {name}"}), 404
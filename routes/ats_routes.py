@@ -1,12 +1,25 @@
 # routes/ats_routes.py
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app
 from database.db import db
-from models.ats_model import Job, Applicant, Application, ApplicationStatus
+from models.ats_model import (Job, Applicant, Application, ApplicationStatus, ApplicationTransition, JobResumeScore,
+                              PIPELINE_ORDER)
 from models.resume_model import Resume
 from ai_engines.ats_predictor import score_application
+from ai_engines.ats_pipeline import apply_to_job, transition_applications
+from ai_engines.job_funnel import funnel_counts, reconcile_funnel_counts
+from ai_engines.resume_parser import embed_text
+from ai_engines.resume_index import top_k_resumes, index_backend
+from ai_engines.job_matching import rescore_job, rescore_applications, get_resume_score
+from ai_engines.near_duplicates import find_near_duplicates
+from ai_engines.resume_chunks import resume_job_score
+from config.config import Config
+from utils.pagination import encode_cursor, decode_cursor
+from sqlalchemy import literal, tuple_
 from sqlalchemy.exc import IntegrityError
-from datetime import datetime
+from sqlalchemy.orm import joinedload, load_only
+import click
 import json
+import threading
 
 ats_bp = Blueprint("ats", __name__, template_folder="../templates", static_folder="../static")
 
@@ -23,20 +36,226 @@ def create_job():
         job = Job(title=title, department=dept, description=desc)
         db.session.add(job)
         db.session.commit()
+        _rescore_resumes(job)
         flash("Job posted.", "success")
         return redirect(url_for("ats.list_jobs"))
     return render_template("ats/job_create.html")
 
+# Recruiter: edit a job (form post); a changed description rescores all resumes
+@ats_bp.route("/jobs/<int:job_id>/edit", methods=["POST"])
+def edit_job(job_id):
+    job = Job.query.get_or_404(job_id)
+    title = request.form.get("title", job.title).strip()
+    if not title:
+        flash("Job title required", "warning")
+        return redirect(url_for("ats.job_detail", job_id=job.id))
+    old_desc = job.description or ""
+    job.title = title
+    job.department = request.form.get("department", job.department or "").strip()
+    job.description = request.form.get("description", old_desc).strip()
+    if "is_open" in request.form:
+        job.is_open = request.form.get("is_open") in ("1", "true", "on")
+    db.session.commit()
+    if job.description != old_desc:
+        _rescore_resumes(job)
+    flash("Job updated.", "success")
+    return redirect(url_for("ats.job_detail", job_id=job.id))
+
+# job ids being rescored by this worker; True when the job changed again meanwhile
+_RESCORING = {}
+_RESCORING_LOCK = threading.Lock()
+
+def _rescore_resumes(job):
+    """
+    Score every resume against the job on a background thread (rescore_job scans
+    all resume embeddings). An edit made while a pass runs queues one more pass.
+    """
+    job_id = job.id
+    with _RESCORING_LOCK:
+        if job_id in _RESCORING:
+            _RESCORING[job_id] = True
+            return
+        _RESCORING[job_id] = False
+    app = current_app._get_current_object()
+
+    def run():
+        while True:
+            # the job itself is already committed; a scoring failure must not lose it
+            try:
+                with app.app_context():
+                    job = db.session.get(Job, job_id)
+                    if job is not None:
+                        n = rescore_job(job)
+                        db.session.commit()
+                        app.logger.info("Scored %d resumes against job %s", n, job_id)
+            except Exception:
+                app.logger.exception("Resume rescoring failed for job %s", job_id)
+            with _RESCORING_LOCK:
+                if not _RESCORING[job_id]:
+                    del _RESCORING[job_id]
+                    return
+                _RESCORING[job_id] = False
+
+    threading.Thread(target=run, name=f"job-rescore-{job_id}", daemon=True).start()
+
+@ats_bp.cli.command("rescore-jobs")
+@click.option("--job-id", type=int, default=None, help="Only this job (default: every open job)")
+def rescore_jobs_command(job_id):
+    """Recompute job_resume_scores, e.g. after a bulk resume import."""
+    query = Job.query.filter(Job.id == job_id) if job_id else Job.query.filter(Job.is_open.is_(True))
+    for job in query.order_by(Job.id).all():
+        n = rescore_job(job)
+        db.session.commit()
+        click.echo(f"job {job.id}: {n} resumes scored")
+
+@ats_bp.cli.command("reconcile-funnel")
+@click.option("--job-id", type=int, default=None, help="Only this job (default: every job)")
+def reconcile_funnel_command(job_id):
+    """Rebuild job_funnel_counts from applications, e.g. after a raw-SQL import."""
+    fixed = reconcile_funnel_counts(job_id)
+    db.session.commit()
+    click.echo(f"funnel counters rebuilt, {fixed} were off")
+
 @ats_bp.route("/jobs")
 def list_jobs():
     jobs = Job.query.order_by(Job.created_at.desc()).all()
-    return render_template("ats/job_list.html", jobs=jobs)
+    return render_template("ats/job_list.html", jobs=jobs, funnels=funnel_counts(j.id for j in jobs))
+
+# Pipeline pages: keyset over (status, final_score desc, id), never OFFSET or a full load
+PIPELINE_PAGE_SIZE = 50
+
+def _pipeline_args():
+    """(status or None, cursor or None, limit) from the query string; ValueError when invalid."""
+    status = request.args.get("status") or None
+    if status is not None:
+        status = ApplicationStatus(status)
+    limit = max(1, min(request.args.get("limit", PIPELINE_PAGE_SIZE, type=int), 500))
+    return status, request.args.get("after") or None, limit
+
+def _pipeline_page(job_id, status=None, after=None, limit=PIPELINE_PAGE_SIZE):
+    """One page of a job's applications in pipeline order; returns (applications, next cursor or None)."""
+    q = Application.query.options(joinedload(Application.applicant)).filter(Application.job_id == job_id)
+    if status is not None:
+        q = q.filter(Application.status == status)
+    if after:
+        name, key, last_id = decode_cursor(after, 3)
+        try:
+            last_status, key, last_id = ApplicationStatus[name], float(key), int(last_id)
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("invalid cursor")
+        q = q.filter(tuple_(*PIPELINE_ORDER) > tuple_(literal(last_status, Application.status.type), key, last_id))
+    rows = q.order_by(*PIPELINE_ORDER).limit(limit + 1).all()
+    more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if more:
+        last = rows[-1]
+        score_key = -(last.final_score if last.final_score is not None else -1)
+        next_cursor = encode_cursor([last.status.name, score_key, last.id])
+    return rows, next_cursor
+
+def _status_counts(job_id):
+    """{status value: count} for a job, read from the maintained job_funnel_counts rows."""
+    return funnel_counts([job_id])[job_id]
 
 @ats_bp.route("/jobs/<int:job_id>")
 def job_detail(job_id):
     job = Job.query.get_or_404(job_id)
-    apps = job.applications.order_by(Application.applied_at.desc()).all()
-    return render_template("ats/job_detail.html", job=job, applications=apps)
+    try:
+        status, after, limit = _pipeline_args()
+        apps, next_cursor = _pipeline_page(job.id, status, after, limit)
+    except ValueError:
+        flash("Invalid page or status filter", "danger")
+        return redirect(url_for("ats.job_detail", job_id=job.id))
+    return render_template("ats/job_detail.html", job=job, applications=apps, counts=_status_counts(job.id),
+                           status=status.value if status else None, next_cursor=next_cursor, limit=limit)
+
+# Pipeline as JSON: ?status=&after=<next_cursor>&limit=
+@ats_bp.route("/jobs/<int:job_id>/applications")
+def job_applications(job_id):
+    job = Job.query.get_or_404(job_id)
+    try:
+        status, after, limit = _pipeline_args()
+        apps, next_cursor = _pipeline_page(job.id, status, after, limit)
+    except ValueError as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+    return jsonify({
+        "ok": True,
+        "job_id": job.id,
+        "status": status.value if status else None,
+        "counts": _status_counts(job.id),
+        "results": [dict(a.to_dict(), applicant_name=a.applicant.name if a.applicant else None) for a in apps],
+        "next_cursor": next_cursor,
+    })
+
+# Per-status application counts for a job (JSON)
+@ats_bp.route("/jobs/<int:job_id>/status_counts")
+def job_status_counts(job_id):
+    job = Job.query.get_or_404(job_id)
+    counts = _status_counts(job.id)
+    return jsonify({"ok": True, "job_id": job.id, "counts": counts, "total": sum(counts.values())})
+
+# Recruiter shortlist: top-K stored resumes for a job by embedding similarity (JSON)
+@ats_bp.route("/jobs/<int:job_id>/top_resumes")
+def top_resumes(job_id):
+    job = Job.query.get_or_404(job_id)
+    if not (job.description or "").strip():
+        return jsonify({"ok": False, "error": "job_has_no_description"}), 400
+    k = max(1, min(request.args.get("k", 20, type=int), 200))
+    hits = top_k_resumes(embed_text(job.description), k=k)
+    rows = Resume.query.options(load_only(Resume.id, Resume.original_filename, Resume.skills, Resume.uploaded_at)) \
+        .filter(Resume.id.in_([rid for rid, _ in hits])).all()
+    by_id = {r.id: r for r in rows}
+    results = []
+    for rid, score in hits:
+        r = by_id.get(rid)
+        if r is None:
+            continue  # deleted since it was indexed
+        results.append({
+            "resume_id": r.id,
+            "score": round(max(0.0, min(1.0, score)), 4),
+            "original_filename": r.original_filename,
+            "skills": r.skills or [],
+            "uploaded_at": r.uploaded_at.isoformat() if r.uploaded_at else None,
+        })
+    return jsonify({"ok": True, "job_id": job.id, "backend": index_backend(), "results": results})
+
+# Stored per-(job, resume) scores written by the batch rescoring pass (JSON)
+@ats_bp.route("/jobs/<int:job_id>/resume_scores")
+def resume_scores(job_id):
+    job = Job.query.get_or_404(job_id)
+    limit = max(1, min(request.args.get("limit", 50, type=int), 1000))
+    min_score = request.args.get("min_score", 0.0, type=float)
+    rows = JobResumeScore.query.filter(JobResumeScore.job_id == job.id, JobResumeScore.score >= min_score) \
+        .order_by(JobResumeScore.score.desc()).limit(limit).all()
+    return jsonify({
+        "ok": True,
+        "job_id": job.id,
+        "results": [{"resume_id": r.resume_id, "score": round(r.score, 4),
+                     "scored_at": r.scored_at.isoformat()} for r in rows],
+    })
+
+# Possible duplicate applicants: other applicants whose resume is a near-duplicate (MinHash/LSH) of this one's
+@ats_bp.route("/applicants/<int:applicant_id>/duplicates")
+def applicant_duplicates(applicant_id):
+    applicant = Applicant.query.get_or_404(applicant_id)
+    threshold = request.args.get("threshold", type=float)
+    threshold = None if threshold is None else min(max(threshold, 0.0), 1.0)
+    resume = Resume.query.get(applicant.resume_id) if applicant.resume_id else None
+    hits = dict(find_near_duplicates(resume, threshold=threshold, limit=200)) if resume is not None else {}
+    if resume is not None:
+        hits[resume.id] = 1.0   # other applicants that share this very resume
+    others = Applicant.query.filter(Applicant.resume_id.in_(list(hits)), Applicant.id != applicant.id).all() \
+        if hits else []
+    results = sorted(({"applicant_id": a.id, "name": a.name, "email": a.email, "resume_id": a.resume_id,
+                       "jaccard": hits[a.resume_id]} for a in others), key=lambda d: -d["jaccard"])
+    return jsonify({
+        "ok": True,
+        "applicant_id": applicant.id,
+        "resume_id": applicant.resume_id,
+        "threshold": Config.DUPLICATE_JACCARD_THRESHOLD if threshold is None else threshold,
+        "results": results,
+    })
 
 # Candidate: apply to job
 @ats_bp.route("/jobs/<int:job_id>/apply", methods=["GET","POST"])
@@ -46,30 +265,37 @@ def apply_job(job_id):
         name = request.form.get("name", "").strip()
         email = request.form.get("email", "").strip()
         phone = request.form.get("phone", "").strip()
-        resume_id = request.form.get("resume_id")   # optional link to Resume table
+        resume_id = request.form.get("resume_id", type=int)   # optional link to Resume table
         experience_years = float(request.form.get("experience_years", 0) or 0)
+        if not name or not email:
+            flash("Name and email are required", "danger")
+            return redirect(url_for("ats.apply_job", job_id=job.id))
 
-        # create applicant (or reuse if email exists)
-        applicant = Applicant.query.filter_by(email=email).first()
-        if not applicant:
-            applicant = Applicant(name=name, email=email, phone=phone, resume_id=resume_id)
-            db.session.add(applicant)
-            db.session.commit()
-
-        appn = Application(job_id=job.id, applicant_id=applicant.id)
-        # compute resume_score from Resume table if provided
+        # score first (reads only), then write applicant + application in one statement and one commit
+        resume_score = None
         try:
             if resume_id:
-                from models.resume_model import Resume as ResumeModel
-                r = ResumeModel.query.get(int(resume_id))
-                if r and r.match_score:
-                    appn.resume_score = float(r.match_score)
+                # score of this resume against this job from the batch pass; when the pair
+                # was never scored, pool the resume's chunk vectors against the job, and
+                # only then fall back to the resume's last match_score
+                score = get_resume_score(job.id, resume_id)
+                if score is None:
+                    r = Resume.query.get(resume_id)
+                    if r and (job.description or "").strip():
+                        score = resume_job_score(r, embed_text(job.description))
+                    if score is None and r and r.match_score:
+                        score = r.match_score
+                if score is not None:
+                    resume_score = float(score)
         except Exception:
-            pass
+            db.session.rollback()
 
         # compute final score using predictor with no interview score yet
-        appn.final_score = score_application(appn.resume_score or 0.0, appn.interview_score or 0.0, experience_years)
-        db.session.add(appn)
+        final_score = score_application(resume_score or 0.0, 0.0, experience_years)
+        # applicant reused by email (upsert); experience is kept so the job's pipeline can be
+        # rescored later (POST /jobs/<id>/rescore)
+        apply_to_job(job.id, name, email, phone=phone, resume_id=resume_id, resume_score=resume_score,
+                     final_score=final_score, meta={"experience_years": experience_years})
         db.session.commit()
         flash("Application submitted. Thank you!", "success")
         return redirect(url_for("ats.job_detail", job_id=job.id))
@@ -82,6 +308,14 @@ def apply_job(job_id):
         resumes = []
     return render_template("ats/apply_form.html", job=job, resumes=resumes)
 
+# Recompute final_score for every application to a job: one batch predict, one bulk UPDATE (JSON)
+@ats_bp.route("/jobs/<int:job_id>/rescore", methods=["POST"])
+def rescore_job_applications(job_id):
+    job = Job.query.get_or_404(job_id)
+    updated = rescore_applications(job.id)
+    db.session.commit()
+    return jsonify({"ok": True, "job_id": job.id, "updated": updated})
+
 # Application detail & stage transitions
 @ats_bp.route("/application/<int:app_id>")
 def application_detail(app_id):
@@ -94,35 +328,72 @@ def move_application(app_id):
     note = request.form.get("note", "")
     appn = Application.query.get_or_404(app_id)
     try:
-        appn.status = ApplicationStatus(new_status)
+        new_status = ApplicationStatus(new_status)
     except Exception:
         flash("Invalid status", "danger")
         return redirect(url_for("ats.application_detail", app_id=app_id))
-    # store note in meta
-    meta = appn.meta or {}
-    if note:
-        meta_notes = meta.get("notes", [])
-        meta_notes.append({"at": datetime.utcnow().isoformat(), "note": note})
-        meta["notes"] = meta_notes
-        appn.meta = meta
-    db.session.add(appn)
+    # the note goes to the transitions log, not into meta
+    moved = transition_applications(new_status, ids=[appn.id], note=note)
+    if not moved and note.strip():
+        # same stage: log a note-only row (from_status == to_status) so the note is kept
+        db.session.add(ApplicationTransition(application_id=appn.id, job_id=appn.job_id, from_status=appn.status,
+                                             to_status=appn.status, note=note))
     db.session.commit()
-    flash(f"Application moved to {new_status}", "success")
+    if moved:
+        flash(f"Application moved to {new_status.value}", "success")
+    elif note.strip():
+        flash(f"Application is already in {new_status.value}; note added", "info")
+    else:
+        flash(f"Application is already in {new_status.value}", "info")
     return redirect(url_for("ats.application_detail", app_id=app_id))
 
+# Status history of an application (JSON)
+@ats_bp.route("/application/<int:app_id>/transitions")
+def application_transitions(app_id):
+    appn = Application.query.get_or_404(app_id)
+    rows = ApplicationTransition.query.filter_by(application_id=appn.id) \
+        .order_by(ApplicationTransition.created_at, ApplicationTransition.id).all()
+    return jsonify({"ok": True, "application_id": appn.id, "transitions": [t.to_dict() for t in rows]})
+
+# Bulk stage change (JSON): {"to_status", "application_ids": [...] or "top_n", "from_status", "note"}
+@ats_bp.route("/jobs/<int:job_id>/transition", methods=["POST"])
+def bulk_transition(job_id):
+    job = Job.query.get_or_404(job_id)
+    data = request.get_json(silent=True) or {}
+    try:
+        to_status = ApplicationStatus(data.get("to_status"))
+        from_statuses = data.get("from_status") or []
+        if isinstance(from_statuses, str):
+            from_statuses = [from_statuses]
+        from_statuses = [ApplicationStatus(s) for s in from_statuses]
+        ids = [int(i) for i in data.get("application_ids") or []]
+        top_n = int(data["top_n"]) if data.get("top_n") is not None else None
+    except (TypeError, ValueError):
+        return jsonify({"ok": False, "error": "invalid to_status, from_status, application_ids or top_n"}), 400
+    if top_n is None and not ids:
+        return jsonify({"ok": False, "error": "application_ids or top_n required"}), 400
+    if top_n is not None and not from_statuses:
+        return jsonify({"ok": False, "error": "top_n needs from_status"}), 400
+    moved = transition_applications(to_status, ids=ids, job_id=job.id, from_statuses=from_statuses,
+                                    top_n=top_n, note=data.get("note"))
+    db.session.commit()
+    return jsonify({
+        "ok": True,
+        "job_id": job.id,
+        "to_status": to_status.value,
+        "moved": [{"id": i, "from_status": prev.value} for i, prev in moved],
+        "count": len(moved),
+    })
+
 # Auto-rank and promote top N candidates for a job to next stage
 @ats_bp.route("/jobs/<int:job_id>/auto_promote", methods=["POST"])
 def auto_promote(job_id):
     job = Job.query.get_or_404(job_id)
     top_n = int(request.form.get("top_n", 3))
-    # find candidates in APPLIED status, order by final_score desc
-    from models.ats_model import ApplicationStatus
-    candidates = job.applications.filter(Application.status == ApplicationStatus.APPLIED).order_by(Application.final_score.desc().nullslast()).limit(top_n).all()
-    promoted = []
-    for c in candidates:
-        c.status = ApplicationStatus.SCREENING
-        db.session.add(c)
-        promoted.append(c.id)
+    # best final_score first, unscored last; selected, moved and logged in one statement
+    promoted = transition_applications(ApplicationStatus.SCREENING, job_id=job.id,
+                                       from_statuses=[ApplicationStatus.APPLIED], top_n=top_n,
+                                       note="auto-promoted")
     db.session.commit()
     flash(f"Promoted {len(promoted)} candidates to SCREENING", "success")
     return redirect(url_for("ats.job_detail", job_id=job.id))
@@ -131,10 +402,14 @@ def auto_promote(job_id):
 @ats_bp.route("/application/<int:app_id>/update_interview_score", methods=["POST"])
 def update_interview_score(app_id):
     # expects JSON body or form with interview_score and optional experience_years
-    data = request.get_json() or request.form
+    data = request.get_json(silent=True) or request.form
     interview_score = float(data.get("interview_score", 0) or 0)
-    experience_years = float(data.get("experience_years", 0) or 0)
     appn = Application.query.get_or_404(app_id)
+    meta = dict(appn.meta or {})
+    if data.get("experience_years") not in (None, ""):
+        meta["experience_years"] = float(data.get("experience_years"))
+        appn.meta = meta
+    experience_years = float(meta.get("experience_years", 0) or 0)
     appn.interview_score = interview_score
     # recompute final_score using predictor
     appn.final_score = score_application(appn.resume_score or 0.0, appn.interview_score or 0.0, experience_years)
@@ -1,8 +1,9 @@
 from flask import Blueprint, request, render_template, redirect, url_for, flash, current_app, session
 from database.db import db
 from models.interview_model import Question, Interview, Response
-from ai_engines.interview_ai import score_answer, transcribe_audio
+from ai_engines.interview_ai import score_answer, transcribe_audio, embed_reference
 from utils.file_utils import save_upload_file, allowed_file
+import click
 import os
 from datetime import datetime
 
@@ -24,12 +25,55 @@ def create_question():
             flash("Title and prompt required.", "warning")
             return redirect(url_for("interview.create_question"))
         q = Question(title=title, prompt=prompt, reference_answer=ref)
+        q.set_reference_embedding(_reference_vector(ref))
         db.session.add(q)
         db.session.commit()
         flash("Question created.", "success")
         return redirect(url_for("interview.list_questions"))
     return render_template("interview/question_create.html")
 
+@interview_bp.route("/questions/<int:question_id>/edit", methods=["GET", "POST"])
+def edit_question(question_id):
+    q = Question.query.get_or_404(question_id)
+    if request.method == "POST":
+        title = request.form.get("title", "").strip()
+        prompt = request.form.get("prompt", "").strip()
+        ref = request.form.get("reference_answer", "").strip()
+        if not title or not prompt:
+            flash("Title and prompt required.", "warning")
+            return redirect(url_for("interview.edit_question", question_id=q.id))
+        if ref != (q.reference_answer or "") or q.reference_embedding is None:
+            q.set_reference_embedding(_reference_vector(ref))
+        q.title, q.prompt, q.reference_answer = title, prompt, ref
+        db.session.commit()
+        flash("Question updated.", "success")
+        return redirect(url_for("interview.list_questions"))
+    return render_template("interview/question_create.html", question=q)
+
+def _reference_vector(ref):
+    # the encoder being unavailable must not block saving a question; it is retried on first answer
+    try:
+        return embed_reference(ref)
+    except Exception:
+        current_app.logger.exception("Reference answer embedding failed")
+        return None
+
+@interview_bp.cli.command("embed-references")
+@click.option("--all", "redo_all", is_flag=True, help="Recompute every question, not only missing ones")
+def embed_references_command(redo_all):
+    """Store reference-answer embeddings for existing questions (e.g. after the migration)."""
+    query = Question.query.filter(Question.reference_answer.isnot(None), Question.reference_answer != "")
+    if not redo_all:
+        query = query.filter(Question.reference_embedding.is_(None))
+    questions = query.all()
+    if questions:
+        from ai_engines.embedding_service import encode
+        vecs = encode([q.reference_answer.strip() for q in questions], batch_size=64)
+        for q, vec in zip(questions, vecs):
+            q.set_reference_embedding(vec)
+        db.session.commit()
+    click.echo(f"{len(questions)} reference embeddings stored")
+
 # --- Candidate: start interview
 @interview_bp.route("/start", methods=["GET", "POST"])
 def start_interview():
@@ -91,8 +135,12 @@ def answer_question():
                 return redirect(request.url)
 
         final_answer_text = text_answer or transcribed_text or ""
-        # compute score against reference
-        s = score_answer(final_answer_text, q.reference_answer or "")
+        # compute score against reference (stored vector; questions created before it existed get one now)
+        ref_vec = q.get_reference_embedding()
+        if ref_vec is None and (q.reference_answer or "").strip():
+            ref_vec = _reference_vector(q.reference_answer)
+            q.set_reference_embedding(ref_vec)
+        s = score_answer(final_answer_text, q.reference_answer or "", reference_embedding=ref_vec)
         resp = Response(interview_id=interview_id, question_id=q.id,
                         answer_text=final_answer_text, audio_filename=audio_filename_on_disk, score=s)
         db.session.add(resp)
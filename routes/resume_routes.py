@@ -1,115 +1,22 @@
 import os
-import re
-from typing import List, Tuple
-from flask import Blueprint, request, jsonify
-import numpy as np
-
-# Text extraction libs
-from pdfminer.high_level import extract_text as extract_text_pdf
-import docx2txt
-
-# SentenceTransformers
-from sentence_transformers import SentenceTransformer
-
-# Optional spaCy (for NER)
-import spacy
-
-# ----------------- Lazy-loaded models -----------------
-_MODEL = None
-_NLP = None
-
-def _get_model():
-    global _MODEL
-    if _MODEL is None:
-        _MODEL = SentenceTransformer("all-MiniLM-L6-v2")
-    return _MODEL
-
-def _get_nlp():
-    global _NLP
-    if _NLP is None:
-        try:
-            _NLP = spacy.load("en_core_web_sm")
-        except Exception:
-            _NLP = None
-    return _NLP
-
-# ----------------- Common skills -----------------
-COMMON_SKILLS = [
-    "python","java","javascript","react","node","sql","postgresql","docker",
-    "aws","azure","git","html","css","c++","c#","tensorflow","pytorch","nlp",
-    "machine learning","data analysis","excel","tableau","power bi","linux"
-]
-
-# ----------------- Resume logic -----------------
-def extract_text_from_file(filepath: str) -> str:
-    lower = filepath.lower()
-    if lower.endswith(".pdf"):
-        try:
-            text = extract_text_pdf(filepath) or ""
-        except Exception:
-            text = _fallback_pdf_text(filepath)
-    elif lower.endswith(".docx") or lower.endswith(".doc"):
-        try:
-            text = docx2txt.process(filepath) or ""
-        except Exception:
-            text = ""
-    elif lower.endswith(".txt"):
-        with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-            text = f.read()
-    else:
-        text = ""
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
-
-def _fallback_pdf_text(filepath):
-    try:
-        with open(filepath, "rb") as f:
-            b = f.read()
-            return b.decode('utf-8', errors='ignore')
-    except Exception:
-        return ""
-
-def extract_skills(text: str, custom_skill_list: List[str] = None) -> List[str]:
-    text_lower = text.lower()
-    skills = set()
-    full_list = COMMON_SKILLS.copy()
-    if custom_skill_list:
-        full_list = list(set(full_list + custom_skill_list))
-    for skill in full_list:
-        pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-        if re.search(pattern, text_lower):
-            skills.add(skill)
-    nlp = _get_nlp()
-    if nlp:
-        doc = nlp(text[:10000])
-        for ent in doc.ents:
-            if ent.label_ in ("ORG","PRODUCT","WORK_OF_ART","TECH"):
-                s = ent.text.strip().lower()
-                if len(s) > 1 and s not in skills and len(s.split()) <= 3:
-                    skills.add(s)
-    return sorted(list(skills))
-
-def embed_text(text: str):
-    model = _get_model()
-    return model.encode(text, show_progress_bar=False, convert_to_numpy=True)
-
-def cosine_similarity(vec_a, vec_b):
-    a = np.array(vec_a, dtype=float)
-    b = np.array(vec_b, dtype=float)
-    if np.linalg.norm(a) == 0 or np.linalg.norm(b) == 0:
-        return 0.0
-    return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
-
-def score_resume_vs_job(resume_text: str, job_description: str) -> Tuple[float, List[float]]:
-    model = _get_model()
-    emb_resume = model.encode(resume_text, show_progress_bar=False, convert_to_numpy=True)
-    emb_job = model.encode(job_description, show_progress_bar=False, convert_to_numpy=True)
-    sim = cosine_similarity(emb_resume, emb_job)
-    sim = max(0.0, min(1.0, sim))
-    return sim, emb_resume.tolist()
+import threading
+from flask import Blueprint, request, jsonify, current_app, url_for
+import click
+
+# Chunked resume/job scoring
+from ai_engines.resume_parser import score_resume_vs_job
+from ai_engines.resume_chunks import POOLINGS, apply_embedding, embed_resumes
+from ai_engines.near_duplicates import encode_signature, find_near_duplicates, minhash_signature, rewrite_buckets
+from ai_engines.resume_search import search_resumes
+from ai_engines.resume_ingest import ingest_resumes, ingest_upload, parse_upload, read_state, run_id_for
+from config.config import Config
+from database.db import db
+from models.resume_model import Resume
+from utils.file_utils import UPLOAD_DIR, allowed_file, store_stream
+from werkzeug.utils import secure_filename
 
 # ----------------- Flask Blueprint -----------------
-resume_bp = Blueprint("resume_bp", __name__, url_prefix="/resume")
+resume_bp = Blueprint("resume_bp", __name__, url_prefix="/resume", cli_group="resume")
 
 @resume_bp.route("/extract_skills", methods=["POST"])
 def extract_resume_skills():
@@ -117,12 +24,57 @@ def extract_resume_skills():
     if not file:
         return jsonify({"error": "No file provided"}), 400
 
-    filepath = f"./temp_{file.filename}"
-    file.save(filepath)
-    text = extract_text_from_file(filepath)
-    skills = extract_skills(text)
-    os.remove(filepath)  # cleanup temp file
-    return jsonify({"skills": skills})
+    # parsed in memory, nothing written to disk; byte-identical repeats skip parsing
+    parsed = parse_upload(file, embed=False, store=False)
+    return jsonify({"skills": parsed["skills"]})
+
+# Store an uploaded resume as a Resume row (JSON); repeats of the same bytes reuse the earlier parse
+@resume_bp.route("/upload", methods=["POST"])
+def upload_resume():
+    file = request.files.get("resume") or request.files.get("file")
+    if not file or not file.filename:
+        return jsonify({"error": "No file provided"}), 400
+    if not allowed_file(file.filename):
+        return jsonify({"error": "File type not allowed"}), 400
+    uploaded_by = request.form.get("uploaded_by", type=int)
+    resume, reused = ingest_upload(file, uploaded_by=uploaded_by)
+    db.session.commit()
+    return jsonify({"resume_id": resume.id, "deduplicated": reused, "skills": resume.skills or [],
+                    "possible_duplicates": _duplicate_list(resume)}), 201
+
+def _threshold_arg():
+    """?threshold= (Jaccard, 0..1) or None for DUPLICATE_JACCARD_THRESHOLD."""
+    value = request.args.get("threshold", type=float)
+    return None if value is None else min(max(value, 0.0), 1.0)
+
+def _duplicate_list(resume, threshold=None, limit=20):
+    hits = find_near_duplicates(resume, threshold=threshold, limit=limit)
+    found = {r.id: r for r in Resume.query.filter(Resume.id.in_([rid for rid, _ in hits])).all()} if hits else {}
+    return [{"resume_id": rid, "jaccard": j, "original_filename": found[rid].original_filename,
+             "uploaded_at": found[rid].uploaded_at.isoformat() if found[rid].uploaded_at else None}
+            for rid, j in hits if rid in found]
+
+# Possible near-duplicates of a stored resume (MinHash/LSH, estimated Jaccard >= ?threshold=)
+@resume_bp.route("/<int:resume_id>/duplicates")
+def resume_duplicates(resume_id):
+    resume = Resume.query.get_or_404(resume_id)
+    threshold = _threshold_arg()
+    limit = min(request.args.get("limit", 20, type=int), 200)
+    return jsonify({"resume_id": resume.id,
+                    "threshold": Config.DUPLICATE_JACCARD_THRESHOLD if threshold is None else threshold,
+                    "duplicates": _duplicate_list(resume, threshold=threshold, limit=limit)})
+
+# Keyword / semantic / hybrid (RRF) resume search: ?q=&mode=hybrid|keyword|semantic&page=&per_page=
+@resume_bp.route("/search")
+def search():
+    page = request.args.get("page", 1, type=int)
+    per_page = max(1, min(request.args.get("per_page", 20, type=int), 100))
+    try:
+        found = search_resumes(request.args.get("q", ""), mode=request.args.get("mode", "hybrid"),
+                               page=page, per_page=per_page)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(found)
 
 @resume_bp.route("/score", methods=["POST"])
 def score_resume():
@@ -132,5 +84,151 @@ def score_resume():
     if not resume_text or not job_desc:
         return jsonify({"error": "Missing resume_text or job_description"}), 400
 
-    score, _ = score_resume_vs_job(resume_text, job_desc)
+    pooling = data.get("pooling") or None
+    if pooling is not None and pooling not in POOLINGS:
+        return jsonify({"error": f"pooling must be one of {', '.join(POOLINGS)}"}), 400
+
+    score, _ = score_resume_vs_job(resume_text, job_desc, pooling=pooling)
     return jsonify({"score": score})
+
+# ----------------- Bulk ingestion -----------------
+_ACTIVE_INGESTS = set()
+_ACTIVE_LOCK = threading.Lock()
+
+@resume_bp.route("/bulk_ingest", methods=["POST"])
+def bulk_ingest():
+    """
+    Start a background import of a .zip upload (field "archive") or of a directory /
+    zip already on the server under RESUME_INGEST_ROOT (JSON or form field "path").
+    """
+    archive = request.files.get("archive")
+    if archive and archive.filename:
+        if not archive.filename.lower().endswith(".zip"):
+            return jsonify({"error": "archive must be a .zip"}), 400
+        os.makedirs(Config.RESUME_INGEST_DIR, exist_ok=True)
+        # stored under its content hash: a different archive with the same name ("resumes.zip")
+        # gets its own file and run id, and a file a running import reads is never rewritten
+        source, _, _ = store_stream(archive.stream, archive.filename, directory=Config.RESUME_INGEST_DIR)
+    else:
+        data = request.get_json(silent=True) or request.form
+        root = os.path.realpath(Config.RESUME_INGEST_ROOT)
+        source = os.path.realpath(os.path.join(root, data.get("path", "")))
+        if os.path.commonpath([root, source]) != root or not os.path.exists(source):
+            return jsonify({"error": "path must exist under RESUME_INGEST_ROOT"}), 400
+
+    run_id = run_id_for(source)
+    with _ACTIVE_LOCK:
+        if run_id in _ACTIVE_INGESTS:
+            return jsonify({"run_id": run_id, "status": "running",
+                            "status_url": url_for("resume_bp.bulk_ingest_status", run_id=run_id)}), 409
+        _ACTIVE_INGESTS.add(run_id)
+    app = current_app._get_current_object()
+
+    def run():
+        try:
+            with app.app_context():
+                ingest_resumes(source)
+        except Exception:
+            app.logger.exception("Bulk resume ingestion failed: %s", source)
+        finally:
+            with _ACTIVE_LOCK:
+                _ACTIVE_INGESTS.discard(run_id)
+
+    threading.Thread(target=run, name=f"resume-ingest-{run_id}", daemon=True).start()
+    return jsonify({"run_id": run_id, "status": "started",
+                    "status_url": url_for("resume_bp.bulk_ingest_status", run_id=run_id)}), 202
+
+@resume_bp.route("/bulk_ingest/<run_id>")
+def bulk_ingest_status(run_id):
+    state = read_state(secure_filename(run_id))
+    if state is None:
+        return jsonify({"error": "unknown run"}), 404
+    return jsonify(state)
+
+@resume_bp.cli.command("ingest")
+@click.argument("source", type=click.Path(exists=True))
+@click.option("--workers", type=int, default=None, help="Parser processes (default: RESUME_INGEST_WORKERS or CPU count)")
+@click.option("--batch-size", type=int, default=None, help="Resumes embedded and committed per batch")
+def ingest_command(source, workers, batch_size):
+    """Bulk-import resumes from a directory or .zip; re-run to resume after an interruption."""
+    def report(state):
+        click.echo(f"\r{state['inserted'] + state['skipped'] + state['duplicates'] + state['failed']}/{state['total']} "
+                   f"(inserted {state['inserted']}, skipped {state['skipped']}, duplicates {state['duplicates']}, "
+                   f"failed {state['failed']})", nl=False)
+    state = ingest_resumes(source, workers=workers, batch_size=batch_size, progress=report)
+    report(state)
+    click.echo()
+    for err in state["errors"]:
+        click.echo(f"  failed: {err['key']}: {err['error']}")
+
+@resume_bp.cli.command("backfill-hashes")
+def backfill_hashes_command():
+    """Record content_sha256 for resumes uploaded before uploads were hashed."""
+    import hashlib
+    done = missing = last_id = 0
+    while True:
+        rows = Resume.query.filter(Resume.content_sha256.is_(None), Resume.id > last_id) \
+            .order_by(Resume.id).limit(500).all()
+        if not rows:
+            break
+        for r in rows:
+            path = UPLOAD_DIR / r.filename
+            if not path.is_file():
+                missing += 1
+                continue
+            h = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+            r.content_sha256 = h.hexdigest()
+            done += 1
+        last_id = rows[-1].id
+        db.session.commit()
+    click.echo(f"{done} resumes hashed, {missing} files not found")
+
+@resume_bp.cli.command("build-minhash")
+@click.option("--all", "rebuild_all", is_flag=True, help="Recompute every signature (after changing MINHASH_*/LSH_BANDS)")
+def build_minhash_command(rebuild_all):
+    """Compute MinHash signatures and LSH buckets for resumes that have none."""
+    done = last_id = 0
+    while True:
+        q = Resume.query.filter(Resume.parsed_text.isnot(None), Resume.id > last_id)
+        if not rebuild_all:
+            q = q.filter(Resume.minhash.is_(None))
+        rows = q.order_by(Resume.id).limit(500).all()
+        if not rows:
+            break
+        unchanged = []
+        for r in rows:
+            sig = minhash_signature(r.parsed_text)
+            minhash = encode_signature(sig) if sig is not None else None
+            if rebuild_all and minhash == r.minhash:
+                unchanged.append(r)   # e.g. only LSH_BANDS changed: no update event to rebucket it
+            else:
+                r.minhash = minhash   # buckets follow via mapper events
+            done += 1
+        for r in unchanged:
+            rewrite_buckets(r)
+        last_id = rows[-1].id
+        db.session.commit()
+    click.echo(f"{done} resume signatures computed")
+
+@resume_bp.cli.command("embed-chunks")
+@click.option("--all", "rebuild_all", is_flag=True, help="Re-embed every resume (after changing RESUME_CHUNK_*)")
+@click.option("--batch-size", type=int, default=64, help="Resumes whose chunks are encoded in one call")
+def embed_chunks_command(rebuild_all, batch_size):
+    """Compute section chunk vectors (and the pooled embedding) for resumes that have none."""
+    done = last_id = 0
+    while True:
+        q = Resume.query.filter(Resume.parsed_text.isnot(None), Resume.id > last_id)
+        if not rebuild_all:
+            q = q.filter(Resume.chunk_embeddings.is_(None))
+        rows = q.order_by(Resume.id).limit(batch_size).all()
+        if not rows:
+            break
+        for r, emb in zip(rows, embed_resumes([r.parsed_text for r in rows])):
+            apply_embedding(r, emb)
+            done += 1
+        last_id = rows[-1].id
+        db.session.commit()
+    click.echo(f"{done} resumes embedded")
@@ -1,36 +1,181 @@
 # utils/doc_utils.py
-import re
+"""
+Text extraction for resumes and HR documents.
+
+One registry keyed by file extension. Each type has an ordered chain of
+backends; the first one that returns non-empty text wins, and errors or
+timeouts fall through to the next. The order is Config.EXTRACTION_BACKEND_ORDER
+(PyMuPDF before pdfminer by default: usually ~10x faster on the same PDF).
+Every backend runs under Config.EXTRACTION_TIMEOUT_SECONDS and reads at most
+Config.EXTRACTION_MAX_PAGES pages.
+
+`source` may be a path, the file's bytes or a seekable binary file object.
+A stream up to UPLOAD_SPOOL_MAX_MEMORY is read into bytes; a larger one
+spilled to a named file (utils/file_utils.spool_upload) is opened by its
+path. Backends never share a stream, so one that times out (and keeps
+running in its abandoned thread) does not stop the next from reading.
+
+Usage:
+    from utils.doc_utils import extract_text
+    text = extract_text("uploads/cv.pdf")
+    text = extract_text(data, filename="cv.docx")
+    # pages/second per backend: python -m benchmarks.extraction_backends <corpus dir>
+"""
+import io
+import os
+import threading
 from pathlib import Path
-import docx2txt
-import fitz  # pymupdf
 
-def extract_text_from_pdf(path: str) -> str:
-    """Extract text from PDF using PyMuPDF (fast, robust)."""
-    try:
-        doc = fitz.open(path)
+from config.config import Config
+
+_BYTES = (bytes, bytearray, memoryview)
+_BACKENDS = {}          # name -> (extensions, fn(source, max_pages) -> str)
+
+
+class ExtractionTimeout(Exception):
+    pass
+
+
+def register_backend(name: str, extensions, fn):
+    """Add a backend; its place in each chain comes from EXTRACTION_BACKEND_ORDER."""
+    _BACKENDS[name] = (frozenset(e.lower().lstrip(".") for e in extensions), fn)
+
+
+def backend_chain(ext: str):
+    """Names of the backends tried for a file extension, in order."""
+    ext = ext.lower().lstrip(".")
+    order = [n.strip() for n in Config.EXTRACTION_BACKEND_ORDER.split(",") if n.strip()]
+    return [n for n in order if n in _BACKENDS and ext in _BACKENDS[n][0]]
+
+
+def extract_text(source, filename: str = None, backends=None, timeout: float = None, max_pages: int = None) -> str:
+    """Raw text of a document ("" when no backend could read it)."""
+    if isinstance(source, (str, os.PathLike)):
+        source = os.fspath(source)
+        filename = filename or source
+        if not os.path.exists(source):
+            return ""
+    elif hasattr(source, "read"):
+        source = _stream_source(source)
+    ext = os.path.splitext(filename or "")[1]
+    timeout = Config.EXTRACTION_TIMEOUT_SECONDS if timeout is None else timeout
+    max_pages = Config.EXTRACTION_MAX_PAGES if max_pages is None else max_pages
+    for name in (backends or backend_chain(ext)):
+        try:
+            text = run_backend(name, source, timeout=timeout, max_pages=max_pages)
+        except Exception:   # ExtractionTimeout included: fall through to the next backend
+            continue
+        if text and text.strip():
+            return text
+    return ""
+
+
+def run_backend(name: str, source, timeout: float = None, max_pages: int = None) -> str:
+    """Run one backend, raising ExtractionTimeout after `timeout` seconds (0 = no limit)."""
+    fn = _BACKENDS[name][1]
+    if not timeout:
+        return fn(source, max_pages)
+    result = {}
+
+    def target():
+        try:
+            result["text"] = fn(source, max_pages)
+        except BaseException as e:
+            result["error"] = e
+
+    # a stuck parser cannot be killed; the daemon thread is abandoned and the chain moves on
+    worker = threading.Thread(target=target, name=f"extract-{name}", daemon=True)
+    worker.start()
+    worker.join(timeout)
+    if worker.is_alive():
+        raise ExtractionTimeout(f"{name} exceeded {timeout}s")
+    if "error" in result:
+        raise result["error"]
+    return result.get("text") or ""
+
+
+def _stream_source(stream):
+    """
+    Bytes of a stream up to UPLOAD_SPOOL_MAX_MEMORY; a larger stream that is a
+    named file read from its start is passed on as that path, anything else is read.
+    """
+    start = stream.tell()
+    size = stream.seek(0, io.SEEK_END) - start
+    stream.seek(start)
+    if size > Config.UPLOAD_SPOOL_MAX_MEMORY and start == 0:
+        path = getattr(stream, "name", None)
+        if isinstance(path, str) and os.path.isfile(path):
+            stream.flush()
+            return path
+    return stream.read()
+
+
+# ---------- backends ----------
+def _as_bytes(source):
+    if isinstance(source, _BYTES):
+        return bytes(source)
+    with open(source, "rb") as f:
+        return f.read()
+
+
+def _pymupdf(source, max_pages):
+    import fitz  # pymupdf
+    if isinstance(source, str):
+        doc = fitz.open(source)
+    else:
+        doc = fitz.open(stream=_as_bytes(source), filetype="pdf")   # parsed in memory, no temp file
+    with doc:
         text_chunks = []
-        for page in doc:
+        for i, page in enumerate(doc):
+            if max_pages and i >= max_pages:
+                break
             text_chunks.append(page.get_text("text"))
-        return "\n".join(text_chunks).strip()
-    except Exception:
-        # fallback: return empty
-        return ""
+    return "\n".join(text_chunks).strip()
+
+
+def _pdfminer(source, max_pages):
+    from pdfminer.high_level import extract_text as pdfminer_extract
+    if isinstance(source, _BYTES):
+        source = io.BytesIO(source)
+    return pdfminer_extract(source, maxpages=max_pages or 0) or ""
+
+
+def _docx2txt(source, max_pages):
+    import docx2txt
+    if isinstance(source, _BYTES):
+        source = io.BytesIO(source)
+    return docx2txt.process(source) or ""
+
+
+def _plain_text(source, max_pages):
+    return _as_bytes(source).decode("utf-8", errors="ignore")
+
+
+def _raw_decode(source, max_pages):
+    # crude last resort (readable fragments of uncompressed PDFs); opt-in via EXTRACTION_BACKEND_ORDER
+    return _as_bytes(source).decode("utf-8", errors="ignore")
+
+
+register_backend("pymupdf", ["pdf"], _pymupdf)
+register_backend("pdfminer", ["pdf"], _pdfminer)
+register_backend("docx2txt", ["docx", "doc"], _docx2txt)
+register_backend("text", ["txt"], _plain_text)
+register_backend("raw_decode", ["pdf"], _raw_decode)
+
+
+# ---------- helpers kept for existing callers ----------
+def extract_text_from_pdf(source) -> str:
+    """Extract text from PDF (path or bytes) via the pdf backend chain."""
+    return extract_text(source, filename="document.pdf").strip()
+
+
+def extract_text_from_docx(source) -> str:
+    """`source` is a path, the .docx bytes or a binary file object."""
+    return extract_text(source, filename="document.docx")
 
-def extract_text_from_docx(path: str) -> str:
-    try:
-        return docx2txt.process(path) or ""
-    except Exception:
-        return ""
 
 def extract_text_from_file(path: str) -> str:
     p = Path(path)
     if not p.exists():
         return ""
-    suffix = p.suffix.lower()
-    if suffix == ".pdf":
-        return extract_text_from_pdf(str(p))
-    elif suffix in [".docx", ".doc"]:
-        return extract_text_from_docx(str(p))
-    elif suffix == ".txt":
-        return p.read_text(encoding="utf-8", errors="ignore")
-    return ""
+    return extract_text(str(p))
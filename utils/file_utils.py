@@ -1,4 +1,7 @@
+import hashlib
+import io
 import os
+import tempfile
 from werkzeug.utils import secure_filename
 from pathlib import Path
 
@@ -7,15 +10,83 @@ UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 ALLOWED_EXTENSIONS = {"pdf", "docx", "doc", "txt"}
 
+_CHUNK = 1 << 20
+
 def allowed_file(filename: str) -> bool:
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
+class StoredUpload(tuple):
+    """
+    (path, original filename) - unpacks like the old return value - plus
+    .sha256 of the bytes and .existed (same content was already on disk).
+    """
+    def __new__(cls, path, filename, sha256, existed):
+        obj = super().__new__(cls, (path, filename))
+        obj.sha256 = sha256
+        obj.existed = existed
+        return obj
+
+    @property
+    def path(self):
+        return self[0]
+
+    @property
+    def filename(self):
+        return self[1]
+
+def store_stream(stream, filename: str, directory=UPLOAD_DIR):
+    """
+    Copy a binary stream into `directory` (UPLOAD_DIR) under its content hash
+    (<sha256><ext>), hashing while writing. Identical bytes are stored once and an
+    existing file is never rewritten. Returns (path, sha256, existed).
+    """
+    ext = os.path.splitext(secure_filename(filename or ""))[1].lower()
+    directory = Path(directory)
+    h = hashlib.sha256()
+    fd, tmp = tempfile.mkstemp(prefix=".upload-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in iter(lambda: stream.read(_CHUNK), b""):
+                h.update(chunk)
+                out.write(chunk)
+        digest = h.hexdigest()
+        path = directory / f"{digest}{ext}"
+        existed = path.exists()
+        if existed:
+            os.remove(tmp)
+        else:
+            os.replace(tmp, path)
+        return str(path), digest, existed
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+def spool_upload(stream, max_memory: int = None):
+    """
+    Read a binary stream into memory (io.BytesIO) up to `max_memory` bytes,
+    moving it to a named temp file in the system temp dir beyond that, hashing
+    it on the way; the temp file's path lets extractors open a large upload
+    from disk instead of reading it back into memory (it is deleted on close).
+    Returns (file positioned at 0, sha256 hex).
+    """
+    if max_memory is None:
+        from config.config import Config
+        max_memory = Config.UPLOAD_SPOOL_MAX_MEMORY
+    spooled = io.BytesIO()
+    h = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(_CHUNK), b""):
+        h.update(chunk)
+        if isinstance(spooled, io.BytesIO) and spooled.tell() + len(chunk) > max_memory:
+            spilled = tempfile.NamedTemporaryFile(prefix=".spool-")
+            spilled.write(spooled.getbuffer())
+            spooled = spilled
+        spooled.write(chunk)
+    spooled.seek(0)
+    return spooled, h.hexdigest()
+
 def save_upload_file(file_storage):
     filename = secure_filename(file_storage.filename)
-    # to avoid collisions, prefix timestamp
-    from datetime import datetime
-    stamp = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
-    on_disk = f"{stamp}__{filename}"
-    path = UPLOAD_DIR / on_disk
-    file_storage.save(path)
-    return str(path), filename
+    # content-addressed: re-uploads of the same bytes map to the same file
+    path, digest, existed = store_stream(file_storage.stream, filename)
+    return StoredUpload(path, filename, digest, existed)
@@ -0,0 +1,18 @@
+import base64
+import json
+
+def encode_cursor(values) -> str:
+    """Opaque keyset cursor: the sort-key values of the last row on a page."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, length: int):
+    """Sort-key values from encode_cursor(); ValueError when malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except Exception:
+        raise ValueError("invalid cursor")
+    if not isinstance(values, list) or len(values) != length:
+        raise ValueError("invalid cursor")
+    return values